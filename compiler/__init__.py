@@ -6,12 +6,22 @@ Un compilateur professionnel pour le langage ConnectScript
 __version__ = "1.0.0"
 __author__ = "ConnectScript Team"
 
+from typing import Optional
+
 from .tokenizer import Tokenizer, TokenType, Token
 from .ast_nodes import Project, Page, Script, EventType, UIElement
 from .parser import Parser, parse_connect_script
-from .errors import CompileErrorManager, CompileException, ParseError, TokenizeError
-from .codegen import CodeGenerator, compile_project
-from .event_system import EventBus, EventType as EventEnum, Event, EventListener
+from .errors import CompileErrorManager, CompileError, ErrorCode, CompileException, ParseError, TokenizeError
+from .optimizer import ASTOptimizer, optimize_project, find_reachable
+from .codegen import CodeGenerator, compile_project, compile_project_with_source_map
+from .sourcemap import SourceMapBuilder
+from .event_system import EventBus, EventType as EventEnum, Event, EventListener, WeakEventHandler, HistoryMode
+from .async_events import AsyncEventBus, OverflowPolicy
+from .scheduler import TickScheduler, ClockMode
+from .interpreter import Interpreter, replay
+from .bytecode import BytecodeCompiler, BytecodeInterpreter, CodeObject
+from .sessions import SessionHost, SessionResult, HostReport, run_sessions
+from .json_project import project_from_json, project_to_json
 
 __all__ = [
     # Tokenizer
@@ -32,38 +42,96 @@ __all__ = [
     
     # Errors
     'CompileErrorManager',
+    'CompileError',
+    'ErrorCode',
     'CompileException',
     'ParseError',
     'TokenizeError',
     
+    # Optimizer
+    'ASTOptimizer',
+    'optimize_project',
+    'find_reachable',
+    
     # Code Gen
     'CodeGenerator',
     'compile_project',
+    'compile_project_with_source_map',
+    'SourceMapBuilder',
+    
+    # Projet JSON
+    'project_from_json',
+    'project_to_json',
     
     # Events
     'EventBus',
     'EventEnum',
     'Event',
     'EventListener',
+    'WeakEventHandler',
+    'HistoryMode',
+    'AsyncEventBus',
+    'OverflowPolicy',
+    
+    # Runtime
+    'TickScheduler',
+    'ClockMode',
+    'Interpreter',
+    'replay',
+    'BytecodeCompiler',
+    'BytecodeInterpreter',
+    'CodeObject',
+    'SessionHost',
+    'SessionResult',
+    'HostReport',
+    'run_sessions',
 ]
 
 
-def compile_script(code: str) -> dict:
+DIAGNOSTIC_FORMATS = ('json', 'sarif', 'text')
+
+
+def compile_script(
+    code: str,
+    minify: bool = False,
+    source_map: Optional[str] = None,
+    optimize: bool = False,
+    diagnostics: str = 'json',
+    prune: bool = False
+) -> dict:
     """
     Compile un script ConnectScript
     
     Args:
         code: Code source en ConnectScript
+        minify: Produit un JavaScript compact (sans indentation ni commentaires)
+        source_map: None, 'inline' (data URL dans le code) ou 'external'
+                    (commentaire vers 'app.js.map', map retournée dans 'source_map')
+        optimize: Applique la passe d'optimisation de l'AST avant la génération
+        diagnostics: 'json' (dictionnaires {code, level, message, line, column,
+                     suggestion}), 'sarif' (idem, plus le journal SARIF 2.1.0
+                     dans 'sarif') ou 'text' (rapport lisible, une chaîne par
+                     diagnostic)
+        prune: Supprime les pages/scripts inaccessibles du JavaScript et de
+               'ast' (un avertissement par élément supprimé)
         
     Returns:
         {
             'success': bool,
             'javascript': str,
             'ast': dict,
-            'errors': [str],
-            'warnings': [str]
+            'errors': [dict],       # au plus max_diagnostics au total
+            'warnings': [dict],
+            'error_count': int,     # totaux réels, même au-delà de la limite
+            'warning_count': int,
+            'sarif': dict,          # seulement avec diagnostics='sarif'
+            'source_map': dict      # seulement si source_map est demandé
         }
     """
+    if diagnostics not in DIAGNOSTIC_FORMATS:
+        raise ValueError(f"Format de diagnostics inconnu: {diagnostics}")
+    
+    error_manager = CompileErrorManager(code)
     try:
         # Tokenize
         tokenizer = Tokenizer(code)
@@ -74,39 +142,120 @@ def compile_script(code: str) -> dict:
         project = parser.parse()
         
         # Check errors
-        if parser.error_manager.has_errors():
+        error_manager = parser.error_manager
+        if error_manager.has_errors():
             return {
                 'success': False,
                 'javascript': '',
                 'ast': {},
-                'errors': [str(e) for e in parser.error_manager.get_errors()],
-                'warnings': [str(e) for e in parser.error_manager.get_warnings()]
+                **_diagnostics_result(error_manager, diagnostics)
             }
         
-        # Generate code
-        js_code = compile_project(project, parser.error_manager)
-        
-        # Convert AST
-        ast_dict = project_to_dict(project)
-        
+        return _generate(project, error_manager, minify, source_map, optimize, prune, diagnostics)
+    
+    except Exception as e:
+        error_manager.add_error(str(e), 0, code=ErrorCode.INTERNAL_ERROR)
         return {
-            'success': True,
-            'javascript': js_code,
-            'ast': ast_dict,
-            'errors': [],
-            'warnings': [str(e) for e in parser.error_manager.get_warnings()]
+            'success': False,
+            'javascript': '',
+            'ast': {},
+            **_diagnostics_result(error_manager, diagnostics)
         }
+
+
+def compile_json_project(
+    data: dict,
+    minify: bool = False,
+    source_map: Optional[str] = None,
+    optimize: bool = False,
+    diagnostics: str = 'json',
+    prune: bool = False
+) -> dict:
+    """
+    Compile un projet JSON (spec/project.schema.json) sans passer par le
+    texte ConnectScript: le Project est construit directement puis transmis
+    au CodeGenerator. Mêmes options et même résultat que compile_script.
+    
+    Le JSON doit avoir été validé au préalable (parser/loader.py).
+    """
+    if diagnostics not in DIAGNOSTIC_FORMATS:
+        raise ValueError(f"Format de diagnostics inconnu: {diagnostics}")
     
+    error_manager = CompileErrorManager("")
+    try:
+        project = project_from_json(data)
+        return _generate(project, error_manager, minify, source_map, optimize, prune, diagnostics)
     except Exception as e:
+        error_manager.add_error(str(e), 0, code=ErrorCode.INTERNAL_ERROR)
         return {
             'success': False,
             'javascript': '',
             'ast': {},
-            'errors': [str(e)],
-            'warnings': []
+            **_diagnostics_result(error_manager, diagnostics)
         }
 
 
+def _generate(
+    project: Project,
+    error_manager: CompileErrorManager,
+    minify: bool,
+    source_map: Optional[str],
+    optimize: bool,
+    prune: bool,
+    diagnostics: str
+) -> dict:
+    """Optimisation, génération du JavaScript et résultat de compile_script"""
+    # Optimize
+    if optimize:
+        optimize_project(project)
+    
+    # Generate code
+    map_dict = None
+    if source_map:
+        js_code, map_dict = compile_project_with_source_map(
+            project, error_manager, minify=minify,
+            inline=(source_map == 'inline'), prune_unreachable=prune
+        )
+    else:
+        js_code = compile_project(
+            project, error_manager, minify=minify, prune_unreachable=prune
+        )
+    
+    # Convert AST
+    ast_dict = project_to_dict(project)
+    if prune:
+        reachable_pages, reachable_scripts = find_reachable(project)
+        ast_dict['pages'] = {name: page for name, page in ast_dict['pages'].items() if name in reachable_pages}
+        ast_dict['scripts'] = {name: script for name, script in ast_dict['scripts'].items() if name in reachable_scripts}
+    
+    result = {
+        'success': True,
+        'javascript': js_code,
+        'ast': ast_dict,
+        **_diagnostics_result(error_manager, diagnostics)
+    }
+    if map_dict is not None:
+        result['source_map'] = map_dict
+    return result
+
+
+def _diagnostics_result(error_manager: CompileErrorManager, diagnostics: str) -> dict:
+    """Champs de diagnostics de compile_script (mise en forme seulement en mode 'text')"""
+    if diagnostics == 'text':
+        export = error_manager.format
+    else:
+        export = CompileError.to_dict
+    result = {
+        'errors': [export(e) for e in error_manager.get_errors()],
+        'warnings': [export(e) for e in error_manager.get_warnings()],
+        'error_count': error_manager.error_count,
+        'warning_count': error_manager.warning_count
+    }
+    if diagnostics == 'sarif':
+        result['sarif'] = error_manager.to_sarif()
+    return result
+
+
 def project_to_dict(project: Project) -> dict:
     """Convertit un Project en dictionnaire"""
     return {
@@ -56,7 +56,10 @@ class ConnectScriptHandler(BaseHTTPRequestHandler):
         
         Request body (JSON):
         {
-            "code": "page Home..."
+            "code": "page Home...",
+            "minify": false,       (optionnel)
+            "sourceMap": "inline", (optionnel: "inline" ou "external")
+            "sarif": false         (optionnel: journal SARIF 2.1.0 des diagnostics)
         }
         
         Response (JSON):
@@ -64,8 +67,13 @@ class ConnectScriptHandler(BaseHTTPRequestHandler):
             "success": true,
             "code": "// generated javascript",
             "ast": { ... },
-            "errors": [],
-            "warnings": []
+            "errors": [{"code": "CS1008", "level": "error", "message": ...,
+                        "line": 3, "column": 3, "suggestion": ...}],
+            "warnings": [],
+            "errorCount": 0,
+            "warningCount": 0,
+            "sarif": { ... },      (si "sarif" est demandé)
+            "sourceMap": { ... }   (si "sourceMap" est demandé)
         }
         """
         try:
@@ -76,9 +84,15 @@ class ConnectScriptHandler(BaseHTTPRequestHandler):
             # Parser JSON
             request_data = json.loads(body.decode('utf-8'))
             code = request_data.get('code', '')
+            minify = bool(request_data.get('minify', False))
+            source_map = request_data.get('sourceMap')
+            if source_map not in (None, 'inline', 'external'):
+                self.send_error(400, "sourceMap must be 'inline' or 'external'")
+                return
+            diagnostics = 'sarif' if request_data.get('sarif') else 'json'
             
             # Compiler
-            result = compile_script(code)
+            result = compile_script(code, minify=minify, source_map=source_map, diagnostics=diagnostics)
             
             # Répondre
             response = {
@@ -86,8 +100,14 @@ class ConnectScriptHandler(BaseHTTPRequestHandler):
                 'javascript': result['javascript'],
                 'ast': result['ast'],
                 'errors': result['errors'],
-                'warnings': result['warnings']
+                'warnings': result['warnings'],
+                'errorCount': result['error_count'],
+                'warningCount': result['warning_count']
             }
+            if 'sarif' in result:
+                response['sarif'] = result['sarif']
+            if 'source_map' in result:
+                response['sourceMap'] = result['source_map']
             
             self.send_response(200)
             self.send_header('Content-Type', 'application/json')
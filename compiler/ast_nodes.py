@@ -44,6 +44,7 @@ class UIElement:
     name: str
     properties: Dict[str, Any] = field(default_factory=dict)
     line: int = 0
+    column: int = 0
     
     def get_property(self, key: str, default=None):
         """Obtient une propriété avec valeur par défaut"""
@@ -57,6 +58,7 @@ class Page:
     background_color: str = "white"
     elements: List[UIElement] = field(default_factory=list)
     line: int = 0
+    column: int = 0
 
 
 @dataclass
@@ -65,6 +67,7 @@ class Action:
     action_type: str
     params: Dict[str, Any] = field(default_factory=dict)
     line: int = 0
+    column: int = 0
     
     def __repr__(self):
         return f"{self.action_type}({self.params})"
@@ -93,6 +96,7 @@ class EventHandler:
     event_type: EventType
     actions: List[Action] = field(default_factory=list)
     line: int = 0
+    column: int = 0
 
 
 @dataclass
@@ -0,0 +1,226 @@
+"""
+ConnectScript Async Event System
+Bus d'événements asyncio avec files bornées par écouteur
+"""
+import asyncio
+import logging
+from collections import deque
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from .event_system import Event, EventType, EventHistory, HistoryMode
+
+
+logger = logging.getLogger(__name__)
+
+
+class OverflowPolicy(Enum):
+    """Comportement quand la file d'un écouteur est pleine"""
+    DROP = "drop"          # l'événement émis est perdu pour cet écouteur
+    BLOCK = "block"        # emit() attend qu'une place se libère (backpressure)
+    COALESCE = "coalesce"  # retire l'événement en attente de même (type, source),
+                           # sinon le plus ancien, et ajoute le nouveau en fin de file
+
+
+class _Subscription:
+    """File bornée et tâche de traitement d'un écouteur"""
+
+    def __init__(
+        self,
+        event_type: EventType,
+        callback: Callable[[Event], Any],
+        maxsize: int,
+        overflow: OverflowPolicy,
+        threaded: bool
+    ):
+        if maxsize <= 0:
+            raise ValueError("queue_size doit être positif")
+        self.event_type = event_type
+        self.callback = callback
+        self.is_coroutine = asyncio.iscoroutinefunction(callback)
+        self.threaded = threaded
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.queue: Deque[Event] = deque()
+        self.dropped = 0
+        self.coalesced = 0
+        self.processed = 0
+        self.unfinished = 0
+        self.closed = False
+        self.task: Optional[asyncio.Task] = None
+        self._condition: Optional[asyncio.Condition] = None
+
+    @property
+    def condition(self) -> asyncio.Condition:
+        # Créée à la première utilisation, dans la boucle en cours
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def put(self, event: Event) -> None:
+        async with self.condition:
+            queue = self.queue
+            if len(queue) >= self.maxsize:
+                if self.overflow == OverflowPolicy.DROP:
+                    self.dropped += 1
+                    return
+                if self.overflow == OverflowPolicy.COALESCE:
+                    self._coalesce(event)
+                    return
+                await self.condition.wait_for(lambda: len(queue) < self.maxsize or self.closed)
+                if self.closed:
+                    return
+            queue.append(event)
+            self.unfinished += 1
+            self.condition.notify_all()
+
+    def _coalesce(self, event: Event) -> None:
+        """Retire un événement en attente de même clé (ou le plus ancien) et ajoute le nouveau"""
+        queue = self.queue
+        for i, queued in enumerate(queue):
+            if queued.type == event.type and queued.source == event.source:
+                del queue[i]
+                break
+        else:
+            queue.popleft()
+        queue.append(event)
+        self.coalesced += 1
+        self.condition.notify_all()
+
+    async def run(self, on_error: Callable[[Event, Exception], None]) -> None:
+        """Boucle de traitement (une tâche par écouteur)"""
+        queue = self.queue
+        condition = self.condition
+        while True:
+            async with condition:
+                await condition.wait_for(lambda: queue or self.closed)
+                if not queue:
+                    return
+                event = queue.popleft()
+                condition.notify_all()
+
+            try:
+                if self.is_coroutine:
+                    await self.callback(event)
+                elif self.threaded:
+                    await asyncio.to_thread(self.callback, event)
+                else:
+                    self.callback(event)
+            except Exception as e:
+                on_error(event, e)
+            finally:
+                self.processed += 1
+                async with condition:
+                    self.unfinished -= 1
+                    condition.notify_all()
+
+    async def join(self) -> None:
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.unfinished == 0 or self.task is None or self.task.done())
+
+    async def close(self) -> None:
+        async with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        if self.task is not None:
+            await self.task
+
+
+class AsyncEventBus:
+    """
+    Bus d'événements asyncio.
+
+    Chaque écouteur a sa propre file bornée et sa propre tâche: un écouteur
+    lent (logger, websocket...) ne ralentit ni l'émetteur ni les autres
+    écouteurs. Les callbacks peuvent être des coroutines ou des fonctions;
+    avec threaded=True une fonction bloquante tourne dans un thread.
+    L'ordre des événements est conservé pour chaque écouteur.
+    """
+
+    def __init__(
+        self,
+        queue_size: int = 100,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        history_mode: HistoryMode = HistoryMode.UNBOUNDED,
+        history_size: int = 1000,
+        history_window: float = 60.0,
+        on_error: Optional[Callable[[Event, Exception], None]] = None
+    ):
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.subscriptions: Dict[EventType, List[_Subscription]] = {}
+        self.history = EventHistory(history_mode, history_size, history_window)
+        self._record = self.history.append if history_mode != HistoryMode.DISABLED else None
+        self.on_error = on_error or self._log_error
+
+    @staticmethod
+    def _log_error(event: Event, error: Exception) -> None:
+        logger.error("Error in event listener for %s (%s): %r", event.type.value, event.source, error)
+
+    def subscribe(
+        self,
+        event_type: EventType,
+        callback: Callable[[Event], Any],
+        queue_size: Optional[int] = None,
+        overflow: Optional[OverflowPolicy] = None,
+        threaded: bool = False
+    ) -> Callable:
+        """S'abonne à un type d'événement; retourne une coroutine de désabonnement"""
+        subscription = _Subscription(
+            event_type,
+            callback,
+            queue_size or self.queue_size,
+            overflow or self.overflow,
+            threaded
+        )
+        self.subscriptions.setdefault(event_type, []).append(subscription)
+
+        async def unsubscribe():
+            subscriptions = self.subscriptions.get(event_type, [])
+            if subscription in subscriptions:
+                subscriptions.remove(subscription)
+                await subscription.close()
+
+        return unsubscribe
+
+    on = subscribe
+
+    async def emit(self, event: Event) -> None:
+        """Émet un événement vers les files des écouteurs"""
+        record = self._record
+        if record is not None:
+            record(event)
+
+        for subscription in self.subscriptions.get(event.type, ()):
+            if subscription.task is None:
+                subscription.task = asyncio.create_task(subscription.run(self.on_error))
+            await subscription.put(event)
+
+    async def join(self) -> None:
+        """Attend que tous les événements émis aient été traités"""
+        for subscriptions in list(self.subscriptions.values()):
+            for subscription in list(subscriptions):
+                await subscription.join()
+
+    async def close(self) -> None:
+        """Traite les événements en attente puis arrête les tâches des écouteurs"""
+        for subscriptions in list(self.subscriptions.values()):
+            for subscription in subscriptions:
+                await subscription.close()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Compteurs par type d'événement (traités, perdus, fusionnés, en attente)"""
+        result = {}
+        for event_type, subscriptions in self.subscriptions.items():
+            result[event_type.value] = {
+                'listeners': len(subscriptions),
+                'processed': sum(s.processed for s in subscriptions),
+                'dropped': sum(s.dropped for s in subscriptions),
+                'coalesced': sum(s.coalesced for s in subscriptions),
+                'pending': sum(len(s.queue) for s in subscriptions),
+            }
+        return result
+
+    def get_events_of_type(self, event_type: EventType) -> List[Event]:
+        """Obtient les événements d'un type"""
+        return self.history.query(event_type=event_type)
@@ -0,0 +1,238 @@
+"""
+ConnectScript Benchmarks
+Mesures de performance du compilateur et du runtime
+
+Usage: python benchmarks.py
+"""
+import os
+import sys
+import time
+from typing import Callable, Dict
+
+# Add compiler directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from compiler.parser import parse_connect_script
+from compiler.interpreter import Interpreter
+from compiler.bytecode import BytecodeInterpreter
+from compiler.event_system import Event, EventBus, EventHandler, EventType, HistoryMode
+from compiler.scheduler import TickScheduler
+from compiler.sessions import SessionHost, HostReport
+from compiler.json_project import project_from_json, project_to_json
+
+
+TICK_HEAVY_GAME = """
+page Game
+-text score
+--value "Score: 0"
+
+page GameOver
+-text msg
+--value "Game Over!"
+
+on start
+ set score 0
+ set timer 1000
+ set speed 1
+end
+
+on tick
+ add score 3
+ add score 2
+ subtract timer 1
+ add frames 1
+ add speed 1
+ subtract speed 1
+ add distance 5
+ add energy 2
+ subtract energy 1
+end
+"""
+
+
+def _measure(run: Callable[[], None], repeat: int = 3) -> float:
+    """Meilleur temps (secondes) sur plusieurs répétitions"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_interpreters(ticks: int = 20000) -> Dict[str, float]:
+    """Interpréteur par parcours d'arbre vs machine virtuelle bytecode (ticks/s)"""
+    project, _ = parse_connect_script(TICK_HEAVY_GAME)
+    results = {}
+
+    for name, runtime_class in (("tree-walking", Interpreter), ("bytecode", BytecodeInterpreter)):
+        def run():
+            runtime = runtime_class(project)
+            runtime.start()
+            runtime.tick(ticks)
+
+        results[name] = ticks / _measure(run)
+
+    return results
+
+
+class _BroadcastEventBus:
+    """Référence: dispatch d'origine (liste d'écouteurs, handle() + try/except)"""
+
+    def __init__(self, record_history: bool = True):
+        self.listeners = {}
+        self.history = []
+        self.record_history = record_history
+
+    def on(self, event_type, callback):
+        self.listeners.setdefault(event_type, []).append(EventHandler(callback))
+
+    def emit(self, event):
+        if self.record_history:
+            self.history.append(event)
+        if event.type in self.listeners:
+            for listener in self.listeners[event.type]:
+                listener.handle(event)
+
+
+def bench_emit(count: int = 200000) -> Dict[str, Dict[str, float]]:
+    """Émissions par seconde: dispatch d'origine vs tables de dispatch figées"""
+    event = Event(type=EventType.TICK, source="app", timestamp=0, data={})
+    scenarios = {
+        "no listeners": 0,
+        "3 listeners": 3,
+    }
+    results = {}
+
+    for scenario, listener_count in scenarios.items():
+        buses = {
+            "before": _BroadcastEventBus(record_history=False),
+            "after": EventBus(history_mode=HistoryMode.DISABLED),
+        }
+        results[scenario] = {}
+        for name, bus in buses.items():
+            for _ in range(listener_count):
+                bus.on(EventType.TICK, lambda e: None)
+            emit = bus.emit
+
+            def run():
+                for _ in range(count):
+                    emit(event)
+
+            results[scenario][name] = count / _measure(run)
+
+    return results
+
+
+def bench_source_filter(listeners: int = 50, count: int = 100000) -> Dict[str, float]:
+    """Clics par seconde: filtrage dans chaque callback vs abonnements par source"""
+    events = [
+        Event(type=EventType.CLICK, source=f"button{i % listeners}", timestamp=0, data={})
+        for i in range(count)
+    ]
+    results = {}
+
+    broadcast = _BroadcastEventBus(record_history=False)
+    for i in range(listeners):
+        def on_click(event, name=f"button{i}"):
+            if event.source == name:
+                pass
+        broadcast.on(EventType.CLICK, on_click)
+
+    indexed = EventBus(history_mode=HistoryMode.DISABLED)
+    for i in range(listeners):
+        indexed.on(EventType.CLICK, lambda e: None, source=f"button{i}")
+
+    for name, bus in (("before", broadcast), ("after", indexed)):
+        emit = bus.emit
+
+        def run():
+            for event in events:
+                emit(event)
+
+        results[name] = count / _measure(run)
+
+    return results
+
+
+def bench_scheduler(ticks: int = 20000) -> Dict[str, float]:
+    """Ticks par seconde en horloge virtuelle (TickScheduler)"""
+    project, _ = parse_connect_script(TICK_HEAVY_GAME)
+    results = {}
+
+    for name, runtime_class in (("tree-walking", Interpreter), ("bytecode", BytecodeInterpreter)):
+        def run():
+            scheduler = TickScheduler(EventBus(history_mode=HistoryMode.DISABLED))
+            runtime = runtime_class(project, scheduler=scheduler)
+            runtime.start()
+            scheduler.run(ticks=ticks)
+
+        results[name] = ticks / _measure(run)
+
+    return results
+
+
+def bench_sessions(sessions: int = 400, ticks: int = 100) -> Dict[int, HostReport]:
+    """Débit de SessionHost selon le nombre de processus"""
+    project, _ = parse_connect_script(TICK_HEAVY_GAME)
+    inputs = [[("tick", ticks)]] * sessions
+    workers = sorted({1, os.cpu_count() or 1})
+    return {count: SessionHost(project, workers=count).run(inputs) for count in workers}
+
+
+def _large_source(pages: int, elements: int) -> str:
+    """Source ConnectScript de pages * elements boutons"""
+    lines = []
+    for p in range(pages):
+        lines.append(f"page Page{p}")
+        for e in range(elements):
+            lines += [f"-button b{p}_{e}", f'--text "Go {e}"', f"--position {e} {p}", "--script script_click"]
+        lines.append("")
+    lines += ["on start", " set score 0", "end", "", "on click", " add score 1", " connect.goto(Page0)", "end"]
+    return "\n".join(lines)
+
+
+def bench_json_project(pages: int = 200, elements: int = 20) -> Dict[str, float]:
+    """Projets par seconde jusqu'au Project: texte (tokenizer + parser) vs JSON direct"""
+    source = _large_source(pages, elements)
+    project, _ = parse_connect_script(source)
+    data = project_to_json(project)
+    return {
+        "texte": 1 / _measure(lambda: parse_connect_script(source), repeat=3),
+        "json": 1 / _measure(lambda: project_from_json(data), repeat=3),
+    }
+
+
+def main():
+    print("⏱  Interpréteur vs bytecode (jeu à ticks intensifs)")
+    results = bench_interpreters()
+    for name, rate in results.items():
+        print(f"   {name:<14} {rate:>12,.0f} ticks/s")
+    print(f"   speedup        {results['bytecode'] / results['tree-walking']:>12.2f}x")
+
+    print("\n⏱  TickScheduler (horloge virtuelle, sans historique)")
+    for name, rate in bench_scheduler().items():
+        print(f"   {name:<14} {rate:>12,.0f} ticks/s")
+
+    print("\n⏱  SessionHost (sessions indépendantes)")
+    for report in bench_sessions().values():
+        print(f"   {report.summary()}")
+
+    print("\n⏱  EventBus.emit (sans historique)")
+    for scenario, rates in bench_emit().items():
+        print(f"   {scenario:<14} avant {rates['before']:>12,.0f}/s   après {rates['after']:>12,.0f}/s"
+              f"   ({rates['after'] / rates['before']:.2f}x)")
+
+    print("\n⏱  EventBus.emit (50 écouteurs de clic, 1 concerné par événement)")
+    rates = bench_source_filter()
+    print(f"   filtre par source avant {rates['before']:>12,.0f}/s   après {rates['after']:>12,.0f}/s"
+          f"   ({rates['after'] / rates['before']:.2f}x)")
+
+    print("\n⏱  Projet de 200 pages x 20 boutons jusqu'au Project")
+    rates = bench_json_project()
+    print(f"   texte {rates['texte']:>8,.1f}/s   json {rates['json']:>8,.1f}/s"
+          f"   ({rates['json'] / rates['texte']:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,234 +2,459 @@
 ConnectScript Compiler
 Génère du JavaScript sûr
 """
-from ast_nodes import Project, Page, Script, EventHandler, Action, UIElement
-from errors import CompileErrorManager, ErrorLevel
-from typing import Dict, List, Set
+from .ast_nodes import Project, Page, Script, EventHandler, Action, UIElement
+from .errors import CompileErrorManager, ErrorLevel, ErrorCode
+from .sourcemap import SourceMapBuilder, source_map_comment
+from .optimizer import find_reachable
+from typing import Dict, List, Optional, Set
 import json
 
 
+# Caractères à échapper dans un littéral de chaîne JavaScript entre apostrophes
+JS_STRING_ESCAPES = str.maketrans({
+    "\\": "\\\\",
+    "'": "\\'",
+    "\n": "\\n",
+    "\r": "\\r",
+    "\u2028": "\\u2028",
+    "\u2029": "\\u2029",
+})
+
+
+def js_string(value) -> str:
+    """Littéral de chaîne JavaScript (entre apostrophes, échappé)"""
+    return "'" + str(value).translate(JS_STRING_ESCAPES) + "'"
+
+
+def js_value(value) -> str:
+    """Littéral JavaScript d'une valeur (chaîne, nombre, booléen, null, JSON)"""
+    if isinstance(value, str):
+        return js_string(value)
+    return json.dumps(value)
+
+
 class CodeGenerator:
     """Génère du code JavaScript sûr"""
     
-    def __init__(self, project: Project, error_manager: CompileErrorManager):
+    # Noms courts utilisés par le profil minifié (propriétés internes de ConnectApp)
+    SHORT_NAMES = {
+        'variables': 'v',
+        'pages': 'p',
+        'events': 'e',
+        'currentPage': 'c',
+        'name': 'n',
+        'backgroundColor': 'b',
+        'elements': 'l',
+        'type': 't',
+        'properties': 'r',
+    }
+    
+    def __init__(
+        self,
+        project: Project,
+        error_manager: CompileErrorManager,
+        minify: bool = False,
+        source_map: bool = False,
+        file_name: str = "app.js",
+        source_name: str = "main.cs",
+        prune_unreachable: bool = False
+    ):
         self.project = project
         self.error_manager = error_manager
+        self.minify = minify
+        self.prune_unreachable = prune_unreachable
+        self.source_map: Optional[SourceMapBuilder] = None
+        if source_map:
+            self.source_map = SourceMapBuilder(file_name, source_name, error_manager.source_code)
+        self._chunks: List[str] = []
+        self._line = 0
+        self._column = 0
         self.variables: Set[str] = set()
         self.events: Dict[str, List[str]] = {}
+        # Séparateur de lignes et de tokens selon le profil de sortie
+        self.nl = "" if minify else "\n"
+        self.sp = "" if minify else " "
     
     def generate(self) -> str:
         """Génère le code JavaScript complet"""
-        output = []
+        self._chunks = []
+        self._line = 0
+        self._column = 0
+        if self.source_map is not None:
+            self.source_map = SourceMapBuilder(
+                self.source_map.file, self.source_map.source, self.source_map.source_content
+            )
+        sp = self.sp
         
         # Header
-        output.append("// Generated by ConnectScript Compiler")
-        output.append("// DO NOT EDIT MANUALLY\n")
+        if not self.minify:
+            self._emit("// Generated by ConnectScript Compiler")
+            self._emit("// DO NOT EDIT MANUALLY\n")
         
         # Initialisation de l'app
-        output.append("const ConnectApp = {")
+        self._emit(f"const ConnectApp{sp}={sp}" + "{")
         
         # Variables
-        output.append("  variables: {},")
-        output.append("  pages: {},")
-        output.append("  events: {},")
-        output.append("  currentPage: null,")
+        for key in ("variables", "pages", "events"):
+            self._emit(f"{self._spaces(2)}{self._key(key)}:{sp}" + "{},")
+        self._emit(f"{self._spaces(2)}{self._key('currentPage')}:{sp}null,")
         
         # Initialisation des pages
-        output.append("  initPages() {")
-        for page_name, page in self.project.pages.items():
-            output.append(self._generate_page(page))
-        output.append("  },")
+        self._emit(f"{self._spaces(2)}initPages(){sp}" + "{")
+        pages, scripts = self._select_reachable()
+        
+        for page in pages:
+            self._generate_page(page)
+        self._emit(f"{self._spaces(2)}" + "},")
         
         # Initialisation des scripts
-        output.append("  initScripts() {")
-        for script_name, script in self.project.scripts.items():
-            output.append(self._generate_script(script))
-        output.append("  },")
+        self._emit(f"{self._spaces(2)}initScripts(){sp}" + "{")
+        if self.minify and scripts:
+            # Alias local capturé par les handlers (fonctions fléchées)
+            self._emit("const v=this.v;")
+        for script in scripts:
+            self._generate_script(script)
+        self._emit(f"{self._spaces(2)}" + "},")
         
         # Exécution d'action
-        output.append(self._generate_execute_action())
+        self._emit(self._generate_execute_action())
         
         # Affichage de page
-        output.append(self._generate_show_page())
+        self._emit(self._generate_show_page())
         
         # Enregistrement d'événement
-        output.append(self._generate_register_event())
+        self._emit(self._generate_register_event())
         
         # Initialisation
-        output.append(self._generate_init())
+        self._emit(self._generate_init())
         
-        output.append("};")
+        self._emit("};")
         
         # Appel d'initialisation
-        output.append("\n// Initialize on page load")
-        output.append("if (document.readyState === 'loading') {")
-        output.append("  document.addEventListener('DOMContentLoaded', () => ConnectApp.init());")
-        output.append("} else {")
-        output.append("  ConnectApp.init();")
-        output.append("}")
+        self._emit(self._generate_bootstrap())
+        
+        return "".join(self._chunks)
+    
+    def _emit(self, text: str, node=None) -> None:
+        """
+        Ajoute un fragment au code généré.
         
-        return "\n".join(output)
+        Si une source map est demandée, la position générée est suivie au fil
+        de l'eau et le nœud AST (Page, UIElement, Action...) y est associé.
+        """
+        if self._chunks and self.nl:
+            self._chunks.append(self.nl)
+            if self.source_map is not None:
+                self._line += 1
+                self._column = 0
+        
+        if self.source_map is not None:
+            if node is not None and node.line > 0:
+                indent = len(text) - len(text.lstrip(" "))
+                self.source_map.add_mapping(
+                    self._line, self._column + indent,
+                    node.line - 1, max(node.column - 1, 0)
+                )
+            newlines = text.count("\n")
+            if newlines:
+                self._line += newlines
+                self._column = len(text) - text.rfind("\n") - 1
+            else:
+                self._column += len(text)
+        
+        self._chunks.append(text)
+    
+    def get_source_map(self) -> Optional[dict]:
+        """Retourne la source map v3 du dernier code généré"""
+        if self.source_map is None:
+            return None
+        return self.source_map.to_dict()
+    
+    def _select_reachable(self) -> tuple[List[Page], List[Script]]:
+        """Pages et scripts à générer (élimine le code mort si demandé)"""
+        pages = list(self.project.pages.values())
+        scripts = list(self.project.scripts.values())
+        if not self.prune_unreachable:
+            return pages, scripts
+        
+        reachable_pages, reachable_scripts = find_reachable(self.project)
+        
+        for page in pages:
+            if page.name not in reachable_pages:
+                self.error_manager.add_warning(
+                    f"Page inaccessible supprimée: {page.name}",
+                    page.line,
+                    page.column,
+                    suggestion="Ajoutez un connect.goto vers cette page ou supprimez-la",
+                    code=ErrorCode.UNREACHABLE_PAGE
+                )
+        for script in scripts:
+            if script.name not in reachable_scripts:
+                self.error_manager.add_warning(
+                    f"Script inaccessible supprimé: {script.name}",
+                    script.line,
+                    suggestion="Référencez-le avec --script sur un élément ou supprimez-le",
+                    code=ErrorCode.UNREACHABLE_SCRIPT
+                )
+        
+        return (
+            [p for p in pages if p.name in reachable_pages],
+            [s for s in scripts if s.name in reachable_scripts]
+        )
+    
+    def _spaces(self, indent: int) -> str:
+        """Indentation (vide en mode minifié)"""
+        return "" if self.minify else " " * indent
+    
+    def _key(self, name: str) -> str:
+        """Nom de propriété selon le profil de sortie"""
+        return self.SHORT_NAMES[name] if self.minify else name
     
-    def _generate_page(self, page: Page) -> str:
+    def _var(self, name: str) -> str:
+        """Accès à une variable du programme"""
+        if self.minify:
+            return f"v[{js_string(name)}]"
+        return f"this.variables[{js_string(name)}]"
+    
+    def _generate_page(self, page: Page) -> None:
         """Génère le code pour une page"""
-        lines = []
-        lines.append(f"  this.pages['{page.name}'] = " + "{")
-        lines.append(f"    name: '{page.name}',")
-        lines.append(f"    backgroundColor: '{page.background_color}',")
-        lines.append("    elements: [")
+        sp = self.sp
+        self._emit(f"{self._spaces(2)}this.{self._key('pages')}[{js_string(page.name)}]{sp}={sp}" + "{", page)
+        self._emit(f"{self._spaces(4)}{self._key('name')}:{sp}{js_string(page.name)},")
+        self._emit(f"{self._spaces(4)}{self._key('backgroundColor')}:{sp}{js_string(page.background_color)},")
+        self._emit(f"{self._spaces(4)}{self._key('elements')}:{sp}[")
         
         for element in page.elements:
-            lines.append(self._generate_element(element, indent=6))
-        
-        lines.append("    ]")
-        lines.append("  };")
+            self._emit(self._generate_element(element, indent=6), element)
         
-        return "\n".join(lines)
+        self._emit(f"{self._spaces(4)}]")
+        self._emit(f"{self._spaces(2)}" + "};")
     
     def _generate_element(self, element: UIElement, indent: int = 0) -> str:
         """Génère la définition d'un élément"""
+        if self.minify:
+            props_json = json.dumps(element.properties, separators=(',', ':'))
+            return "{" + f"t:{js_string(element.element_type)},n:{js_string(element.name)},r:{props_json}" + "},"
+        
         spaces = " " * indent
         props_json = json.dumps(element.properties)
         
         return f"{spaces}" + "{\n" \
-            f"{spaces}  type: '{element.element_type}',\n" \
-            f"{spaces}  name: '{element.name}',\n" \
+            f"{spaces}  type: {js_string(element.element_type)},\n" \
+            f"{spaces}  name: {js_string(element.name)},\n" \
             f"{spaces}  properties: {props_json}\n" \
             f"{spaces}" + "},"
     
-    def _generate_script(self, script: Script) -> str:
+    def _generate_script(self, script: Script) -> None:
         """Génère le code pour un script"""
-        lines = []
-        lines.append(f"  this.events['{script.name}'] = " + "{")
+        sp = self.sp
+        self._emit(f"{self._spaces(2)}this.{self._key('events')}[{js_string(script.name)}]{sp}={sp}" + "{")
         
         for handler in script.event_handlers:
-            lines.append(f"    on{handler.event_type.value.capitalize()}: async () => " + "{")
+            self._emit(
+                f"{self._spaces(4)}on{handler.event_type.value.capitalize()}:{sp}async{sp}(){sp}=>{sp}" + "{",
+                handler
+            )
             
             for action in handler.actions:
-                lines.append(self._generate_action(action, indent=6))
+                self._emit(self._generate_action(action, indent=6), action)
             
-            lines.append("    },")
+            self._emit(f"{self._spaces(4)}" + "},")
         
-        lines.append("  };")
-        
-        return "\n".join(lines)
+        self._emit(f"{self._spaces(2)}" + "};")
     
     def _generate_action(self, action: Action, indent: int = 4) -> str:
         """Génère le code pour une action"""
-        spaces = " " * indent
+        spaces = self._spaces(indent)
+        sp = self.sp
         action_type = action.action_type
         
         if action_type == "alert":
-            message = action.params.get("message", "").replace("'", "\\'")
-            return f"{spaces}window.alert('{message}');"
+            return f"{spaces}window.alert({js_string(action.params.get('message', ''))});"
         
         elif action_type == "set":
-            var = action.params.get("variable", "")
-            val = action.params.get("value", "")
-            if isinstance(val, str):
-                return f"{spaces}this.variables['{var}'] = '{val}';"
-            else:
-                return f"{spaces}this.variables['{var}'] = {val};"
+            var = self._var(action.params.get("variable", ""))
+            val = js_value(action.params.get("value", ""))
+            return f"{spaces}{var}{sp}={sp}{val};"
         
         elif action_type == "add":
-            var = action.params.get("variable", "")
-            val = action.params.get("value", 0)
-            return f"{spaces}this.variables['{var}'] = (this.variables['{var}'] || 0) + {val};"
+            var = self._var(action.params.get("variable", ""))
+            val = js_value(action.params.get("value", 0))
+            return f"{spaces}{var}{sp}={sp}({var}{sp}||{sp}0){sp}+{sp}{val};"
         
         elif action_type == "subtract":
-            var = action.params.get("variable", "")
-            val = action.params.get("value", 0)
-            return f"{spaces}this.variables['{var}'] = (this.variables['{var}'] || 0) - {val};"
+            var = self._var(action.params.get("variable", ""))
+            val = js_value(action.params.get("value", 0))
+            return f"{spaces}{var}{sp}={sp}({var}{sp}||{sp}0){sp}-{sp}{val};"
         
         elif action_type == "goto":
             page = action.params.get("page", "")
-            return f"{spaces}await this.showPage('{page}');"
+            return f"{spaces}await this.showPage({js_string(page)});"
         
         elif action_type == "play":
             sound = action.params.get("sound", "")
-            return f"{spaces}// play('{sound}') - not implemented"
+            # Un commentaire de ligne casserait la sortie minifiée (pas de sauts de ligne)
+            if self.minify:
+                return ""
+            return f"{spaces}// play({js_string(sound)}) - not implemented"
         
         elif action_type == "wait":
             seconds = action.params.get("seconds", 1)
-            return f"{spaces}await new Promise(r => setTimeout(r, {seconds * 1000}));"
+            if isinstance(seconds, (int, float)) and not isinstance(seconds, bool):
+                delay = seconds * 1000
+            else:
+                delay = f"{js_value(seconds)}{sp}*{sp}1000"
+            return f"{spaces}await new Promise(r{sp}=>{sp}setTimeout(r,{sp}{delay}));"
         
         elif action_type == "if":
             condition = action.params.get("condition", "")
-            return f"{spaces}if ({condition}) " + "{"
+            return f"{spaces}if{sp}({condition}){sp}" + "{"
+        
+        if self.minify:
+            return ""
+        return f"{spaces}// Unknown action: {js_string(action_type)}"
+    
+    def _runtime(self, lines: List[tuple]) -> str:
+        """
+        Assemble une fonction du runtime à partir de (indentation, ligne).
         
-        return f"{spaces}// Unknown action: {action_type}"
+        En mode minifié, les commentaires et lignes vides sont supprimés et
+        les lignes sont collées; une ligne vide garde son indentation sinon.
+        """
+        out = []
+        for indent, text in lines:
+            if self.minify and (not text or text.startswith("//")):
+                continue
+            out.append(self._spaces(indent) + text)
+        return self.nl.join(out)
     
     def _generate_execute_action(self) -> str:
         """Génère la fonction d'exécution d'action"""
-        return """  async executeAction(actionName) {
-    const parts = actionName.split('.');
-    const scriptName = parts[0];
-    const script = this.events[scriptName];
-    
-    if (!script) {
-      console.error(`Script not found: ${scriptName}`);
-      return;
-    }
-    
-    // Execute the appropriate event handler
-    // This is called by UI elements when clicked
-    if (script.onClick) {
-      await script.onClick();
-    }
-  },"""
+        sp, k = self.sp, self._key
+        return self._runtime([
+            (2, f"async executeAction(actionName){sp}" + "{"),
+            (4, f"const parts{sp}={sp}actionName.split('.');"),
+            (4, f"const scriptName{sp}={sp}parts[0];"),
+            (4, f"const script{sp}={sp}this.{k('events')}[scriptName];"),
+            (4, ""),
+            (4, f"if{sp}(!script){sp}" + "{"),
+            (6, "console.error(`Script not found: ${scriptName}`);"),
+            (6, "return;"),
+            (4, "}"),
+            (4, ""),
+            (4, "// Execute the appropriate event handler"),
+            (4, "// This is called by UI elements when clicked"),
+            (4, f"if{sp}(script.onClick){sp}" + "{"),
+            (6, "await script.onClick();"),
+            (4, "}"),
+            (2, "},"),
+        ])
     
     def _generate_show_page(self) -> str:
         """Génère la fonction d'affichage de page"""
-        return """  async showPage(pageName) {
-    const page = this.pages[pageName];
-    if (!page) {
-      console.error(`Page not found: ${pageName}`);
-      return;
-    }
-    
-    this.currentPage = pageName;
-    this.renderPage(page);
-  },
-  
-  renderPage(page) {
-    const canvas = document.querySelector('.canvas');
-    if (!canvas) return;
-    
-    // Update background color
-    canvas.style.backgroundColor = page.backgroundColor;
-    
-    // Render elements
-    // This would be integrated with the Vue preview
-    console.log(`Rendering page: ${page.name}`);
-  },"""
+        sp, k = self.sp, self._key
+        return self._runtime([
+            (2, f"async showPage(pageName){sp}" + "{"),
+            (4, f"const page{sp}={sp}this.{k('pages')}[pageName];"),
+            (4, f"if{sp}(!page){sp}" + "{"),
+            (6, "console.error(`Page not found: ${pageName}`);"),
+            (6, "return;"),
+            (4, "}"),
+            (4, ""),
+            (4, f"this.{k('currentPage')}{sp}={sp}pageName;"),
+            (4, "this.renderPage(page);"),
+            (2, "},"),
+            (2, ""),
+            (2, f"renderPage(page){sp}" + "{"),
+            (4, f"const canvas{sp}={sp}document.querySelector('.canvas');"),
+            (4, f"if{sp}(!canvas){sp}return;"),
+            (4, ""),
+            (4, "// Update background color"),
+            (4, f"canvas.style.backgroundColor{sp}={sp}page.{k('backgroundColor')};"),
+            (4, ""),
+            (4, "// Render elements"),
+            (4, "// This would be integrated with the Vue preview"),
+            (4, f"console.log(`Rendering page: ${{page.{k('name')}}}`);"),
+            (2, "},"),
+        ])
     
     def _generate_register_event(self) -> str:
         """Génère la fonction d'enregistrement d'événement"""
-        return """  registerEvent(elementName, scriptName, eventType = 'click') {
-    // Register event handler for UI element
-    // Called when element is clicked
-    if (this.events[scriptName] && this.events[scriptName].onClick) {
-      // Will be called by the UI framework
-    }
-  },"""
+        sp, k = self.sp, self._key
+        return self._runtime([
+            (2, f"registerEvent(elementName,{sp}scriptName,{sp}eventType{sp}={sp}'click'){sp}" + "{"),
+            (4, "// Register event handler for UI element"),
+            (4, "// Called when element is clicked"),
+            (4, f"if{sp}(this.{k('events')}[scriptName]{sp}&&{sp}this.{k('events')}[scriptName].onClick){sp}" + "{"),
+            (6, "// Will be called by the UI framework"),
+            (4, "}"),
+            (2, "},"),
+        ])
     
     def _generate_init(self) -> str:
         """Génère la fonction d'initialisation"""
-        return """  async init() {
-    this.initPages();
-    this.initScripts();
-    
-    // Show the first page
-    const firstPageName = Object.keys(this.pages)[0];
-    if (firstPageName) {
-      await this.showPage(firstPageName);
-    }
+        sp, k = self.sp, self._key
+        return self._runtime([
+            (2, f"async init(){sp}" + "{"),
+            (4, "this.initPages();"),
+            (4, "this.initScripts();"),
+            (4, ""),
+            (4, "// Show the first page"),
+            (4, f"const firstPageName{sp}={sp}Object.keys(this.{k('pages')})[0];"),
+            (4, f"if{sp}(firstPageName){sp}" + "{"),
+            (6, "await this.showPage(firstPageName);"),
+            (4, "}"),
+            (4, ""),
+            (4, "console.log('ConnectApp initialized');"),
+            (2, "}"),
+        ])
     
-    console.log('ConnectApp initialized');
-  }"""
+    def _generate_bootstrap(self) -> str:
+        """Génère l'appel d'initialisation au chargement de la page"""
+        sp = self.sp
+        return self._runtime([
+            (0, ""),
+            (0, "// Initialize on page load"),
+            (0, f"if{sp}(document.readyState{sp}==={sp}'loading'){sp}" + "{"),
+            (2, f"document.addEventListener('DOMContentLoaded',{sp}(){sp}=>{sp}ConnectApp.init());"),
+            (0, f"}}{sp}else{sp}" + "{"),
+            (2, "ConnectApp.init();"),
+            (0, "}"),
+        ])
 
 
-def compile_project(project: Project, error_manager: CompileErrorManager) -> str:
+def compile_project(
+    project: Project,
+    error_manager: CompileErrorManager,
+    minify: bool = False,
+    prune_unreachable: bool = False
+) -> str:
     """Compile le projet en JavaScript"""
-    generator = CodeGenerator(project, error_manager)
+    generator = CodeGenerator(project, error_manager, minify=minify, prune_unreachable=prune_unreachable)
     return generator.generate()
+
+
+def compile_project_with_source_map(
+    project: Project,
+    error_manager: CompileErrorManager,
+    minify: bool = False,
+    inline: bool = False,
+    file_name: str = "app.js",
+    source_name: str = "main.cs",
+    prune_unreachable: bool = False
+) -> tuple[str, dict]:
+    """
+    Compile le projet en JavaScript avec sa source map v3
+    
+    Le code se termine par un commentaire sourceMappingURL: la map est soit
+    incluse en ligne (inline=True), soit attendue à l'URL voisine '<file_name>.map'.
+    """
+    generator = CodeGenerator(
+        project, error_manager, minify=minify, source_map=True,
+        file_name=file_name, source_name=source_name,
+        prune_unreachable=prune_unreachable
+    )
+    js_code = generator.generate()
+    url = None if inline else f"{file_name}.map"
+    js_code += "\n" + source_map_comment(generator.source_map, url)
+    return js_code, generator.get_source_map()
@@ -1,19 +1,28 @@
 """
 ConnectScript Compiler - Main Entry Point
 """
-from tokenizer import Tokenizer
-from parser import Parser
-from codegen import compile_project
-from event_system import create_event_bus, create_event_context
-from errors import CompileErrorManager
+import os
+import sys
+
+# Add compiler directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from compiler.tokenizer import Tokenizer
+from compiler.parser import Parser
+from compiler.optimizer import optimize_project, find_reachable
+from compiler.codegen import compile_project
+from compiler.event_system import create_event_bus, create_event_context
+from compiler.errors import CompileErrorManager
 import json
 
 
 class ConnectScriptCompiler:
     """Compilateur principal ConnectScript"""
     
-    def __init__(self):
+    def __init__(self, optimize: bool = False, prune: bool = False):
         self.error_manager = None
+        self.optimize = optimize
+        self.prune = prune
     
     def compile(self, source_code: str) -> dict:
         """
@@ -50,17 +59,22 @@ class ConnectScriptCompiler:
             self.error_manager = parser.error_manager
             
             if parser.error_manager.has_errors():
-                result['errors'] = [str(e) for e in parser.error_manager.get_errors()]
-                result['warnings'] = [str(e) for e in parser.error_manager.get_warnings()]
+                result['errors'] = [parser.error_manager.format(e) for e in parser.error_manager.get_errors()]
+                result['warnings'] = [parser.error_manager.format(e) for e in parser.error_manager.get_warnings()]
                 print(f"   ✗ {len(result['errors'])} erreur(s) trouvée(s)")
                 print(f"   ⚠ {len(result['warnings'])} avertissement(s)")
                 return result
             
             print(f"   ✓ {len(project.pages)} page(s), {len(project.scripts)} script(s)")
             
+            # Étape 2b: Optimisation de l'AST
+            if self.optimize:
+                print("🪄 Optimizing...")
+                optimize_project(project)
+            
             # Étape 3: Code Generation
             print("⚙️  Generating JavaScript...")
-            js_code = compile_project(project, self.error_manager)
+            js_code = compile_project(project, self.error_manager, prune_unreachable=self.prune)
             print(f"   ✓ {len(js_code)} caractères générés")
             
             # Étape 4: AST Export
@@ -101,10 +115,15 @@ class ConnectScriptCompiler:
                 }
             }
             
+            if self.prune:
+                reachable_pages, reachable_scripts = find_reachable(project)
+                ast_data['pages'] = {n: p for n, p in ast_data['pages'].items() if n in reachable_pages}
+                ast_data['scripts'] = {n: s for n, s in ast_data['scripts'].items() if n in reachable_scripts}
+            
             result['success'] = True
             result['code'] = js_code
             result['ast'] = ast_data
-            result['warnings'] = [str(e) for e in self.error_manager.get_warnings()]
+            result['warnings'] = [self.error_manager.format(e) for e in self.error_manager.get_warnings()]
             
             print("\n✅ Compilation réussie!\n")
             return result
@@ -2,11 +2,18 @@
 ConnectScript Error Handling
 Système de gestion d'erreurs avec numéros de ligne
 """
+from array import array
 from dataclasses import dataclass
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from enum import Enum
 
 
+# Outil déclaré dans les exports SARIF
+TOOL_NAME = "ConnectScript Compiler"
+TOOL_VERSION = "1.0.0"
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+
 class ErrorLevel(Enum):
     """Niveaux d'erreur"""
     ERROR = "error"
@@ -14,6 +21,49 @@ class ErrorLevel(Enum):
     INFO = "info"
 
 
+# Niveau SARIF correspondant
+SARIF_LEVELS = {
+    ErrorLevel.ERROR: "error",
+    ErrorLevel.WARNING: "warning",
+    ErrorLevel.INFO: "note",
+}
+
+
+class ErrorCode(Enum):
+    """
+    Codes stables des diagnostics (CSxxxx)
+    
+    Un code ne change jamais de sens: les outils (IDE, serveur) s'appuient
+    sur lui plutôt que sur le message, qui peut évoluer.
+    CS0xxx: général, CS1xxx: syntaxe, CS2xxx: génération de code.
+    """
+    GENERIC = "CS0001"
+    INTERNAL_ERROR = "CS0002"
+    UNEXPECTED_TOKEN = "CS1001"
+    MISSING_PAGE_NAME = "CS1002"
+    DUPLICATE_PAGE = "CS1003"
+    UNKNOWN_ELEMENT_TYPE = "CS1004"
+    MISSING_ELEMENT_TYPE = "CS1005"
+    MISSING_ELEMENT_NAME = "CS1006"
+    MISSING_PROPERTY_NAME = "CS1007"
+    INVALID_PROPERTY_VALUE = "CS1008"
+    MISSING_EVENT_TYPE = "CS1009"
+    UNKNOWN_EVENT_TYPE = "CS1010"
+    MISSING_END = "CS1011"
+    UNKNOWN_ACTION = "CS1012"
+    MISSING_ALERT_MESSAGE = "CS1013"
+    MISSING_VARIABLE_NAME = "CS1014"
+    MISSING_VALUE = "CS1015"
+    MISSING_GOTO_PAGE = "CS1016"
+    UNREACHABLE_PAGE = "CS2001"
+    UNREACHABLE_SCRIPT = "CS2002"
+    
+    @property
+    def rule_name(self) -> str:
+        """Nom de la règle (ex: UnexpectedToken)"""
+        return "".join(part.capitalize() for part in self.name.split("_"))
+
+
 @dataclass
 class CompileError:
     """Représente une erreur de compilation"""
@@ -23,6 +73,40 @@ class CompileError:
     column: int
     code_context: Optional[str] = None
     suggestion: Optional[str] = None
+    code: ErrorCode = ErrorCode.GENERIC
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Diagnostic structuré (JSON)"""
+        result = {
+            'code': self.code.value,
+            'level': self.level.value,
+            'message': self.message,
+            'line': self.line,
+            'column': self.column,
+        }
+        if self.suggestion:
+            result['suggestion'] = self.suggestion
+        return result
+    
+    def to_sarif(self, uri: str) -> Dict[str, Any]:
+        """Résultat SARIF 2.1.0"""
+        region = {'startLine': max(self.line, 1)}
+        if self.column > 0:
+            region['startColumn'] = self.column
+        result = {
+            'ruleId': self.code.value,
+            'level': SARIF_LEVELS[self.level],
+            'message': {'text': self.message},
+            'locations': [{
+                'physicalLocation': {
+                    'artifactLocation': {'uri': uri},
+                    'region': region,
+                }
+            }],
+        }
+        if self.suggestion:
+            result['fixes'] = [{'description': {'text': self.suggestion}}]
+        return result
     
     def __str__(self):
         """Format lisible"""
@@ -39,12 +123,53 @@ class CompileError:
 
 
 class CompileErrorManager:
-    """Gère les erreurs de compilation"""
+    """
+    Gère les erreurs de compilation
+    
+    Le découpage en lignes n'est fait qu'à la première erreur: un index des
+    débuts de ligne (array d'offsets) est construit, puis la ligne de contexte
+    est extraite par tranche de source_code. Une compilation sans erreur ne
+    découpe jamais la source.
     
-    def __init__(self, source_code: str):
+    Les diagnostics sont rangés par niveau avec un compteur par niveau. Au-delà
+    de max_diagnostics, ils ne sont plus conservés (ni mis en forme) mais
+    restent comptés: counts et report() donnent toujours le vrai total.
+    
+    Les diagnostics sont conservés sous forme structurée (code, niveau,
+    position); la ligne de contexte et le texte ne sont produits que par
+    report(). to_json() et to_sarif() exportent directement les champs.
+    """
+    
+    # Nombre maximal de diagnostics conservés par défaut (None: illimité)
+    DEFAULT_MAX_DIAGNOSTICS = 100
+    
+    def __init__(self, source_code: str, max_diagnostics: Optional[int] = DEFAULT_MAX_DIAGNOSTICS):
         self.source_code = source_code
-        self.lines = source_code.split('\n')
+        self.max_diagnostics = max_diagnostics
         self.errors: List[CompileError] = []
+        self._by_level: Dict[ErrorLevel, List[CompileError]] = {level: [] for level in ErrorLevel}
+        self.counts: Dict[ErrorLevel, int] = {level: 0 for level in ErrorLevel}
+        self._line_starts: Optional[array] = None
+        self._lines: Optional[List[str]] = None
+    
+    @property
+    def lines(self) -> List[str]:
+        """Lignes de la source (découpées au premier accès, puis conservées)"""
+        if self._lines is None:
+            self._lines = self.source_code.split('\n')
+        return self._lines
+    
+    def _get_line_starts(self) -> array:
+        """Offsets du début de chaque ligne (construits au premier appel)"""
+        if self._line_starts is None:
+            source = self.source_code
+            starts = array('q', [0])
+            index = source.find('\n')
+            while index != -1:
+                starts.append(index + 1)
+                index = source.find('\n', index + 1)
+            self._line_starts = starts
+        return self._line_starts
     
     def add_error(
         self,
@@ -52,21 +177,26 @@ class CompileErrorManager:
         line: int,
         column: int = 0,
         suggestion: Optional[str] = None,
-        level: ErrorLevel = ErrorLevel.ERROR
+        level: ErrorLevel = ErrorLevel.ERROR,
+        code: ErrorCode = ErrorCode.GENERIC
     ) -> CompileError:
         """Ajoute une erreur"""
-        code_context = self._get_line_context(line)
-        
         error = CompileError(
             level=level,
             message=message,
             line=line,
             column=column,
-            code_context=code_context,
-            suggestion=suggestion
+            suggestion=suggestion,
+            code=code
         )
         
+        self.counts[level] += 1
+        if self.max_diagnostics is not None and len(self.errors) >= self.max_diagnostics:
+            # Limite atteinte: compté mais pas conservé
+            return error
+        
         self.errors.append(error)
+        self._by_level[level].append(error)
         return error
     
     def add_warning(
@@ -74,28 +204,91 @@ class CompileErrorManager:
         message: str,
         line: int,
         column: int = 0,
-        suggestion: Optional[str] = None
+        suggestion: Optional[str] = None,
+        code: ErrorCode = ErrorCode.GENERIC
     ):
         """Ajoute un avertissement"""
-        self.add_error(message, line, column, suggestion, ErrorLevel.WARNING)
+        self.add_error(message, line, column, suggestion, ErrorLevel.WARNING, code)
     
     def _get_line_context(self, line: int) -> Optional[str]:
         """Obtient le contexte de la ligne"""
-        if 1 <= line <= len(self.lines):
-            return self.lines[line - 1]
-        return None
+        starts = self._get_line_starts()
+        if not 1 <= line <= len(starts):
+            return None
+        start = starts[line - 1]
+        end = starts[line] - 1 if line < len(starts) else len(self.source_code)
+        return self.source_code[start:end]
     
     def has_errors(self) -> bool:
         """Vérifie s'il y a des erreurs"""
-        return any(e.level == ErrorLevel.ERROR for e in self.errors)
+        return self.counts[ErrorLevel.ERROR] > 0
     
     def get_errors(self) -> List[CompileError]:
-        """Retourne les erreurs"""
-        return [e for e in self.errors if e.level == ErrorLevel.ERROR]
+        """Retourne les erreurs (conservées)"""
+        return list(self._by_level[ErrorLevel.ERROR])
     
     def get_warnings(self) -> List[CompileError]:
-        """Retourne les avertissements"""
-        return [e for e in self.errors if e.level == ErrorLevel.WARNING]
+        """Retourne les avertissements (conservés)"""
+        return list(self._by_level[ErrorLevel.WARNING])
+    
+    @property
+    def error_count(self) -> int:
+        """Nombre total d'erreurs, y compris au-delà de la limite"""
+        return self.counts[ErrorLevel.ERROR]
+    
+    @property
+    def warning_count(self) -> int:
+        """Nombre total d'avertissements, y compris au-delà de la limite"""
+        return self.counts[ErrorLevel.WARNING]
+    
+    @property
+    def total_count(self) -> int:
+        """Nombre total de diagnostics"""
+        return sum(self.counts.values())
+    
+    @property
+    def truncated(self) -> bool:
+        """Des diagnostics ont été ignorés (limite max_diagnostics)"""
+        return self.total_count > len(self.errors)
+    
+    def format(self, error: CompileError) -> str:
+        """Texte lisible d'un diagnostic, avec sa ligne de contexte"""
+        if error.code_context is None:
+            error.code_context = self._get_line_context(error.line)
+        return str(error)
+    
+    def to_json(self) -> List[Dict[str, Any]]:
+        """Diagnostics conservés, structurés (ordre d'apparition)"""
+        return [error.to_dict() for error in self.errors]
+    
+    def to_sarif(self, uri: str = "main.cs") -> Dict[str, Any]:
+        """Journal SARIF 2.1.0 des diagnostics"""
+        used_codes = sorted({error.code for error in self.errors}, key=lambda c: c.value)
+        run = {
+            'tool': {
+                'driver': {
+                    'name': TOOL_NAME,
+                    'version': TOOL_VERSION,
+                    'rules': [
+                        {'id': code.value, 'name': code.rule_name}
+                        for code in used_codes
+                    ],
+                }
+            },
+            'results': [error.to_sarif(uri) for error in self.errors],
+        }
+        if self.truncated:
+            # Vrais totaux quand max_diagnostics a été atteint
+            run['properties'] = {
+                'truncated': True,
+                'errorCount': self.error_count,
+                'warningCount': self.warning_count,
+            }
+        return {
+            '$schema': SARIF_SCHEMA,
+            'version': '2.1.0',
+            'runs': [run],
+        }
     
     def report(self) -> str:
         """Génère un rapport d'erreurs"""
@@ -103,16 +296,16 @@ class CompileErrorManager:
             return "✓ Aucune erreur"
         
         report = f"\n{'='*60}\n"
-        report += f"Rapport de Compilation ({len(self.errors)} problème(s))\n"
+        report += f"Rapport de Compilation ({self.total_count} problème(s))\n"
         report += f"{'='*60}\n\n"
         
         for error in sorted(self.errors, key=lambda e: e.line):
-            report += str(error) + "\n\n"
+            report += self.format(error) + "\n\n"
         
-        error_count = len(self.get_errors())
-        warning_count = len(self.get_warnings())
+        if self.truncated:
+            report += f"... {self.total_count - len(self.errors)} autre(s) problème(s) non affiché(s)\n\n"
         
-        report += f"Résumé: {error_count} erreur(s), {warning_count} avertissement(s)\n"
+        report += f"Résumé: {self.error_count} erreur(s), {self.warning_count} avertissement(s)\n"
         
         return report
 
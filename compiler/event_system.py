@@ -2,8 +2,11 @@
 ConnectScript Event System
 Système d'événements robuste et typé
 """
+import inspect
+import weakref
 from abc import ABC, abstractmethod
-from typing import Callable, Dict, List, Any
+from bisect import bisect_left, bisect_right
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
@@ -15,9 +18,18 @@ class EventType(Enum):
     LOAD = "load"
     TICK = "tick"
     ON_VARIABLE_CHANGE = "onVariableChange"
+    ON_VARIABLES_CHANGE = "onVariablesChange"  # lot de changements (EventContext.batch)
     ON_PAGE_CHANGE = "onPageChange"
 
 
+class HistoryMode(Enum):
+    """Politiques de conservation de l'historique"""
+    UNBOUNDED = "unbounded"  # tout est conservé (comportement historique)
+    DISABLED = "disabled"    # aucun historique
+    RING = "ring"            # les N derniers événements
+    WINDOW = "window"        # les événements des N dernières secondes (timestamp)
+
+
 @dataclass
 class Event:
     """Représente un événement"""
@@ -50,56 +62,525 @@ class EventHandler(EventListener):
             print(f"Error in event handler: {e}")
 
 
-class EventBus:
-    """Bus d'événements central"""
+class WeakEventHandler(EventListener):
+    """
+    Gestionnaire d'événement qui ne garde pas son callback en vie
+    
+    Les méthodes liées sont référencées par WeakMethod (l'objet peut être
+    collecté), les fonctions par weakref.ref. Une lambda ou une fonction
+    locale sans autre référence est donc collectée immédiatement.
+    on_collected est appelé quand le callback disparaît.
+    """
+    
+    def __init__(self, callback: Callable[[Event], None]):
+        if inspect.ismethod(callback):
+            self.ref = weakref.WeakMethod(callback, self._collected)
+        else:
+            self.ref = weakref.ref(callback, self._collected)
+        self.on_collected: Optional[Callable[[], None]] = None
+    
+    @property
+    def alive(self) -> bool:
+        """Le callback existe encore"""
+        return self.ref() is not None
+    
+    def _collected(self, ref) -> None:
+        if self.on_collected is not None:
+            self.on_collected()
+    
+    def handle(self, event: Event) -> None:
+        """Appelle le callback s'il existe encore"""
+        callback = self.ref()
+        if callback is not None:
+            callback(event)
+
+
+class _TimeIndex:
+    """
+    Suite d'événements dans l'ordre d'insertion, avec leurs timestamps.
+    
+    L'éviction se fait par la tête (décalage de 'start', compacté de temps
+    en temps). Tant que les timestamps sont croissants, une plage de temps
+    se trouve par recherche dichotomique.
+    """
+    
+    __slots__ = ("events", "times", "start", "monotonic", "last")
     
     def __init__(self):
-        self.listeners: Dict[EventType, List[EventListener]] = {}
-        self.history: List[Event] = []
+        self.events: List[Event] = []
+        self.times: List[float] = []
+        self.start = 0
+        self.monotonic = True
+        self.last = float("-inf")  # timestamp du dernier ajout
+    
+    def __len__(self) -> int:
+        return len(self.events) - self.start
+    
+    def append(self, event: Event) -> None:
+        timestamp = event.timestamp
+        if timestamp < self.last:
+            self.monotonic = False
+        self.last = timestamp
+        self.events.append(event)
+        self.times.append(timestamp)
+    
+    def evict_oldest(self) -> Event:
+        event = self.events[self.start]
+        self.start += 1
+        if self.start >= 1024 and self.start * 2 >= len(self.events):
+            del self.events[:self.start]
+            del self.times[:self.start]
+            self.start = 0
+        return event
+    
+    def range(self, since: Optional[float] = None, until: Optional[float] = None) -> List[Event]:
+        """Événements avec since <= timestamp <= until"""
+        events, start = self.events, self.start
+        if since is None and until is None:
+            return events[start:]
+        if not self.monotonic:
+            return [
+                e for e in events[start:]
+                if (since is None or e.timestamp >= since) and (until is None or e.timestamp <= until)
+            ]
+        lo = start if since is None else bisect_left(self.times, since, start)
+        hi = len(events) if until is None else bisect_right(self.times, until, lo)
+        return events[lo:hi]
+
+
+class EventHistory:
+    """
+    Historique des événements avec index secondaires par type et par source.
+    
+    Les index ne sont construits qu'à la première requête par type ou par
+    source: un historique qui n'est jamais interrogé ainsi ne coûte qu'un
+    ajout par événement. Ensuite ils sont mis à jour à chaque ajout et à
+    chaque éviction (RING, WINDOW): une requête ne parcourt que les
+    événements du type ou de la source demandés, et une plage de temps se
+    résout par dichotomie.
+    """
     
-    def subscribe(self, event_type: EventType, listener: EventListener) -> Callable:
-        """S'abonne à un type d'événement"""
-        if event_type not in self.listeners:
-            self.listeners[event_type] = []
+    def __init__(
+        self,
+        mode: HistoryMode = HistoryMode.UNBOUNDED,
+        size: int = 1000,
+        window: float = 60.0
+    ):
+        if mode == HistoryMode.RING and size <= 0:
+            raise ValueError("history_size doit être positif")
+        self.mode = mode
+        self.size = size
+        self.window = window
+        self._all = _TimeIndex()
+        self._indexed = False
+        self._by_type: Dict[EventType, _TimeIndex] = {}
+        self._by_source: Dict[str, _TimeIndex] = {}
+    
+    def __len__(self) -> int:
+        return len(self._all)
+    
+    def __iter__(self):
+        return iter(self._all.range())
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._all.range()[index]
+        length = len(self._all)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("history index out of range")
+        return self._all.events[self._all.start + index]
+    
+    def append(self, event: Event) -> None:
+        """Ajoute un événement (et applique la politique d'éviction)"""
+        self._all.append(event)
+        if self._indexed:
+            self._index(event)
+        
+        if self.mode == HistoryMode.RING:
+            if len(self._all) > self.size:
+                self._evict_oldest()
+        elif self.mode == HistoryMode.WINDOW:
+            horizon = event.timestamp - self.window
+            while self._all.times[self._all.start] < horizon:
+                self._evict_oldest()
+    
+    def _index(self, event: Event) -> None:
+        """Ajoute un événement aux index par type et par source"""
+        index = self._by_type.get(event.type)
+        if index is None:
+            index = self._by_type[event.type] = _TimeIndex()
+        index.append(event)
+        
+        index = self._by_source.get(event.source)
+        if index is None:
+            index = self._by_source[event.source] = _TimeIndex()
+        index.append(event)
+    
+    def _ensure_indexes(self) -> None:
+        """Construit les index par type et par source (première requête)"""
+        if not self._indexed:
+            for event in self._all.range():
+                self._index(event)
+            self._indexed = True
+    
+    def _evict_oldest(self) -> None:
+        """Évince l'événement le plus ancien de l'historique et des index"""
+        event = self._all.evict_oldest()
+        if not self._indexed:
+            return
+        # Le plus ancien de l'historique est aussi le plus ancien de ses index
+        for indexes, key in ((self._by_type, event.type), (self._by_source, event.source)):
+            index = indexes[key]
+            index.evict_oldest()
+            if not len(index):
+                del indexes[key]
+    
+    def clear(self) -> None:
+        """Vide l'historique et les index"""
+        self._all = _TimeIndex()
+        self._indexed = False
+        self._by_type.clear()
+        self._by_source.clear()
+    
+    def query(
+        self,
+        event_type: Optional[EventType] = None,
+        source: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None
+    ) -> List[Event]:
+        """Événements filtrés par type, source et plage de temps"""
+        if source is not None:
+            self._ensure_indexes()
+            index = self._by_source.get(source)
+            if index is None:
+                return []
+            events = index.range(since, until)
+            if event_type is not None:
+                events = [e for e in events if e.type == event_type]
+            return events
         
-        self.listeners[event_type].append(listener)
+        if event_type is not None:
+            self._ensure_indexes()
+            index = self._by_type.get(event_type)
+            return index.range(since, until) if index is not None else []
+        
+        return self._all.range(since, until)
+    
+    def count(self, event_type: Optional[EventType] = None, source: Optional[str] = None) -> int:
+        """Nombre d'événements d'un type ou d'une source (O(1) une fois indexé)"""
+        if source is not None:
+            if event_type is not None:
+                return len(self.query(event_type, source))
+            self._ensure_indexes()
+            index = self._by_source.get(source)
+        elif event_type is not None:
+            self._ensure_indexes()
+            index = self._by_type.get(event_type)
+        else:
+            index = self._all
+        return len(index) if index is not None else 0
+    
+    def sources(self) -> List[str]:
+        """Sources présentes dans l'historique"""
+        self._ensure_indexes()
+        return list(self._by_source)
+
+
+def _bind(listener: EventListener) -> Callable[[Event], None]:
+    """Callable appelé par emit() pour un écouteur"""
+    # EventHandler.handle ne fait qu'appeler le callback: on l'appelle directement
+    if type(listener).handle is EventHandler.handle:
+        return listener.callback
+    return listener.handle
+
+
+@dataclass
+class _Subscription:
+    """Abonnement enregistré sur un EventBus"""
+    token: int
+    event_type: Optional[EventType]  # None: tous les types
+    listener: EventListener
+    source: Optional[str] = None     # filtre sur Event.source (None: toutes)
+    prefix: bool = False             # source est un préfixe
+    priority: int = 0                # les priorités hautes sont appelées en premier
+    
+    @property
+    def key(self) -> Tuple[Optional[EventType], Optional[str], bool]:
+        """Clé de l'index des abonnements"""
+        return (self.event_type, self.source, self.prefix)
+
+
+class EventBus:
+    """
+    Bus d'événements central
+    
+    Un abonnement peut filtrer sur le type (None: tous les types) et sur la
+    source, exacte (source='variable:score') ou par préfixe
+    (source_prefix='variable:'). Les abonnements sont indexés par
+    (type, source, préfixe): la liste des callables d'un couple
+    (type, source) est résolue par quelques accès au dictionnaire puis mise
+    en cache, et emit() n'appelle que les écouteurs concernés, par priorité
+    décroissante puis par ordre d'abonnement.
+    """
+    
+    # Nombre maximal de couples (type, source) en cache
+    DISPATCH_CACHE_SIZE = 4096
+    
+    def __init__(
+        self,
+        history_mode: HistoryMode = HistoryMode.UNBOUNDED,
+        history_size: int = 1000,
+        history_window: float = 60.0
+    ):
+        """
+        Args:
+            history_mode: Politique de l'historique (voir HistoryMode)
+            history_size: Capacité du buffer circulaire (mode RING)
+            history_window: Durée conservée, en unités de Event.timestamp (mode WINDOW)
+        """
+        # Abonnements indexés par clé (type, source, préfixe), puis par jeton
+        self._index: Dict[Tuple[Optional[EventType], Optional[str], bool], Dict[int, _Subscription]] = {}
+        # Nombre d'abonnements par type (None: tous les types)
+        self._type_counts: Dict[Optional[EventType], int] = {}
+        # Nombre d'abonnements filtrés sur la source, par type
+        self._filtered_counts: Dict[Optional[EventType], int] = {}
+        # Longueurs des préfixes de source enregistrés (longueur -> nombre)
+        self._prefix_lengths: Dict[int, int] = {}
+        self._next_token = 0
+        self.history_mode = history_mode
+        self.history = EventHistory(history_mode, history_size, history_window)
+        self._record: Optional[Callable[[Event], None]] = None
+        if history_mode != HistoryMode.DISABLED:
+            self._record = self.history.append
+        # Tables de dispatch: tuple des callables à appeler, par type quand
+        # aucun abonnement de ce type ne filtre la source, sinon par
+        # (type, source). L'enregistrement dans l'historique en est le
+        # premier élément.
+        self._default: Tuple[Callable[[Event], None], ...] = (self._record,) if self._record else ()
+        self._dispatch: Dict[EventType, Tuple[Callable[[Event], None], ...]] = {}
+        self._dispatch_by_source: Dict[Tuple[EventType, str], Tuple[Callable[[Event], None], ...]] = {}
+        # Ni abonnement ni historique: emit() retourne immédiatement
+        self._silent = self._record is None
+    
+    @property
+    def listeners(self) -> Dict[Optional[EventType], List[EventListener]]:
+        """Écouteurs abonnés, par type (copie)"""
+        result: Dict[Optional[EventType], List[EventListener]] = {}
+        for subscription in sorted(self._subscriptions(), key=lambda s: s.token):
+            result.setdefault(subscription.event_type, []).append(subscription.listener)
+        return result
+    
+    def _subscriptions(self) -> List[_Subscription]:
+        return [s for subscriptions in self._index.values() for s in subscriptions.values()]
+    
+    def subscribe(
+        self,
+        event_type: Optional[EventType],
+        listener: EventListener,
+        source: Optional[str] = None,
+        source_prefix: Optional[str] = None,
+        priority: int = 0,
+        weak: bool = False
+    ) -> Callable:
+        """
+        S'abonne à un type d'événement
+        
+        Args:
+            event_type: Type écouté (None: tous les types)
+            listener: Écouteur
+            source: Ne reçoit que les événements de cette source
+            source_prefix: Ne reçoit que les sources commençant par ce préfixe
+            priority: Ordre d'appel (les plus hautes d'abord)
+            weak: Ne garde qu'une référence faible sur l'écouteur; l'abonnement
+                est retiré automatiquement quand il est collecté
+        """
+        if source is not None and source_prefix is not None:
+            raise ValueError("source et source_prefix sont exclusifs")
+        
+        if weak and not isinstance(listener, WeakEventHandler):
+            listener = WeakEventHandler(listener.handle)
+        
+        subscription = _Subscription(
+            token=self._next_token,
+            event_type=event_type,
+            listener=listener,
+            source=source if source_prefix is None else source_prefix,
+            prefix=source_prefix is not None,
+            priority=priority
+        )
+        self._next_token += 1
+        self._add(subscription)
+        
+        if isinstance(listener, WeakEventHandler):
+            listener.on_collected = lambda: self._remove(subscription)
+            if not listener.alive:
+                # Déjà collecté (ex: lambda sans autre référence)
+                self._remove(subscription)
         
         # Retourner une fonction pour se désabonner
         def unsubscribe():
-            if event_type in self.listeners:
-                self.listeners[event_type].remove(listener)
+            self._remove(subscription)
         
         return unsubscribe
     
+    def _add(self, subscription: _Subscription) -> None:
+        self._index.setdefault(subscription.key, {})[subscription.token] = subscription
+        event_type = subscription.event_type
+        self._type_counts[event_type] = self._type_counts.get(event_type, 0) + 1
+        if subscription.source is not None:
+            self._filtered_counts[event_type] = self._filtered_counts.get(event_type, 0) + 1
+        if subscription.prefix:
+            length = len(subscription.source)
+            self._prefix_lengths[length] = self._prefix_lengths.get(length, 0) + 1
+        self._invalidate()
+    
+    def _remove(self, subscription: _Subscription) -> None:
+        key = subscription.key
+        subscriptions = self._index.get(key)
+        if subscriptions is None or subscriptions.pop(subscription.token, None) is None:
+            return
+        if not subscriptions:
+            del self._index[key]
+        
+        event_type = subscription.event_type
+        self._type_counts[event_type] -= 1
+        if not self._type_counts[event_type]:
+            del self._type_counts[event_type]
+        if subscription.source is not None:
+            self._filtered_counts[event_type] -= 1
+            if not self._filtered_counts[event_type]:
+                del self._filtered_counts[event_type]
+        if subscription.prefix:
+            length = len(subscription.source)
+            self._prefix_lengths[length] -= 1
+            if not self._prefix_lengths[length]:
+                del self._prefix_lengths[length]
+        self._invalidate()
+    
+    def _invalidate(self) -> None:
+        self._dispatch.clear()
+        self._dispatch_by_source.clear()
+        self._silent = self._record is None and not self._index
+    
+    def _resolve(self, event_type: EventType, source: str) -> Tuple[Callable[[Event], None], ...]:
+        """Calcule (et met en cache) les callables d'un couple (type, source)"""
+        index = self._index
+        matched: List[_Subscription] = []
+        for key_type in (event_type, None):
+            for subscriptions in (index.get((key_type, None, False)), index.get((key_type, source, False))):
+                if subscriptions:
+                    matched.extend(subscriptions.values())
+            for length in self._prefix_lengths:
+                if length > len(source):
+                    # source[:length] serait un préfixe plus court déjà testé
+                    continue
+                subscriptions = index.get((key_type, source[:length], True))
+                if subscriptions:
+                    matched.extend(subscriptions.values())
+        
+        matched.sort(key=lambda s: (-s.priority, s.token))
+        callbacks = self._default + tuple(_bind(s.listener) for s in matched)
+        
+        if event_type not in self._filtered_counts and None not in self._filtered_counts:
+            # Aucun filtre de source: la table vaut pour toutes les sources
+            self._dispatch[event_type] = callbacks
+        else:
+            if len(self._dispatch_by_source) >= self.DISPATCH_CACHE_SIZE:
+                self._dispatch_by_source.clear()
+            self._dispatch_by_source[(event_type, source)] = callbacks
+        return callbacks
+    
     def emit(self, event: Event) -> None:
         """Émet un événement"""
-        self.history.append(event)
-        
-        if event.type in self.listeners:
-            for listener in self.listeners[event.type]:
-                listener.handle(event)
+        if self._silent:
+            return
+        callbacks = self._dispatch.get(event.type)
+        if callbacks is None:
+            callbacks = self._dispatch_by_source.get((event.type, event.source))
+            if callbacks is None:
+                callbacks = self._resolve(event.type, event.source)
+        for callback in callbacks:
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"Error in event handler: {e}")
+    
+    def has_listeners(self, event_type: EventType) -> bool:
+        """Vérifie si un écouteur peut recevoir ce type (quelle que soit la source)"""
+        return event_type in self._type_counts or None in self._type_counts
+    
+    def wants(self, event_type: EventType) -> bool:
+        """Vérifie si un événement de ce type serait observé (écouteur ou historique)"""
+        return self._record is not None or self.has_listeners(event_type)
     
-    def on(self, event_type: EventType, callback: Callable[[Event], None]) -> Callable:
-        """Syntaxe simplifiée pour s'abonner"""
-        handler = EventHandler(callback)
-        return self.subscribe(event_type, handler)
+    def listener_counts(self) -> Dict[str, int]:
+        """Nombre d'écouteurs par type d'événement ('*': tous les types)"""
+        return {
+            event_type.value if event_type is not None else "*": count
+            for event_type, count in self._type_counts.items()
+        }
+    
+    def on(
+        self,
+        event_type: Optional[EventType],
+        callback: Callable[[Event], None],
+        source: Optional[str] = None,
+        source_prefix: Optional[str] = None,
+        priority: int = 0,
+        weak: bool = False
+    ) -> Callable:
+        """Syntaxe simplifiée pour s'abonner (weak: référence faible sur le callback)"""
+        handler = WeakEventHandler(callback) if weak else EventHandler(callback)
+        return self.subscribe(event_type, handler, source, source_prefix, priority)
     
     def clear_history(self):
         """Efface l'historique"""
-        self.history = []
+        self.history.clear()
     
     def get_events_of_type(self, event_type: EventType) -> List[Event]:
         """Obtient les événements d'un type"""
-        return [e for e in self.history if e.type == event_type]
+        return self.history.query(event_type=event_type)
+    
+    def get_events_from_source(self, source: str) -> List[Event]:
+        """Obtient les événements d'une source (ex: 'variable:score')"""
+        return self.history.query(source=source)
+    
+    def query_history(
+        self,
+        event_type: Optional[EventType] = None,
+        source: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None
+    ) -> List[Event]:
+        """Interroge l'historique par type, source et plage de timestamps"""
+        return self.history.query(event_type, source, since, until)
 
 
 class EventContext:
-    """Contexte d'exécution pour les événements"""
+    """
+    Contexte d'exécution pour les événements
+    
+    Deux modes de livraison des changements de variables:
+    - ON_VARIABLE_CHANGE: un événement par écriture
+    - ON_VARIABLES_CHANGE: un lot {nom: {"old", "new"}} par batch() (première
+      ancienne valeur, valeur finale); hors batch, un lot par écriture.
+      Émis seulement s'il a des écouteurs (l'historique a déjà le détail).
+    
+    Dans un batch(), les événements par écriture ne sont créés que si quelqu'un
+    les observe (écouteur ou historique du bus).
+    """
     
-    def __init__(self, event_bus: EventBus):
+    def __init__(self, event_bus: EventBus, clock: Optional[Callable[[], float]] = None):
         self.event_bus = event_bus
         self.variables: Dict[str, Any] = {}
         self.current_page: str = None
+        # Horloge utilisée pour Event.timestamp (0 si aucune n'est fournie)
+        self.clock = clock
+        self._batch_depth = 0
+        self._pending: Dict[str, List[Any]] = {}
     
     def set_variable(self, name: str, value: Any) -> None:
         """Définit une variable"""
@@ -107,12 +588,75 @@ class EventContext:
         self.variables[name] = value
         
         # Émettre un événement si la valeur a changé
-        if old_value != value:
+        if old_value == value:
+            return
+        
+        bus = self.event_bus
+        if self._batch_depth:
+            # Le lot n'est construit que s'il sera livré
+            if bus.has_listeners(EventType.ON_VARIABLES_CHANGE):
+                pending = self._pending.get(name)
+                if pending is None:
+                    self._pending[name] = [old_value, value]
+                else:
+                    pending[1] = value
+            if not bus.wants(EventType.ON_VARIABLE_CHANGE):
+                return
+        
+        timestamp = self.clock() if self.clock else 0
+        bus.emit(Event(
+            type=EventType.ON_VARIABLE_CHANGE,
+            source=f"variable:{name}",
+            timestamp=timestamp,
+            data={"name": name, "old": old_value, "new": value}
+        ))
+        
+        if not self._batch_depth and bus.has_listeners(EventType.ON_VARIABLES_CHANGE):
+            bus.emit(Event(
+                type=EventType.ON_VARIABLES_CHANGE,
+                source="variables",
+                timestamp=timestamp,
+                data={"changes": {name: {"old": old_value, "new": value}}}
+            ))
+    
+    def batch(self) -> "EventContext":
+        """
+        Regroupe les changements de variables jusqu'à la fin du bloc:
+        
+            with context.batch():
+                ...
+        
+        Les batch imbriqués sont fusionnés dans le plus externe.
+        """
+        return self
+    
+    def __enter__(self) -> "EventContext":
+        self._batch_depth += 1
+        return self
+    
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self._batch_depth -= 1
+        if not self._batch_depth:
+            self.commit()
+    
+    def commit(self) -> None:
+        """Émet le lot de changements en attente (ON_VARIABLES_CHANGE)"""
+        pending = self._pending
+        if not pending:
+            return
+        changes = {
+            name: {"old": old, "new": new}
+            for name, (old, new) in pending.items()
+            if old != new
+        }
+        pending.clear()
+        
+        if changes and self.event_bus.has_listeners(EventType.ON_VARIABLES_CHANGE):
             self.event_bus.emit(Event(
-                type=EventType.ON_VARIABLE_CHANGE,
-                source=f"variable:{name}",
-                timestamp=0,
-                data={"name": name, "old": old_value, "new": value}
+                type=EventType.ON_VARIABLES_CHANGE,
+                source="variables",
+                timestamp=self.clock() if self.clock else 0,
+                data={"changes": changes}
             ))
     
     def get_variable(self, name: str, default=None) -> Any:
@@ -127,7 +671,7 @@ class EventContext:
         self.event_bus.emit(Event(
             type=EventType.ON_PAGE_CHANGE,
             source="app",
-            timestamp=0,
+            timestamp=self.clock() if self.clock else 0,
             data={"from": old_page, "to": page_name}
         ))
 
@@ -144,11 +688,15 @@ def create_event(event_type: EventType, source: str, data: Dict[str, Any] = None
     )
 
 
-def create_event_bus() -> EventBus:
+def create_event_bus(
+    history_mode: HistoryMode = HistoryMode.UNBOUNDED,
+    history_size: int = 1000,
+    history_window: float = 60.0
+) -> EventBus:
     """Crée un bus d'événements"""
-    return EventBus()
+    return EventBus(history_mode, history_size, history_window)
 
 
-def create_event_context(event_bus: EventBus) -> EventContext:
+def create_event_context(event_bus: EventBus, clock: Optional[Callable[[], float]] = None) -> EventContext:
     """Crée un contexte d'exécution"""
-    return EventContext(event_bus)
+    return EventContext(event_bus, clock)
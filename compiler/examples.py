@@ -100,7 +100,7 @@ end
     else:
         print("❌ Erreurs trouvées:")
         for error in result['errors']:
-            print(f"  - {error}")
+            print(f"  - [{error['code']}] Ligne {error['line']}: {error['message']}")
 
 
 def example_3_multiple_pages():
@@ -224,7 +224,7 @@ end
     else:
         print("❌ Erreurs:")
         for error in result['errors']:
-            print(f"  {error}")
+            print(f"  [{error['code']}] Ligne {error['line']}: {error['message']}")
     
     # Exemple avec erreur
     print("\n" + "-"*70)
@@ -243,7 +243,7 @@ page Home
     else:
         print("❌ Erreurs détectées:")
         for error in result['errors']:
-            print(f"  {error}")
+            print(f"  [{error['code']}] Ligne {error['line']}: {error['message']}")
 
 
 def example_5_full_game():
@@ -384,7 +384,7 @@ end
     else:
         print("❌ Erreurs:")
         for error in result['errors']:
-            print(f"  {error}")
+            print(f"  [{error['code']}] Ligne {error['line']}: {error['message']}")
 
 
 def main():
@@ -0,0 +1,249 @@
+"""
+ConnectScript Interpreter
+Exécute un Project directement en Python (sans navigateur)
+"""
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .ast_nodes import Project, Action, EventType
+from .event_system import EventBus, EventContext, Event, EventType as BusEventType
+from .scheduler import TickScheduler
+
+
+class Interpreter:
+    """
+    Runtime headless pour un Project compilé.
+
+    Les événements start/load/click/tick passent par l'EventBus; les actions
+    s'exécutent sur l'EventContext (qui émet ON_VARIABLE_CHANGE et
+    ON_PAGE_CHANGE). Chaque handler s'exécute dans un EventContext.batch():
+    ON_VARIABLES_CHANGE est émis une fois par handler. Le temps est une
+    horloge virtuelle avancée par tick().
+
+    Avec un TickScheduler, le temps est celui du scheduler (qui émet les
+    ticks sur le bus) et wait suspend le handler: la suite des actions est
+    programmée comme un timer, comme le 'await' du JavaScript généré.
+    Sans scheduler, wait avance simplement l'horloge.
+
+    La sémantique suit le JavaScript généré par CodeGenerator:
+    - add/subtract: (x || 0) + n et (x || 0) - n, NaN compris comme falsy;
+      add concatène si x est une chaîne
+    - goto vers une page inconnue: ignoré (console.error côté JS)
+    - click(element): exécute les handlers 'click' du script nommé par
+      la propriété --script de l'élément (comme executeAction)
+    """
+
+    def __init__(
+        self,
+        project: Project,
+        event_bus: Optional[EventBus] = None,
+        tick_interval: float = 1 / 60,
+        scheduler: Optional[TickScheduler] = None
+    ):
+        self.project = project
+        self.scheduler = scheduler
+        if scheduler is not None:
+            event_bus = event_bus or scheduler.event_bus
+            if event_bus is not scheduler.event_bus:
+                raise ValueError("Le scheduler doit émettre sur le bus de l'interpréteur")
+            tick_interval = scheduler.tick_interval
+        self.event_bus = event_bus or EventBus()
+        self.tick_interval = tick_interval
+        self._clock = 0.0
+        self.context = EventContext(self.event_bus, clock=lambda: self.clock)
+        self.alerts: List[str] = []
+        self.errors: List[str] = []
+
+        # Handlers groupés par type d'événement du bus, préparés une seule fois
+        self.handlers: Dict[BusEventType, List[Any]] = {
+            BusEventType(event_type.value): [] for event_type in EventType
+        }
+        self.click_handlers: Dict[str, List[Any]] = {}
+        for script in project.scripts.values():
+            for handler in script.event_handlers:
+                prepared = self.prepare(handler.actions)
+                self.handlers[BusEventType(handler.event_type.value)].append(prepared)
+                if handler.event_type == EventType.CLICK:
+                    self.click_handlers.setdefault(script.name, []).append(prepared)
+
+        self.event_bus.on(BusEventType.START, self._on_lifecycle)
+        self.event_bus.on(BusEventType.LOAD, self._on_lifecycle)
+        self.event_bus.on(BusEventType.TICK, self._on_lifecycle)
+        self.event_bus.on(BusEventType.CLICK, self._on_click)
+
+    # ------------------------------------------------------------------
+    # Entrées de la session
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Affiche la première page puis déclenche start et load"""
+        first_page = next(iter(self.project.pages), None)
+        if first_page is not None:
+            self.context.navigate_to_page(first_page)
+        self._emit(BusEventType.START, "app")
+        self._emit(BusEventType.LOAD, "app")
+
+    def click(self, element_name: str) -> bool:
+        """Clique sur un élément de la page courante"""
+        page = self.project.get_page(self.context.current_page)
+        if page is None:
+            return False
+        for element in page.elements:
+            if element.name == element_name:
+                self._emit(BusEventType.CLICK, element_name, {"script": element.get_property("script")})
+                return True
+        return False
+
+    def tick(self, count: int = 1) -> None:
+        """Avance l'horloge virtuelle de count ticks"""
+        if self.scheduler is not None:
+            for _ in range(count):
+                self.scheduler.step()
+            return
+        for _ in range(count):
+            self.clock += self.tick_interval
+            self._emit(BusEventType.TICK, "app")
+
+    @property
+    def clock(self) -> float:
+        """Temps simulé de la session"""
+        if self.scheduler is not None:
+            return self.scheduler.now
+        return self._clock
+
+    @clock.setter
+    def clock(self, value: float) -> None:
+        self._clock = value
+
+    @property
+    def state(self) -> Dict[str, Any]:
+        """Instantané de l'état de la session"""
+        return {
+            'variables': dict(self.context.variables),
+            'currentPage': self.context.current_page,
+            'alerts': list(self.alerts),
+            'clock': self.clock,
+        }
+
+    # ------------------------------------------------------------------
+    # Dispatch
+    # ------------------------------------------------------------------
+
+    def _emit(self, event_type: BusEventType, source: str, data: Optional[Dict[str, Any]] = None) -> None:
+        self.event_bus.emit(Event(type=event_type, source=source, timestamp=self.clock, data=data or {}))
+
+    def _on_lifecycle(self, event: Event) -> None:
+        for actions in self.handlers[event.type]:
+            with self.context.batch():
+                self.execute(actions)
+
+    def _on_click(self, event: Event) -> None:
+        script_name = event.data.get("script")
+        if not script_name:
+            return
+        for actions in self.click_handlers.get(str(script_name).split('.')[0], ()):
+            with self.context.batch():
+                self.execute(actions)
+
+    def _resume(self, actions: Any, start: int) -> None:
+        """Reprend un handler suspendu par wait (timer du scheduler)"""
+        with self.context.batch():
+            self.execute(actions, start)
+
+    # ------------------------------------------------------------------
+    # Exécution des actions
+    # ------------------------------------------------------------------
+
+    def prepare(self, actions: List[Action]) -> Any:
+        """Prépare un handler pour execute() (point d'extension des sous-classes)"""
+        return actions
+
+    def execute(self, actions: List[Action], start: int = 0) -> None:
+        """Exécute une séquence d'actions (à partir de l'index start)"""
+        context = self.context
+        for index in range(start, len(actions)):
+            action = actions[index]
+            action_type = action.action_type
+            params = action.params
+
+            if action_type == "set":
+                context.set_variable(params.get("variable", ""), params.get("value"))
+
+            elif action_type == "add":
+                name = params.get("variable", "")
+                context.set_variable(name, js_add(context.variables.get(name), params.get("value", 0)))
+
+            elif action_type == "subtract":
+                name = params.get("variable", "")
+                context.set_variable(name, js_subtract(context.variables.get(name), params.get("value", 0)))
+
+            elif action_type == "goto":
+                page = params.get("page", "")
+                if page in self.project.pages:
+                    context.navigate_to_page(page)
+                else:
+                    self.errors.append(f"Page not found: {page}")
+
+            elif action_type == "alert":
+                self.alerts.append(params.get("message", ""))
+
+            elif action_type == "wait":
+                seconds = params.get("seconds", 1)
+                if self.scheduler is None:
+                    self.clock += seconds
+                else:
+                    self.scheduler.call_later(seconds, self._resume, actions, index + 1)
+                    return
+
+            # play, if et actions inconnues: sans effet (voir CodeGenerator)
+
+
+def js_add(current: Any, value) -> Any:
+    """Équivalent Python de (current || 0) + value en JavaScript"""
+    if not current or current != current:  # NaN est falsy
+        return value
+    if isinstance(current, str):
+        return current + js_string(value)
+    return current + value
+
+
+def js_subtract(current: Any, value) -> Any:
+    """Équivalent Python de (current || 0) - value en JavaScript"""
+    if not current or current != current:
+        return -value
+    if isinstance(current, str):
+        # '5' - 1 -> 4, 'abc' - 1 -> NaN
+        try:
+            return float(current) - value
+        except ValueError:
+            return float('nan')
+    return current - value
+
+
+def js_string(value: Any) -> str:
+    """Équivalent Python de String(value) pour un nombre JavaScript"""
+    if isinstance(value, float):
+        if value != value:
+            return "NaN"
+        if value in (float('inf'), float('-inf')):
+            return "Infinity" if value > 0 else "-Infinity"
+        if value.is_integer():
+            return str(int(value))
+    return str(value)
+
+
+def replay(project: Project, inputs: Iterable[Tuple[str, Any]]) -> Dict[str, Any]:
+    """
+    Rejoue une session et retourne son état final
+
+    inputs: séquence de ('click', nom_element) ou ('tick', nombre)
+    """
+    interpreter = Interpreter(project)
+    interpreter.start()
+    for kind, arg in inputs:
+        if kind == "click":
+            interpreter.click(arg)
+        elif kind == "tick":
+            interpreter.tick(arg)
+        else:
+            raise ValueError(f"Entrée inconnue: {kind}")
+    return interpreter.state
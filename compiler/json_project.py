@@ -0,0 +1,211 @@
+"""
+ConnectScript JSON Project
+Conversion directe entre le format JSON (spec/project.schema.json) et l'AST
+"""
+import copy
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set
+
+from .ast_nodes import Project, Page, Script, UIElement, Action, EventHandler, EventType
+
+
+EVENT_TYPES = {event_type.value: event_type for event_type in EventType}
+
+# Champs d'une action dans spec/project.schema.json (en plus de 'type')
+ACTION_FIELDS = {"page", "message", "variable", "value", "sound", "seconds"}
+
+# Propriétés des éléments dans spec/project.schema.json: (requises, autorisées)
+ELEMENT_PROPERTIES = {
+    "button": ({"text", "position"}, {"text", "position", "size", "color", "fontsize", "corner", "script"}),
+    "text": ({"value", "position"}, {"value", "position", "fontsize", "color"}),
+    "image": ({"source", "position"}, {"source", "position", "size"}),
+}
+
+# Valeurs des propriétés requises absentes du source ConnectScript
+PROPERTY_DEFAULTS = {"text": "", "value": "", "source": "", "position": [0, 0]}
+
+
+def project_from_json(data: Dict[str, Any]) -> Project:
+    """
+    Construit un Project à partir d'un projet JSON (sans passer par le texte).
+
+    - chaque trigger d'un script donne un EventHandler avec les actions du
+      script; un script sans trigger est appelé par clic (--script)
+    - un trigger 'click' relie au script chaque élément de ce nom (sur
+      toutes les pages) qui n'a pas de propriété script (même routage que
+      executeAction)
+    - les champs d'une action (sauf 'type') deviennent ses params; un champ
+      hors du schéma lève ValueError
+
+    Le JSON doit avoir été validé (loader.py): les erreurs de structure
+    restantes lèvent ValueError.
+    """
+    project = Project()
+    elements: Dict[str, List[UIElement]] = {}
+
+    for page_data in data.get("pages", []):
+        background = page_data.get("background") or {}
+        page = Page(name=page_data["name"], background_color=background.get("color", "white"))
+        for element_data in page_data.get("elements", []):
+            element = UIElement(
+                element_type=element_data["type"],
+                name=element_data["name"],
+                properties=dict(element_data.get("properties") or {})
+            )
+            page.elements.append(element)
+            elements.setdefault(element.name, []).append(element)
+        project.add_page(page)
+
+    for name, script_data in (data.get("scripts") or {}).items():
+        actions = []
+        for action_data in script_data.get("actions", []):
+            params = {key: value for key, value in action_data.items() if key != "type"}
+            unknown = sorted(set(params) - ACTION_FIELDS)
+            if unknown:
+                # ex: 'condition', recopiée telle quelle dans le JavaScript par CodeGenerator
+                raise ValueError(f"Champ d'action inconnu dans le script '{name}': {unknown[0]}")
+            actions.append(Action(action_type=action_data["type"], params=params))
+        script = Script(name=name)
+        for trigger in script_data.get("triggers") or [{"type": "click"}]:
+            event_type = EVENT_TYPES.get(trigger.get("type"))
+            if event_type is None:
+                raise ValueError(f"Événement inconnu dans le script '{name}': {trigger.get('type')}")
+            # Les handlers d'un script partagent la liste d'actions (comme dans le JSON)
+            script.event_handlers.append(EventHandler(event_type=event_type, actions=actions))
+            targets = elements.get(trigger.get("target"), []) if event_type == EventType.CLICK else []
+            for target in targets:
+                if "script" not in target.properties:
+                    target.properties["script"] = name
+        project.add_script(script)
+
+    return project
+
+
+def project_to_json(
+    project: Project,
+    name: str = "ConnectScript",
+    version: str = "1.0.0",
+    created_at: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Convertit un Project en projet JSON (spec/project.schema.json).
+
+    Les handlers d'un script qui ont les mêmes actions forment un seul
+    script JSON (un trigger par handler); les autres groupes deviennent
+    des scripts '<nom>_<n>'. Le groupe qui contient 'click' garde le nom
+    du script, pour que la propriété --script des éléments reste valide.
+    Les triggers 'click' ciblent les éléments dont --script désigne le script.
+
+    Le résultat est conforme au schéma: un groupe sans action est omis, les
+    propriétés requises absentes prennent PROPERTY_DEFAULTS, chaque
+    --source d'image devient un asset de même id, et --script sur un texte
+    ou une image n'est porté que par le trigger 'click'. Ce que le schéma
+    ne peut pas représenter (projet sans page, type d'élément, propriété ou
+    champ d'action inconnu, éléments de même nom qui appellent des scripts
+    différents sans propriété script) lève ValueError.
+    """
+    if not project.pages:
+        raise ValueError("Un projet JSON doit contenir au moins une page")
+
+    # Éléments par script appelé (--script nom ou nom.action), en une passe
+    callers: Dict[str, List[str]] = {}
+    # Scripts appelés par les éléments sans propriété script dans le JSON
+    unbound: Dict[str, Set[Optional[str]]] = {}
+    # Sources des images, déclarées comme assets (le schéma y cherche --source)
+    assets: Dict[str, Dict[str, Any]] = {}
+    pages = []
+    for page in project.pages.values():
+        pages.append({
+            "name": page.name,
+            "background": {"color": page.background_color},
+            "elements": [_element_to_json(element) for element in page.elements]
+        })
+        for element in page.elements:
+            script_name = element.properties.get("script")
+            called = str(script_name).split(".")[0] if script_name else None
+            if called:
+                names = callers.setdefault(called, [])
+                if element.name not in names:  # même nom sur plusieurs pages: un seul trigger
+                    names.append(element.name)
+            if element.element_type != "button" or not called:
+                unbound.setdefault(element.name, set()).add(called)
+            source = element.properties.get("source")
+            if element.element_type == "image" and isinstance(source, str) and source:
+                assets.setdefault(source, {"id": source, "type": "image", "src": source})
+
+    # Un trigger 'click' relie tous les éléments de ce nom qui n'ont pas de
+    # propriété script: ils doivent appeler le seul script qui les cible
+    targeting: Dict[str, Set[str]] = {}
+    for called, names in callers.items():
+        for element_name in names:
+            targeting.setdefault(element_name, set()).add(called)
+    for element_name, called in unbound.items():
+        if element_name in targeting and called != targeting[element_name]:
+            raise ValueError(f"Trigger 'click' ambigu: les éléments '{element_name}' n'appellent pas tous le même script")
+
+    scripts = {}
+    for script in project.scripts.values():
+        groups: List[List[EventHandler]] = []
+        for handler in script.event_handlers:
+            for group in groups:
+                if group[0].actions == handler.actions:
+                    group.append(handler)
+                    break
+            else:
+                groups.append([handler])
+        groups.sort(key=lambda group: not any(h.event_type == EventType.CLICK for h in group))
+
+        for index, group in enumerate(groups):
+            if not group[0].actions:
+                continue  # le schéma exige au moins une action; le handler ne fait rien
+            script_name = script.name if index == 0 else f"{script.name}_{index}"
+            triggers = []
+            targeted = False
+            for handler in group:
+                if handler.event_type == EventType.CLICK and index == 0 and script.name in callers:
+                    # un handler par cible après project_from_json: les cibles une seule fois
+                    if not targeted:
+                        triggers += [{"type": "click", "target": target} for target in callers[script.name]]
+                    targeted = True
+                else:
+                    triggers.append({"type": handler.event_type.value})
+            scripts[script_name] = {
+                "name": script_name,
+                "triggers": triggers,
+                "actions": [_action_to_json(script.name, action) for action in group[0].actions]
+            }
+
+    return {
+        "metadata": {
+            "name": name,
+            "version": version,
+            "createdAt": created_at or datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        },
+        "pages": pages,
+        "scripts": scripts,
+        "assets": assets
+    }
+
+
+def _element_to_json(element: UIElement) -> Dict[str, Any]:
+    """Élément JSON conforme au schéma (voir project_to_json)"""
+    if element.element_type not in ELEMENT_PROPERTIES:
+        raise ValueError(f"Type d'élément inconnu du schéma: {element.element_type} ({element.name})")
+    required, allowed = ELEMENT_PROPERTIES[element.element_type]
+    properties = dict(element.properties)
+    if element.element_type != "button":
+        properties.pop("script", None)
+    unknown = sorted(set(properties) - allowed)
+    if unknown:
+        raise ValueError(f"Propriété inconnue du schéma pour l'élément '{element.name}': {unknown[0]}")
+    for key in sorted(required - set(properties)):
+        properties[key] = copy.deepcopy(PROPERTY_DEFAULTS[key])
+    return {"type": element.element_type, "name": element.name, "properties": properties}
+
+
+def _action_to_json(script_name: str, action: Action) -> Dict[str, Any]:
+    """Action JSON; un paramètre hors du schéma (ex: 'condition' d'un if) lève ValueError"""
+    unknown = sorted(set(action.params) - ACTION_FIELDS)
+    if unknown:
+        raise ValueError(f"Champ d'action inconnu du schéma dans le script '{script_name}': {unknown[0]}")
+    return {"type": action.action_type, **action.params}
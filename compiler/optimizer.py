@@ -0,0 +1,198 @@
+"""
+ConnectScript Optimizer
+Passe d'optimisation sur l'AST, entre Parser.parse et compile_project
+"""
+from .ast_nodes import Project, Action, EventType
+from typing import Dict, List, Optional, Set, Tuple
+
+
+# Événements déclenchés par le runtime lui-même (points d'entrée).
+# Un 'on click' de premier niveau est nommé script_click par le parser,
+# quel que soit le --script des éléments: il compte comme racine.
+ENTRY_EVENTS = {EventType.START, EventType.LOAD, EventType.TICK, EventType.CLICK}
+
+
+class ASTOptimizer:
+    """
+    Optimise les gestionnaires d'événements d'un projet.
+
+    - Fusionne les add/subtract consécutifs sur une même variable
+    - Replie un set numérique suivi d'add/subtract en un seul set
+    - Supprime les set écrasés avant toute lecture
+    - Fusionne les alert adjacents (optionnel: change le nombre de boîtes de dialogue)
+
+    goto, wait, if et les actions inconnues sont des barrières: aucune
+    optimisation ne les traverse.
+    """
+
+    def __init__(self, project: Project, merge_alerts: bool = False):
+        self.project = project
+        self.merge_alerts = merge_alerts
+        self.numeric_vars = self._find_numeric_variables()
+        self.stats = {
+            'folded_arithmetic': 0,
+            'dead_sets': 0,
+            'merged_alerts': 0,
+        }
+
+    def optimize(self) -> Project:
+        """Optimise le projet en place et le retourne"""
+        for script in self.project.scripts.values():
+            for handler in script.event_handlers:
+                handler.actions = self.optimize_actions(handler.actions)
+        return self.project
+
+    def optimize_actions(self, actions: List[Action]) -> List[Action]:
+        """Optimise une séquence d'actions"""
+        result: List[Optional[Action]] = []
+        # Index (dans result) des set pas encore lus, par variable
+        pending_sets: Dict[str, int] = {}
+
+        for action in actions:
+            action_type = action.action_type
+            prev = result[-1] if result else None
+
+            if action_type in ("add", "subtract"):
+                var = action.params.get("variable", "")
+                delta = self._signed_value(action)
+
+                if prev is not None and prev.params.get("variable") == var:
+                    # set x 0 / add x 5  ->  set x 5
+                    if prev.action_type == "set" and self._is_number(prev.params.get("value")):
+                        result[-1] = self._copy(prev, value=prev.params["value"] + delta)
+                        self.stats['folded_arithmetic'] += 1
+                        continue
+
+                    # add x 1 / add x 1 / subtract x 1  ->  add x 1
+                    # Sûr seulement si x n'est jamais une chaîne (sinon '+' concatène)
+                    if prev.action_type in ("add", "subtract") and var in self.numeric_vars:
+                        result[-1] = self._arithmetic(prev, self._signed_value(prev) + delta)
+                        self.stats['folded_arithmetic'] += 1
+                        continue
+
+                pending_sets.pop(var, None)
+                result.append(action)
+
+            elif action_type == "set":
+                var = action.params.get("variable", "")
+                dead_index = pending_sets.get(var)
+                if dead_index is not None:
+                    result[dead_index] = None
+                    self.stats['dead_sets'] += 1
+                pending_sets[var] = len(result)
+                result.append(action)
+
+            elif action_type == "alert":
+                if (self.merge_alerts and prev is not None
+                        and prev.action_type == "alert"):
+                    message = prev.params.get("message", "") + "\n" + action.params.get("message", "")
+                    result[-1] = Action(
+                        action_type="alert",
+                        params={"message": message},
+                        line=prev.line,
+                        column=prev.column
+                    )
+                    self.stats['merged_alerts'] += 1
+                    continue
+                result.append(action)
+
+            else:
+                # Barrière: lecture possible de n'importe quelle variable
+                pending_sets.clear()
+                result.append(action)
+
+        return [a for a in result if a is not None]
+
+    def _find_numeric_variables(self) -> Set[str]:
+        """Variables qui ne reçoivent jamais autre chose qu'un nombre"""
+        assigned: Set[str] = set()
+        non_numeric: Set[str] = set()
+
+        for script in self.project.scripts.values():
+            for handler in script.event_handlers:
+                for action in handler.actions:
+                    var = action.params.get("variable")
+                    if var is None:
+                        continue
+                    assigned.add(var)
+                    if action.action_type == "set" and not self._is_number(action.params.get("value")):
+                        non_numeric.add(var)
+
+        return assigned - non_numeric
+
+    @staticmethod
+    def _is_number(value) -> bool:
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+    @staticmethod
+    def _signed_value(action: Action):
+        value = action.params.get("value", 0)
+        return -value if action.action_type == "subtract" else value
+
+    @staticmethod
+    def _copy(action: Action, **params) -> Action:
+        return Action(
+            action_type=action.action_type,
+            params={**action.params, **params},
+            line=action.line,
+            column=action.column
+        )
+
+    @staticmethod
+    def _arithmetic(action: Action, delta) -> Action:
+        """add/subtract équivalent à un delta signé (add x 0 conserve la conversion en nombre)"""
+        return Action(
+            action_type="add" if delta >= 0 else "subtract",
+            params={"variable": action.params.get("variable", ""), "value": abs(delta)},
+            line=action.line,
+            column=action.column
+        )
+
+
+def optimize_project(project: Project, merge_alerts: bool = False) -> Project:
+    """Optimise le projet avant la génération de code"""
+    return ASTOptimizer(project, merge_alerts=merge_alerts).optimize()
+
+
+def find_reachable(project: Project) -> Tuple[Set[str], Set[str]]:
+    """
+    Analyse d'accessibilité des pages et des scripts.
+
+    Racines: la première page et les scripts ayant un handler start/load/tick/click.
+    Arcs: page -> scripts nommés par '--script' sur ses éléments,
+          script -> pages ciblées par connect.goto.
+
+    Returns:
+        (pages accessibles, scripts accessibles)
+    """
+    pages: Set[str] = set()
+    scripts: Set[str] = set()
+    page_stack: List[str] = list(project.pages)[:1]
+    script_stack: List[str] = [
+        name for name, script in project.scripts.items()
+        if any(h.event_type in ENTRY_EVENTS for h in script.event_handlers)
+    ]
+
+    while page_stack or script_stack:
+        while page_stack:
+            name = page_stack.pop()
+            if name in pages or name not in project.pages:
+                continue
+            pages.add(name)
+            for element in project.pages[name].elements:
+                target = element.properties.get("script")
+                if target:
+                    # executeAction() résout 'script.action' sur 'script'
+                    script_stack.append(str(target).split('.')[0])
+
+        while script_stack:
+            name = script_stack.pop()
+            if name in scripts or name not in project.scripts:
+                continue
+            scripts.add(name)
+            for handler in project.scripts[name].event_handlers:
+                for action in handler.actions:
+                    if action.action_type == "goto":
+                        page_stack.append(action.params.get("page", ""))
+
+    return pages, scripts
@@ -3,23 +3,44 @@ ConnectScript Parser
 Convertit tokens en AST
 """
 from typing import List, Optional, Dict, Any
-from tokenizer import Token, TokenType, Tokenizer
-from ast_nodes import (
+from .tokenizer import Token, TokenType, Tokenizer
+from .ast_nodes import (
     Project, Page, UIElement, Script, EventHandler, EventType,
     Action, Condition, IfStatement
 )
-from errors import ParseError, CompileErrorManager, ErrorLevel
+from .errors import ParseError, CompileErrorManager, ErrorLevel, ErrorCode
+
+
+# Points de synchronisation du mode panique
+SYNC_KEYWORDS = {TokenType.PAGE, TokenType.ON, TokenType.END}
+SYNC_LINE_START = {TokenType.MINUS, TokenType.DOUBLE_MINUS}
 
 
 class Parser:
-    """Parse les tokens pour créer l'AST"""
+    """
+    Parse les tokens pour créer l'AST
+    
+    Récupération d'erreurs (mode panique): après une erreur, les erreurs
+    suivantes sont ignorées et les tokens sautés jusqu'au prochain point de
+    synchronisation (page, on, end, ou -/-- en début de ligne). Le mode
+    panique se termine quand une construction valide recommence (page,
+    handler, élément, propriété ou end). Chaque token n'est sauté qu'une
+    fois: le temps de parsing reste linéaire même sur une source très
+    corrompue.
+    """
     
-    def __init__(self, tokens: List[Token], source_code: str):
+    def __init__(
+        self,
+        tokens: List[Token],
+        source_code: str,
+        max_diagnostics: Optional[int] = CompileErrorManager.DEFAULT_MAX_DIAGNOSTICS
+    ):
         self.tokens = tokens
         self.position = 0
         self.project = Project()
-        self.error_manager = CompileErrorManager(source_code)
+        self.error_manager = CompileErrorManager(source_code, max_diagnostics)
         self.current_script_name = None
+        self.panic = False
     
     def parse(self) -> Project:
         """Parse le code complet"""
@@ -30,18 +51,21 @@ class Parser:
                 break
             
             if self._check(TokenType.PAGE):
+                self.panic = False
                 self._parse_page()
             elif self._check(TokenType.ON):
+                self.panic = False
                 self._parse_event_handler()
             else:
                 token = self._current()
-                self.error_manager.add_error(
+                self._error(
+                    ErrorCode.UNEXPECTED_TOKEN,
                     f"Token inattendu: {token.type.name}",
                     token.line,
                     token.column,
                     suggestion="Esperait 'page' ou 'on'"
                 )
-                self._advance()
+                self._synchronize()
         
         return self.project
     
@@ -53,7 +77,8 @@ class Parser:
         
         name_token = self._consume(TokenType.IDENTIFIER)
         if not name_token:
-            self.error_manager.add_error(
+            self._error(
+                ErrorCode.MISSING_PAGE_NAME,
                 "Nom de page manquant",
                 self._current().line,
                 self._current().column,
@@ -62,19 +87,37 @@ class Parser:
             return
         
         page_name = name_token.value
-        page = Page(name=page_name, line=page_token.line)
+        page = Page(name=page_name, line=page_token.line, column=page_token.column)
         
         self._skip_newlines()
         
         # Parser les éléments de la page
         while not self._is_at_end() and not self._check(TokenType.PAGE) and not self._check(TokenType.ON):
             if self._check(TokenType.MINUS):
+                self.panic = False
                 self._parse_page_element(page)
-            else:
+            elif self._check(TokenType.NEWLINE):
                 self._skip_newlines()
-                if self._is_at_end() or self._check(TokenType.PAGE) or self._check(TokenType.ON):
-                    break
-        
+            else:
+                token = self._current()
+                self._error(
+                    ErrorCode.UNEXPECTED_TOKEN,
+                    f"Token inattendu dans la page: {token.type.name}",
+                    token.line,
+                    token.column,
+                    suggestion="Esperait un élément '-' ou une propriété '--'"
+                )
+                self._synchronize()
+        
+        if page_name in self.project.pages:
+            # Signalée après le corps de la page: ses éléments sont consommés normalement
+            self._error(
+                ErrorCode.DUPLICATE_PAGE,
+                f"Page '{page_name}' existe déjà",
+                name_token.line,
+                name_token.column
+            )
+            return
         self.project.add_page(page)
     
     def _parse_page_element(self, page: Page):
@@ -92,14 +135,16 @@ class Parser:
             elif element_type_token.value in ("button", "text", "image"):
                 self._parse_ui_element(page)
             else:
-                self.error_manager.add_error(
+                self._error(
+                    ErrorCode.UNKNOWN_ELEMENT_TYPE,
                     f"Type d'élément inconnu: {element_type_token.value}",
                     element_type_token.line,
                     element_type_token.column
                 )
                 self._advance()
         else:
-            self.error_manager.add_error(
+            self._error(
+                ErrorCode.MISSING_ELEMENT_TYPE,
                 "Type d'élément attendu",
                 element_type_token.line,
                 element_type_token.column
@@ -113,11 +158,19 @@ class Parser:
         self._skip_newlines()
         
         while not self._is_at_end() and self._check(TokenType.DOUBLE_MINUS):
-            self._advance()  # Consume --
+            self.panic = False
+            dash_token = self._advance()  # Consume --
             
             prop_token = self._consume(TokenType.IDENTIFIER)
             if not prop_token:
-                break
+                self._error(
+                    ErrorCode.MISSING_PROPERTY_NAME,
+                    "Nom de propriété attendu",
+                    dash_token.line,
+                    dash_token.column
+                )
+                self._synchronize()
+                continue
             
             prop_name = prop_token.value
             
@@ -125,6 +178,8 @@ class Parser:
                 color_token = self._consume(TokenType.COLOR)
                 if color_token:
                     page.background_color = color_token.value
+                else:
+                    self._skip_invalid_value(prop_name)
             
             self._skip_newlines()
     
@@ -138,7 +193,8 @@ class Parser:
         
         name_token = self._consume(TokenType.IDENTIFIER)
         if not name_token:
-            self.error_manager.add_error(
+            self._error(
+                ErrorCode.MISSING_ELEMENT_NAME,
                 f"Nom d'{element_type} manquant",
                 element_type_token.line,
                 element_type_token.column
@@ -148,18 +204,27 @@ class Parser:
         element = UIElement(
             element_type=element_type,
             name=name_token.value,
-            line=element_type_token.line
+            line=element_type_token.line,
+            column=element_type_token.column
         )
         
         self._skip_newlines()
         
         # Parser les propriétés
         while not self._is_at_end() and self._check(TokenType.DOUBLE_MINUS):
-            self._advance()  # Consume --
+            self.panic = False
+            dash_token = self._advance()  # Consume --
             
             prop_token = self._consume(TokenType.IDENTIFIER)
             if not prop_token:
-                break
+                self._error(
+                    ErrorCode.MISSING_PROPERTY_NAME,
+                    "Nom de propriété attendu",
+                    dash_token.line,
+                    dash_token.column
+                )
+                self._synchronize()
+                continue
             
             prop_name = prop_token.value
             value = None
@@ -197,6 +262,8 @@ class Parser:
             
             if value is not None:
                 element.properties[prop_name] = value
+            else:
+                self._skip_invalid_value(prop_name)
             
             self._skip_newlines()
         
@@ -210,7 +277,8 @@ class Parser:
         
         event_token = self._consume(TokenType.IDENTIFIER)
         if not event_token:
-            self.error_manager.add_error(
+            self._error(
+                ErrorCode.MISSING_EVENT_TYPE,
                 "Type d'événement manquant",
                 on_token.line,
                 on_token.column,
@@ -231,17 +299,28 @@ class Parser:
             self.error_manager.add_warning(
                 f"Type d'événement inconnu: {event_name}",
                 event_token.line,
-                event_token.column
+                event_token.column,
+                code=ErrorCode.UNKNOWN_EVENT_TYPE
             )
             event_type = EventType.CLICK  # Default
         
         self._skip_newlines()
         
-        handler = EventHandler(event_type=event_type, line=on_token.line)
+        handler = EventHandler(event_type=event_type, line=on_token.line, column=on_token.column)
         actions = []
         
         # Parser les actions
         while not self._is_at_end() and not self._check(TokenType.END):
+            if self._check(TokenType.PAGE):
+                self._error(
+                    ErrorCode.MISSING_END,
+                    "'end' manquant",
+                    on_token.line,
+                    on_token.column,
+                    suggestion=f"Terminez le handler 'on {event_name}' par 'end'"
+                )
+                break
+            
             if self._check(TokenType.ON):
                 # Nouvelle déclaration d'événement
                 handlers = self._extract_handlers_from_actions(actions)
@@ -253,12 +332,16 @@ class Parser:
                 return
             
             action = self._parse_action()
+            if self.panic:
+                self._synchronize()
+                continue
             if action:
                 actions.append(action)
             
             self._skip_newlines()
         
-        self._consume(TokenType.END)
+        if self._consume(TokenType.END):
+            self.panic = False
         handler.actions = actions
         
         # Créer un script pour cet handler
@@ -291,12 +374,12 @@ class Parser:
             self._advance()
             return None
         else:
-            self.error_manager.add_error(
+            self._error(
+                ErrorCode.UNKNOWN_ACTION,
                 f"Action inconnue: {token.type.name}",
                 token.line,
                 token.column
             )
-            self._advance()
             return None
     
     def _parse_alert(self) -> Optional[Action]:
@@ -306,7 +389,8 @@ class Parser:
         
         msg_token = self._consume(TokenType.STRING)
         if not msg_token:
-            self.error_manager.add_error(
+            self._error(
+                ErrorCode.MISSING_ALERT_MESSAGE,
                 "Message d'alerte manquant",
                 alert_token.line,
                 alert_token.column
@@ -318,7 +402,8 @@ class Parser:
         return Action(
             action_type="alert",
             params={"message": msg_token.value},
-            line=alert_token.line
+            line=alert_token.line,
+            column=alert_token.column
         )
     
     def _parse_set(self) -> Optional[Action]:
@@ -327,7 +412,8 @@ class Parser:
         
         var_token = self._consume(TokenType.IDENTIFIER)
         if not var_token:
-            self.error_manager.add_error(
+            self._error(
+                ErrorCode.MISSING_VARIABLE_NAME,
                 "Nom de variable manquant",
                 set_token.line,
                 set_token.column
@@ -345,7 +431,8 @@ class Parser:
         elif value_token.type == TokenType.IDENTIFIER:
             value = self._advance().value
         else:
-            self.error_manager.add_error(
+            self._error(
+                ErrorCode.MISSING_VALUE,
                 "Valeur manquante",
                 set_token.line,
                 set_token.column
@@ -354,7 +441,8 @@ class Parser:
         return Action(
             action_type="set",
             params={"variable": var_token.value, "value": value},
-            line=set_token.line
+            line=set_token.line,
+            column=set_token.column
         )
     
     def _parse_add(self) -> Optional[Action]:
@@ -363,11 +451,18 @@ class Parser:
         
         var_token = self._consume(TokenType.IDENTIFIER)
         if not var_token:
+            self._error(
+                ErrorCode.MISSING_VARIABLE_NAME,
+                "Nom de variable manquant",
+                add_token.line,
+                add_token.column
+            )
             return None
         
         value_token = self._consume(TokenType.NUMBER)
         if not value_token:
-            self.error_manager.add_error(
+            self._error(
+                ErrorCode.MISSING_VALUE,
                 "Valeur numérique manquante",
                 add_token.line,
                 add_token.column
@@ -377,7 +472,8 @@ class Parser:
         return Action(
             action_type="add",
             params={"variable": var_token.value, "value": value_token.value},
-            line=add_token.line
+            line=add_token.line,
+            column=add_token.column
         )
     
     def _parse_subtract(self) -> Optional[Action]:
@@ -386,11 +482,18 @@ class Parser:
         
         var_token = self._consume(TokenType.IDENTIFIER)
         if not var_token:
+            self._error(
+                ErrorCode.MISSING_VARIABLE_NAME,
+                "Nom de variable manquant",
+                sub_token.line,
+                sub_token.column
+            )
             return None
         
         value_token = self._consume(TokenType.NUMBER)
         if not value_token:
-            self.error_manager.add_error(
+            self._error(
+                ErrorCode.MISSING_VALUE,
                 "Valeur numérique manquante",
                 sub_token.line,
                 sub_token.column
@@ -400,7 +503,8 @@ class Parser:
         return Action(
             action_type="subtract",
             params={"variable": var_token.value, "value": value_token.value},
-            line=sub_token.line
+            line=sub_token.line,
+            column=sub_token.column
         )
     
     def _parse_goto(self) -> Optional[Action]:
@@ -414,7 +518,8 @@ class Parser:
         
         page_token = self._consume(TokenType.IDENTIFIER)
         if not page_token:
-            self.error_manager.add_error(
+            self._error(
+                ErrorCode.MISSING_GOTO_PAGE,
                 "Nom de page manquant",
                 goto_token.line,
                 goto_token.column
@@ -426,7 +531,8 @@ class Parser:
         return Action(
             action_type="goto",
             params={"page": page_token.value},
-            line=goto_token.line
+            line=goto_token.line,
+            column=goto_token.column
         )
     
     def _parse_if(self) -> Optional[Action]:
@@ -436,19 +542,47 @@ class Parser:
         # Pour simplifier, on va stocker la condition comme string
         condition_str = ""
         while not self._is_at_end() and not self._check(TokenType.NEWLINE):
-            condition_str += self._current().value or ""
+            value = self._current().value
+            condition_str += "" if value is None else str(value)
             self._advance()
         
         return Action(
             action_type="if",
             params={"condition": condition_str},
-            line=if_token.line
+            line=if_token.line,
+            column=if_token.column
         )
     
     def _extract_handlers_from_actions(self, actions: List[Action]) -> List[EventHandler]:
         """Extrait les handlers des actions"""
         return []
     
+    # Error recovery
+    def _error(
+        self,
+        code: ErrorCode,
+        message: str,
+        line: int,
+        column: int = 0,
+        suggestion: Optional[str] = None
+    ):
+        """Signale une erreur et passe en mode panique (erreurs en cascade ignorées)"""
+        if self.panic:
+            return
+        self.panic = True
+        self.error_manager.add_error(message, line, column, suggestion, code=code)
+    
+    def _synchronize(self):
+        """Saute au moins un token, puis jusqu'au prochain point de synchronisation"""
+        self._advance()
+        while not self._is_at_end():
+            token_type = self._current().type
+            if token_type in SYNC_KEYWORDS:
+                return
+            if token_type in SYNC_LINE_START and self.tokens[self.position - 1].type == TokenType.NEWLINE:
+                return
+            self._advance()
+    
     # Utility methods
     def _current(self) -> Token:
         """Token courant"""
@@ -478,6 +612,27 @@ class Parser:
         while self._check(TokenType.NEWLINE):
             self._advance()
     
+    def _skip_invalid_value(self, prop_name: str):
+        """
+        Propriété sans valeur valide: ignorée.
+        
+        Une ligne qui s'arrête après le nom (ex: --color #FF0000, le '#'
+        ouvrant un commentaire) n'est pas une erreur. Des tokens restants
+        (ex: --text Click) sont signalés puis sautés jusqu'à la fin de la
+        ligne, et les propriétés suivantes sont lues normalement.
+        """
+        if self._is_at_end() or self._check(TokenType.NEWLINE):
+            return
+        token = self._current()
+        self._error(
+            ErrorCode.INVALID_PROPERTY_VALUE,
+            f"Valeur invalide pour --{prop_name}",
+            token.line,
+            token.column
+        )
+        while not self._is_at_end() and not self._check(TokenType.NEWLINE):
+            self._advance()
+    
     def _is_at_end(self) -> bool:
         """Vérifie si on est à la fin"""
         return self._current().type == TokenType.EOF
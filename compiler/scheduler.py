@@ -0,0 +1,214 @@
+"""
+ConnectScript Scheduler
+Boucle de jeu à pas fixe et file de timers pour l'EventBus
+"""
+import heapq
+import itertools
+import time
+from enum import Enum
+from typing import Any, Callable, List, Optional
+
+from .event_system import EventBus, Event, EventType
+
+
+class ClockMode(Enum):
+    """Source du temps de la boucle"""
+    VIRTUAL = "virtual"  # les ticks s'enchaînent sans attendre (tests, simulation)
+    WALL = "wall"        # les ticks suivent l'horloge murale
+
+
+class Timer:
+    """Réveil programmé (annulable)"""
+    __slots__ = ("when", "seq", "callback", "args")
+
+    def __init__(self, when: float, seq: int, callback: Callable, args: tuple):
+        self.when = when
+        self.seq = seq
+        self.callback = callback
+        self.args = args
+
+    def __lt__(self, other: "Timer") -> bool:
+        return (self.when, self.seq) < (other.when, other.seq)
+
+    @property
+    def cancelled(self) -> bool:
+        return self.callback is None
+
+    def cancel(self) -> None:
+        """Annule le réveil (retiré paresseusement de la file)"""
+        self.callback = None
+        self.args = ()
+
+
+class TickScheduler:
+    """
+    Boucle à pas fixe qui émet EventType.TICK sur un EventBus.
+
+    Le temps simulé avance toujours de tick_interval par tick, quel que soit
+    le mode: deux exécutions avec les mêmes entrées donnent la même suite
+    d'événements. Le tick n a lieu à start_time + n * tick_interval (pas de
+    dérive due aux additions successives).
+
+    Avant chaque tick, les timers échus (call_at/call_later) sont exécutés
+    dans l'ordre (échéance, ordre de programmation), avec now égal à leur
+    échéance.
+
+    En mode WALL, run() accumule le temps écoulé et exécute au plus
+    max_catch_up ticks par itération: au-delà, le retard est abandonné
+    (compté dans dropped_ticks) plutôt que de rattraper sans fin.
+    """
+
+    def __init__(
+        self,
+        event_bus: Optional[EventBus] = None,
+        tick_interval: float = 1 / 60,
+        mode: ClockMode = ClockMode.VIRTUAL,
+        max_catch_up: int = 5,
+        start_time: float = 0.0,
+        source: str = "app",
+        time_source: Callable[[], float] = time.perf_counter,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Args:
+            event_bus: Bus sur lequel les ticks sont émis
+            tick_interval: Durée d'un tick, en secondes de temps simulé
+            mode: VIRTUAL ou WALL (voir ClockMode)
+            max_catch_up: Ticks maximum exécutés d'affilée pour rattraper un retard (WALL)
+            start_time: Temps simulé initial
+            source: Event.source des ticks
+            time_source: Horloge murale (mode WALL)
+            sleep: Fonction d'attente (mode WALL)
+        """
+        if tick_interval <= 0:
+            raise ValueError("tick_interval doit être positif")
+        if max_catch_up < 1:
+            raise ValueError("max_catch_up doit être au moins 1")
+        self.event_bus = event_bus or EventBus()
+        self.tick_interval = tick_interval
+        self.mode = mode
+        self.max_catch_up = max_catch_up
+        self.start_time = start_time
+        self.source = source
+        self.time_source = time_source
+        self.sleep = sleep
+        self.now = start_time
+        self.tick_count = 0
+        self.dropped_ticks = 0
+        self.running = False
+        self._timers: List[Timer] = []
+        self._seq = itertools.count()
+
+    # ------------------------------------------------------------------
+    # Timers
+    # ------------------------------------------------------------------
+
+    def call_at(self, when: float, callback: Callable, *args: Any) -> Timer:
+        """Programme callback(*args) au temps simulé when (au plus tôt: now)"""
+        timer = Timer(max(when, self.now), next(self._seq), callback, args)
+        heapq.heappush(self._timers, timer)
+        return timer
+
+    def call_later(self, delay: float, callback: Callable, *args: Any) -> Timer:
+        """Programme callback(*args) dans delay secondes de temps simulé"""
+        return self.call_at(self.now + delay, callback, *args)
+
+    @property
+    def pending_timers(self) -> int:
+        """Nombre de timers en attente (hors annulés)"""
+        return sum(1 for timer in self._timers if not timer.cancelled)
+
+    def _run_timers(self, until: float) -> None:
+        timers = self._timers
+        while timers and timers[0].when <= until:
+            timer = heapq.heappop(timers)
+            if timer.callback is None:
+                continue
+            self.now = timer.when
+            timer.callback(*timer.args)
+
+    # ------------------------------------------------------------------
+    # Boucle
+    # ------------------------------------------------------------------
+
+    def step(self) -> None:
+        """Exécute les timers échus puis émet un tick"""
+        target = self.start_time + (self.tick_count + 1) * self.tick_interval
+        self._run_timers(target)
+        self.now = target
+        self.tick_count += 1
+        self.event_bus.emit(Event(
+            type=EventType.TICK,
+            source=self.source,
+            timestamp=target,
+            data={"tick": self.tick_count}
+        ))
+
+    def run(self, ticks: Optional[int] = None, duration: Optional[float] = None) -> int:
+        """
+        Lance la boucle jusqu'à stop(), ou pendant ticks ticks / duration
+        secondes de temps simulé.
+
+        Returns:
+            Nombre de ticks exécutés
+        """
+        if ticks is None and duration is not None:
+            ticks = round(duration / self.tick_interval)
+
+        self.running = True
+        try:
+            if self.mode == ClockMode.VIRTUAL:
+                return self._run_virtual(ticks)
+            return self._run_wall(ticks)
+        finally:
+            self.running = False
+
+    def stop(self) -> None:
+        """Arrête run() après le tick en cours"""
+        self.running = False
+
+    def _run_virtual(self, ticks: Optional[int]) -> int:
+        executed = 0
+        while self.running and (ticks is None or executed < ticks):
+            self.step()
+            executed += 1
+        return executed
+
+    def _run_wall(self, ticks: Optional[int]) -> int:
+        interval = self.tick_interval
+        executed = 0
+        accumulator = 0.0
+        previous = self.time_source()
+
+        while self.running and (ticks is None or executed < ticks):
+            current = self.time_source()
+            accumulator += current - previous
+            previous = current
+
+            steps = 0
+            while (accumulator >= interval and steps < self.max_catch_up
+                   and self.running and (ticks is None or executed < ticks)):
+                self.step()
+                accumulator -= interval
+                steps += 1
+                executed += 1
+
+            if steps == self.max_catch_up and accumulator >= interval:
+                # Trop de retard: la simulation ralentit au lieu de spiraler
+                skipped = int(accumulator // interval)
+                self.dropped_ticks += skipped
+                accumulator -= skipped * interval
+
+            if self.running and (ticks is None or executed < ticks):
+                self.sleep(interval - accumulator)
+
+        return executed
+
+
+def create_scheduler(
+    event_bus: Optional[EventBus] = None,
+    tick_interval: float = 1 / 60,
+    mode: ClockMode = ClockMode.VIRTUAL
+) -> TickScheduler:
+    """Crée une boucle à pas fixe"""
+    return TickScheduler(event_bus, tick_interval, mode)
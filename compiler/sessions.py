@@ -0,0 +1,182 @@
+"""
+ConnectScript Sessions
+Exécution de nombreuses sessions indépendantes en parallèle (processus)
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from .ast_nodes import Project
+from .event_system import EventBus, HistoryMode
+from .interpreter import Interpreter
+from .bytecode import BytecodeInterpreter
+
+
+RUNTIMES = {
+    "interpreter": Interpreter,
+    "bytecode": BytecodeInterpreter,
+}
+
+# Entrées d'une session: séquence de ('click', nom_element) ou ('tick', nombre)
+SessionInputs = Sequence[Tuple[str, Any]]
+
+
+class SessionResult(NamedTuple):
+    """État final compact d'une session (tuple: peu coûteux à transmettre entre processus)"""
+    variables: Dict[str, Any]
+    current_page: Optional[str]
+    alerts: Tuple[str, ...]
+    clock: float
+    events: int
+
+
+@dataclass
+class HostReport:
+    """Résultats et débit d'une exécution de SessionHost"""
+    results: List[SessionResult] = field(default_factory=list)
+    elapsed: float = 0.0
+    workers: int = 1
+
+    @property
+    def sessions(self) -> int:
+        return len(self.results)
+
+    @property
+    def events(self) -> int:
+        return sum(result.events for result in self.results)
+
+    @property
+    def sessions_per_second(self) -> float:
+        return self.sessions / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def events_per_second(self) -> float:
+        return self.events / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> str:
+        """Résumé lisible du débit"""
+        return (
+            f"{self.sessions} sessions, {self.events} événements en {self.elapsed:.3f}s "
+            f"sur {self.workers} processus: {self.sessions_per_second:,.0f} sessions/s, "
+            f"{self.events_per_second:,.0f} événements/s"
+        )
+
+
+class _Counter:
+    """Écouteur joker qui compte les événements d'une session"""
+    __slots__ = ("count",)
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, event) -> None:
+        self.count += 1
+
+
+def run_session(project: Project, inputs: SessionInputs, runtime: str = "bytecode") -> SessionResult:
+    """Exécute une session (EventBus sans historique) et retourne son état final"""
+    bus = EventBus(history_mode=HistoryMode.DISABLED)
+    counter = _Counter()
+    bus.on(None, counter)
+
+    session = RUNTIMES[runtime](project, bus)
+    session.start()
+    for kind, arg in inputs:
+        if kind == "click":
+            session.click(arg)
+        elif kind == "tick":
+            session.tick(arg)
+        else:
+            raise ValueError(f"Entrée inconnue: {kind}")
+
+    context = session.context
+    return SessionResult(
+        context.variables,
+        context.current_page,
+        tuple(session.alerts),
+        session.clock,
+        counter.count
+    )
+
+
+# Projet partagé par les sessions d'un processus de travail (voir _init_worker)
+_worker_project: Optional[Project] = None
+_worker_runtime: str = "bytecode"
+
+
+def _init_worker(project: Project, runtime: str) -> None:
+    global _worker_project, _worker_runtime
+    _worker_project = project
+    _worker_runtime = runtime
+
+
+def _run_chunk(chunk: List[SessionInputs]) -> List[SessionResult]:
+    return [run_session(_worker_project, inputs, _worker_runtime) for inputs in chunk]
+
+
+class SessionHost:
+    """
+    Exécute de nombreuses sessions indépendantes d'un même Project.
+
+    Le Project n'est jamais modifié par les sessions: il est transmis une
+    seule fois à chaque processus (initializer du pool), puis les sessions
+    sont envoyées par paquets de chunk_size pour amortir les échanges entre
+    processus. Chaque session a son propre EventBus (sans historique) et
+    son EventContext; seul l'état final compact (SessionResult) revient au
+    processus principal.
+
+    Avec workers=1, les sessions s'exécutent dans le processus courant.
+    """
+
+    def __init__(
+        self,
+        project: Project,
+        workers: Optional[int] = None,
+        runtime: str = "bytecode",
+        chunk_size: int = 64
+    ):
+        if runtime not in RUNTIMES:
+            raise ValueError(f"Runtime inconnu: {runtime}")
+        if chunk_size < 1:
+            raise ValueError("chunk_size doit être au moins 1")
+        self.project = project
+        self.workers = workers or os.cpu_count() or 1
+        self.runtime = runtime
+        self.chunk_size = chunk_size
+
+    def run(self, sessions: Iterable[SessionInputs]) -> HostReport:
+        """Exécute les sessions et retourne leurs résultats (dans l'ordre) et le débit"""
+        sessions = list(sessions)
+        chunks = [
+            sessions[i:i + self.chunk_size]
+            for i in range(0, len(sessions), self.chunk_size)
+        ]
+
+        start = time.perf_counter()
+        results: List[SessionResult] = []
+        if self.workers == 1:
+            for chunk in chunks:
+                results.extend(run_session(self.project, inputs, self.runtime) for inputs in chunk)
+        else:
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.project, self.runtime)
+            ) as pool:
+                for chunk_results in pool.map(_run_chunk, chunks):
+                    results.extend(chunk_results)
+        elapsed = time.perf_counter() - start
+
+        return HostReport(results=results, elapsed=elapsed, workers=self.workers)
+
+
+def run_sessions(
+    project: Project,
+    sessions: Iterable[SessionInputs],
+    workers: Optional[int] = None,
+    runtime: str = "bytecode"
+) -> HostReport:
+    """Exécute des sessions en parallèle"""
+    return SessionHost(project, workers, runtime).run(sessions)
@@ -0,0 +1,106 @@
+"""
+ConnectScript Source Maps
+Construction incrémentale de source maps v3
+"""
+import base64
+import json
+from typing import Any, Dict, List, Optional
+
+
+BASE64_CHARS = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+
+
+def encode_vlq(value: int) -> str:
+    """Encode un entier en Base64 VLQ"""
+    vlq = (-value << 1) | 1 if value < 0 else value << 1
+    result = ""
+    while True:
+        digit = vlq & 0x1F
+        vlq >>= 5
+        if vlq:
+            digit |= 0x20
+        result += BASE64_CHARS[digit]
+        if not vlq:
+            return result
+
+
+class SourceMapBuilder:
+    """
+    Construit le champ 'mappings' au fil de la génération.
+
+    Les positions générées doivent être ajoutées dans l'ordre: chaque segment
+    est encodé immédiatement, sans seconde passe sur le code produit.
+    Les lignes et colonnes sont 0-based (format v3).
+    """
+
+    def __init__(self, file: str, source: str, source_content: Optional[str] = None):
+        self.file = file
+        self.source = source
+        self.source_content = source_content
+        self._parts: List[str] = []
+        self._gen_line = 0
+        self._gen_column = 0
+        self._src_line = 0
+        self._src_column = 0
+        self._line_has_segment = False
+
+    def add_mapping(self, gen_line: int, gen_column: int, src_line: int, src_column: int) -> None:
+        """Associe une position générée à une position source"""
+        if gen_line < self._gen_line:
+            raise ValueError("Les mappings doivent être ajoutés dans l'ordre du code généré")
+
+        if gen_line > self._gen_line:
+            self._parts.append(";" * (gen_line - self._gen_line))
+            self._gen_line = gen_line
+            self._gen_column = 0
+            self._line_has_segment = False
+
+        if self._line_has_segment:
+            self._parts.append(",")
+
+        self._parts.append(
+            encode_vlq(gen_column - self._gen_column)
+            + encode_vlq(0)  # une seule source
+            + encode_vlq(src_line - self._src_line)
+            + encode_vlq(src_column - self._src_column)
+        )
+
+        self._gen_column = gen_column
+        self._src_line = src_line
+        self._src_column = src_column
+        self._line_has_segment = True
+
+    @property
+    def mappings(self) -> str:
+        """Champ 'mappings' encodé"""
+        return "".join(self._parts)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Retourne la source map v3"""
+        source_map = {
+            'version': 3,
+            'file': self.file,
+            'sources': [self.source],
+            'names': [],
+            'mappings': self.mappings,
+        }
+        if self.source_content is not None:
+            source_map['sourcesContent'] = [self.source_content]
+        return source_map
+
+    def to_json(self) -> str:
+        """Sérialise la source map"""
+        return json.dumps(self.to_dict(), separators=(',', ':'), ensure_ascii=False)
+
+
+def source_map_comment(source_map: SourceMapBuilder, url: Optional[str] = None) -> str:
+    """
+    Commentaire sourceMappingURL à ajouter au code généré.
+
+    Sans url, la source map est incluse en ligne (data URL base64);
+    sinon le commentaire pointe vers l'URL voisine (ex: 'app.js.map').
+    """
+    if url is None:
+        payload = base64.b64encode(source_map.to_json().encode('utf-8')).decode('ascii')
+        url = f"data:application/json;charset=utf-8;base64,{payload}"
+    return f"//# sourceMappingURL={url}"
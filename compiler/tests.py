@@ -2,7 +2,50 @@
 ConnectScript Compiler - Tests
 Exemples et tests pour le compilateur
 """
-from compile import ConnectScriptCompiler
+import asyncio
+import gc
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import weakref
+
+# Add compiler directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from compiler.compile import ConnectScriptCompiler
+from compiler.parser import Parser, parse_connect_script
+from compiler.tokenizer import Tokenizer
+from compiler.codegen import compile_project, compile_project_with_source_map
+from compiler.optimizer import ASTOptimizer, find_reachable
+from compiler.interpreter import Interpreter, replay, js_add, js_subtract
+from compiler.bytecode import BytecodeInterpreter, compile_project_bytecode, OP_ADD, OP_SUB
+from compiler.event_system import EventBus, EventContext, Event, EventListener, EventType as EventEnum, HistoryMode
+from compiler.async_events import AsyncEventBus, OverflowPolicy
+from compiler.scheduler import TickScheduler, ClockMode
+from compiler.sessions import SessionHost
+from compiler.json_project import project_from_json, project_to_json
+from compiler.errors import CompileErrorManager, ErrorCode
+from compiler.ast_nodes import Project, Page, Script, UIElement, Action, EventType, EventHandler as AstEventHandler
+
+# Chargeur de projets JSON (parser/)
+PARSER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'parser')
+sys.path.append(PARSER_DIR)
+
+import importlib.util
+import loader
+import streaming
+from incremental import PatchError, ValidationSession
+
+
+def load_parser_module(name):
+    """Charge parser/<name>.py sous un autre nom (benchmarks.py existe des deux côtés)"""
+    spec = importlib.util.spec_from_file_location(f'loader_{name}', os.path.join(PARSER_DIR, f'{name}.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
 
 
 def test_simple_page():
@@ -335,6 +378,1490 @@ end
     print("✓ test_complex_game passed")
 
 
+def test_minified_output():
+    """Test: Profil de sortie minifié"""
+    code = """
+page Home
+-button btn
+--text "Go"
+--position 10 20
+
+on click
+ add score 10
+ connect.goto(Home)
+end
+"""
+    project, error_manager = parse_connect_script(code)
+    pretty = compile_project(project, error_manager)
+    compact = compile_project(project, error_manager, minify=True)
+    
+    assert '\n' not in compact
+    assert '// Generated' not in compact
+    assert "v['score']=(v['score']||0)+10;" in compact
+    assert "this.variables" not in compact
+    assert "await this.showPage('Home');" in compact
+    assert len(compact) < len(pretty)
+    print("✓ test_minified_output passed")
+
+
+def test_source_map():
+    """Test: Source map v3 générée avec le code"""
+    code = """page Home
+-button btn
+--text "Go"
+
+on click
+ add score 10
+ connect.goto(Home)
+end
+"""
+    project, error_manager = parse_connect_script(code)
+    js_code, source_map = compile_project_with_source_map(project, error_manager)
+    
+    assert source_map['version'] == 3
+    assert source_map['sources'] == ['main.cs']
+    assert source_map['sourcesContent'] == [code]
+    assert js_code.endswith("//# sourceMappingURL=app.js.map")
+    
+    # La première ligne mappée est "this.pages['Home']", ligne 1 colonne 1 du source
+    lines = source_map['mappings'].split(';')
+    first = next(i for i, segments in enumerate(lines) if segments)
+    assert "this.pages['Home']" in js_code.split('\n')[first]
+    assert lines[first] == 'EAAA'
+    
+    inline_js, _ = compile_project_with_source_map(project, error_manager, inline=True)
+    assert "sourceMappingURL=data:application/json" in inline_js
+    print("✓ test_source_map passed")
+
+
+def test_optimizer():
+    """Test: Repliement des constantes et fusion d'actions"""
+    code = """
+on start
+ set score 0
+ add score 5
+ set lives 1
+ alert("a")
+ set lives 3
+end
+
+on click
+ add score 1
+ add score 1
+ subtract score 1
+ set name "Bob"
+ add name 1
+ add name 1
+ alert("one")
+ alert("two")
+end
+"""
+    project, error_manager = parse_connect_script(code)
+    optimizer = ASTOptimizer(project, merge_alerts=True)
+    optimizer.optimize()
+    
+    start = project.scripts['script_start'].event_handlers[0].actions
+    assert [(a.action_type, a.params.get('variable'), a.params.get('value')) for a in start] == [
+        ('set', 'score', 5), ('alert', None, None), ('set', 'lives', 3)
+    ]
+    
+    click = project.scripts['script_click'].event_handlers[0].actions
+    assert click[0].action_type == 'add' and click[0].params['value'] == 1
+    # 'name' contient une chaîne: '+' concatène, donc pas de fusion
+    assert [a.action_type for a in click[1:4]] == ['set', 'add', 'add']
+    assert click[4].params['message'] == "one\ntwo"
+    assert optimizer.stats == {'folded_arithmetic': 3, 'dead_sets': 1, 'merged_alerts': 1}
+    
+    js_code = compile_project(project, error_manager)
+    assert "window.alert('one\\ntwo');" in js_code
+    print("✓ test_optimizer passed")
+
+
+def test_dead_code_elimination():
+    """Test: Suppression des pages et scripts inaccessibles"""
+    code = """
+page Home
+-button playBtn
+--text "Play"
+--script script_click
+
+page Game
+-text title
+--value "Game"
+
+page Unused
+-text orphan
+--value "Never shown"
+
+on click
+ connect.goto(Game)
+end
+
+on tick
+ add timer 1
+end
+"""
+    project, error_manager = parse_connect_script(code)
+    assert find_reachable(project) == ({'Home', 'Game'}, {'script_click', 'script_tick'})
+    
+    js_code = compile_project(project, error_manager, prune_unreachable=True)
+    assert "this.pages['Game']" in js_code
+    assert "Unused" not in js_code
+    
+    warnings = [str(w) for w in error_manager.get_warnings()]
+    assert len(warnings) == 1
+    assert "Page inaccessible supprimée: Unused" in warnings[0]
+    print("✓ test_dead_code_elimination passed")
+
+
+def test_prune_keeps_click_handlers():
+    """Test: Un 'on click' de premier niveau reste accessible quel que soit --script"""
+    code = """
+page Home
+-button startBtn
+--text "Start Game"
+--script startGameScript
+
+page GameView
+-text scoreText
+--value "Score: 0"
+
+page Unused
+-text orphan
+--value "Never shown"
+
+on click
+ set score 0
+ connect.goto(GameView)
+end
+"""
+    result = ConnectScriptCompiler(optimize=True).compile(code)
+    assert "Unused" in result['code'] and result['warnings'] == []
+    
+    result = ConnectScriptCompiler(prune=True).compile(code)
+    assert result['success']
+    assert "this.pages['GameView']" in result['code']
+    assert "this.events['script_click']" in result['code']
+    assert "Unused" not in result['code']
+    assert set(result['ast']['pages']) == {'Home', 'GameView'}
+    assert set(result['ast']['scripts']) == {'script_click'}
+    assert len(result['warnings']) == 1
+    print("✓ test_prune_keeps_click_handlers passed")
+
+
+def test_interpreter():
+    """Test: Exécution headless d'un projet"""
+    code = """
+page Home
+-button playBtn
+--text "Play"
+--script script_click
+
+page Game
+-text title
+--value "Game"
+
+on start
+ set score 0
+ set name "Bob"
+ alert("Welcome!")
+end
+
+on click
+ add score 10
+ add name 1
+ connect.goto(Game)
+end
+
+on tick
+ subtract timer 1
+end
+"""
+    project, _ = parse_connect_script(code)
+    interpreter = Interpreter(project)
+    interpreter.start()
+    assert interpreter.state['currentPage'] == 'Home'
+    
+    assert interpreter.click('playBtn')
+    assert not interpreter.click('playBtn')  # plus sur la page courante
+    interpreter.tick(3)
+    
+    state = interpreter.state
+    assert state['variables'] == {'score': 10, 'name': 'Bob1', 'timer': -3}
+    assert state['currentPage'] == 'Game'
+    assert state['alerts'] == ['Welcome!']
+    
+    changes = interpreter.event_bus.get_events_of_type(EventEnum.ON_VARIABLE_CHANGE)
+    assert len(changes) == 7
+    assert replay(project, [('click', 'playBtn'), ('tick', 3)]) == state
+    print("✓ test_interpreter passed")
+
+
+def test_js_arithmetic():
+    """Test: add/subtract suivent (x || 0) + n et (x || 0) - n du JavaScript"""
+    nan = float('nan')
+    assert js_add(None, 3) == 3
+    assert js_add(nan, 3) == 3
+    assert js_add('5', 1) == '51'
+    assert js_add('5', 1.0) == '51'
+    assert js_add('5', -0) == '50'
+    assert js_subtract('5', -0) == 5
+    assert js_subtract('5', 1) == 4
+    assert js_subtract(nan, 3) == -3
+    assert js_subtract('abc', 1) != js_subtract('abc', 1)  # NaN
+    
+    project = Project()
+    project.add_page(Page(name="Home"))
+    project.add_script(Script(name="main", event_handlers=[AstEventHandler(
+        event_type=EventType.START,
+        actions=[
+            Action(action_type="set", params={"variable": "label", "value": "5"}),
+            Action(action_type="subtract", params={"variable": "label", "value": 0}),
+            Action(action_type="set", params={"variable": "n", "value": nan}),
+            Action(action_type="add", params={"variable": "n", "value": 3}),
+        ]
+    )]))
+    for runtime in (Interpreter(project), BytecodeInterpreter(project)):
+        runtime.start()
+        assert runtime.state['variables'] == {'label': 5, 'n': 3}
+    print("✓ test_js_arithmetic passed")
+
+
+def test_bytecode_vm():
+    """Test: Bytecode et machine virtuelle équivalents à l'interpréteur"""
+    code = """
+page Home
+-button playBtn
+--text "Play"
+--script script_click
+
+page Game
+-text title
+--value "Game"
+
+on start
+ set score 0
+ set name "Bob"
+end
+
+on click
+ add score 10
+ subtract score 3
+ add name 1
+ connect.goto(Game)
+ alert("Go!")
+end
+
+on tick
+ subtract timer 1
+end
+"""
+    project, _ = parse_connect_script(code)
+    compiler, compiled = compile_project_bytecode(project)
+    click = compiled['script_click'][0]
+    assert compiler.names == ['score', 'name', 'timer']
+    assert click.code[:6] == (OP_ADD, 0, 0, OP_SUB, 0, 1)
+    assert click.constants[:2] == (10, 3)
+    assert "GOTO   'Game'" in click.disassemble(compiler.names)
+    
+    inputs = [('click', 'playBtn'), ('tick', 5)]
+    tree = Interpreter(project)
+    vm = BytecodeInterpreter(project)
+    for runtime in (tree, vm):
+        runtime.start()
+        runtime.click('playBtn')
+        runtime.tick(5)
+    assert vm.state == tree.state
+    assert vm.state['variables'] == {'score': 7, 'name': 'Bob1', 'timer': -5}
+    
+    # Mêmes changements, dans le même ordre, y compris après une écriture externe
+    def changes(runtime):
+        return [
+            (e.data['name'], e.data['old'], e.data['new'])
+            for e in runtime.event_bus.get_events_of_type(EventEnum.ON_VARIABLE_CHANGE)
+        ]
+    
+    tree = Interpreter(project)
+    vm = BytecodeInterpreter(project)
+    for runtime in (tree, vm):
+        runtime.start()
+        runtime.context.set_variable('score', 100)
+        runtime.context.set_variable('name', 5)
+        runtime.click('playBtn')
+        runtime.context.set_variable('timer', '3')
+        runtime.tick(2)
+    assert vm.state == tree.state
+    assert vm.state['variables'] == {'score': 107, 'name': 6, 'timer': 1}
+    assert changes(vm) == changes(tree)
+    assert ('score', 100, 110) in changes(vm) and ('score', 110, 107) in changes(vm)
+    print("✓ test_bytecode_vm passed")
+
+
+def test_event_history_policies():
+    """Test: Politiques d'historique de l'EventBus"""
+    ring = EventBus(history_mode=HistoryMode.RING, history_size=100)
+    for i in range(10000):
+        ring.emit(Event(type=EventEnum.TICK, source="app", timestamp=i))
+    assert len(ring.history) == 100
+    assert ring.history[0].timestamp == 9900
+    
+    window = EventBus(history_mode=HistoryMode.WINDOW, history_window=5)
+    for i in range(100):
+        window.emit(Event(type=EventEnum.TICK, source="app", timestamp=i))
+    assert [e.timestamp for e in window.history] == [94, 95, 96, 97, 98, 99]
+    
+    disabled = EventBus(history_mode=HistoryMode.DISABLED)
+    received = []
+    disabled.emit(Event(type=EventEnum.TICK, source="app", timestamp=0))
+    unsubscribe = disabled.on(EventEnum.TICK, received.append)
+    disabled.emit(Event(type=EventEnum.TICK, source="app", timestamp=0))
+    assert len(received) == 1 and len(disabled.history) == 0
+    unsubscribe()
+    disabled.emit(Event(type=EventEnum.TICK, source="app", timestamp=1))
+    assert len(received) == 1
+    
+    ring.clear_history()
+    assert len(ring.history) == 0
+    print("✓ test_event_history_policies passed")
+
+
+def test_event_history_queries():
+    """Test: Requêtes indexées sur l'historique"""
+    bus = EventBus(history_mode=HistoryMode.RING, history_size=50)
+    context = EventContext(bus)
+    for tick in range(100):
+        bus.emit(Event(type=EventEnum.TICK, source="app", timestamp=tick))
+        bus.emit(Event(
+            type=EventEnum.ON_VARIABLE_CHANGE,
+            source="variable:score" if tick % 2 else "variable:lives",
+            timestamp=tick,
+            data={}
+        ))
+    
+    # Index cohérents avec l'éviction du buffer circulaire
+    assert len(bus.history) == 50
+    assert len(bus.get_events_of_type(EventEnum.TICK)) == 25
+    assert bus.history.count(source="variable:score") + bus.history.count(source="variable:lives") == 25
+    
+    recent = bus.query_history(EventEnum.ON_VARIABLE_CHANGE, "variable:score", since=90)
+    assert [e.timestamp for e in recent] == [91, 93, 95, 97, 99]
+    assert bus.query_history(EventEnum.TICK, since=97, until=98)[-1].timestamp == 98
+    assert bus.get_events_from_source("variable:unknown") == []
+    
+    # Index construits à la première requête, puis tenus à jour
+    for tick in range(100, 110):
+        bus.emit(Event(type=EventEnum.TICK, source="app", timestamp=tick))
+    assert len(bus.get_events_of_type(EventEnum.TICK)) == 30
+    assert bus.history.count(source="variable:score") == 10
+    
+    context.set_variable("lives", 3)
+    assert bus.history[-1].source == "variable:lives"
+    bus.clear_history()
+    assert bus.query_history(source="variable:lives") == []
+    print("✓ test_event_history_queries passed")
+
+
+def test_async_event_bus():
+    """Test: Bus asyncio, files bornées et politiques de débordement"""
+    async def scenario():
+        bus = AsyncEventBus(queue_size=2)
+        fast, slow, latest = [], [], []
+        
+        async def slow_listener(event):
+            await asyncio.sleep(0.01)
+            slow.append(event.timestamp)
+        
+        bus.on(EventEnum.TICK, fast.append, queue_size=100)
+        bus.on(EventEnum.TICK, slow_listener, overflow=OverflowPolicy.DROP)
+        bus.on(EventEnum.ON_VARIABLE_CHANGE, latest.append, overflow=OverflowPolicy.COALESCE)
+        
+        for i in range(20):
+            await bus.emit(Event(type=EventEnum.TICK, source="app", timestamp=i))
+        for i in range(5):
+            await bus.emit(Event(type=EventEnum.ON_VARIABLE_CHANGE, source="variable:score", timestamp=i))
+        
+        await bus.join()
+        stats = bus.stats()
+        await bus.close()
+        return fast, slow, latest, stats
+    
+    fast, slow, latest, stats = asyncio.run(scenario())
+    assert [e.timestamp for e in fast] == list(range(20))
+    assert len(slow) < 20 and slow == sorted(slow)
+    assert stats['tick']['dropped'] == 20 - len(slow)
+    assert latest[-1].timestamp == 4
+    assert stats['onVariableChange']['coalesced'] > 0
+    print("✓ test_async_event_bus passed")
+
+
+def test_batched_variable_changes():
+    """Test: Changements de variables regroupés par batch"""
+    bus = EventBus(history_mode=HistoryMode.DISABLED)
+    context = EventContext(bus)
+    batches = []
+    bus.on(EventEnum.ON_VARIABLES_CHANGE, batches.append)
+    
+    context.set_variable("score", 0)
+    with context.batch():
+        for _ in range(50):
+            context.set_variable("score", context.get_variable("score") + 1)
+        context.set_variable("lives", 3)
+        context.set_variable("lives", None)  # revient à la valeur initiale
+    
+    assert len(batches) == 2
+    assert batches[0].data["changes"] == {"score": {"old": None, "new": 0}}
+    assert batches[1].data["changes"] == {"score": {"old": 0, "new": 50}}
+    
+    # Un écouteur par écriture reçoit toujours chaque changement
+    writes = []
+    bus.on(EventEnum.ON_VARIABLE_CHANGE, writes.append)
+    with context.batch():
+        with context.batch():
+            context.set_variable("score", 51)
+        context.set_variable("score", 52)
+    assert [e.data["new"] for e in writes] == [51, 52]
+    assert batches[-1].data["changes"] == {"score": {"old": 50, "new": 52}}
+    print("✓ test_batched_variable_changes passed")
+
+
+def test_event_dispatch_table():
+    """Test: Tables de dispatch de l'EventBus"""
+    bus = EventBus()
+    calls = []
+    
+    def failing(event):
+        raise RuntimeError("boom")
+    
+    off_a = bus.on(EventEnum.TICK, lambda e: calls.append("a"))
+    bus.on(EventEnum.TICK, failing)
+    off_c = bus.on(EventEnum.TICK, lambda e: calls.append("c"))
+    
+    event = Event(type=EventEnum.TICK, source="app", timestamp=0, data={})
+    bus.emit(event)
+    # Une exception n'interrompt pas la diffusion aux écouteurs suivants
+    assert calls == ["a", "c"]
+    assert len(bus.history) == 1
+    
+    off_a()
+    off_a()  # idempotent
+    bus.emit(event)
+    assert calls == ["a", "c", "c"]
+    assert len(bus.listeners[EventEnum.TICK]) == 2
+    
+    off_c()
+    assert bus.has_listeners(EventEnum.TICK)
+    bus.listeners[EventEnum.TICK].clear()  # copie: sans effet sur le bus
+    assert len(bus.listeners[EventEnum.TICK]) == 1
+    assert not bus.has_listeners(EventEnum.CLICK)
+    bus.emit(Event(type=EventEnum.CLICK, source="btn", timestamp=1, data={}))
+    assert len(bus.history) == 3
+    print("✓ test_event_dispatch_table passed")
+
+
+def test_filtered_subscriptions():
+    """Test: Abonnements filtrés par source, joker et priorités"""
+    bus = EventBus(history_mode=HistoryMode.DISABLED)
+    received = []
+    
+    bus.on(EventEnum.CLICK, lambda e: received.append(("btn", e.source)), source="btn")
+    bus.on(EventEnum.ON_VARIABLE_CHANGE, lambda e: received.append(("score", e.source)),
+           source="variable:score")
+    off_vars = bus.on(EventEnum.ON_VARIABLE_CHANGE, lambda e: received.append(("vars", e.source)),
+                      source_prefix="variable:")
+    bus.on(None, lambda e: received.append(("any", e.type.value)), priority=-1)
+    bus.on(EventEnum.CLICK, lambda e: received.append(("first", e.source)), priority=10)
+    
+    context = EventContext(bus)
+    context.set_variable("score", 1)
+    context.set_variable("lives", 3)
+    bus.emit(Event(type=EventEnum.CLICK, source="btn", timestamp=0, data={}))
+    bus.emit(Event(type=EventEnum.CLICK, source="other", timestamp=0, data={}))
+    
+    assert received == [
+        ("score", "variable:score"), ("vars", "variable:score"), ("any", "onVariableChange"),
+        ("any", "onVariablesChange"),  # le joker reçoit aussi les lots
+        ("vars", "variable:lives"), ("any", "onVariableChange"), ("any", "onVariablesChange"),
+        ("first", "btn"), ("btn", "btn"), ("any", "click"),
+        ("first", "other"), ("any", "click"),
+    ]
+    
+    # Le cache de dispatch est invalidé au désabonnement
+    received.clear()
+    off_vars()
+    context.set_variable("lives", 2)
+    assert received == [("any", "onVariableChange"), ("any", "onVariablesChange")]
+    assert bus.has_listeners(EventEnum.TICK)  # via l'abonnement joker
+    
+    # Un préfixe plus long que la source ne la fait pas matcher une seconde fois
+    received.clear()
+    bus.on(EventEnum.CLICK, lambda e: received.append(("ab", e.source)), source_prefix="ab")
+    bus.on(EventEnum.CLICK, lambda e: received.append(("xyz", e.source)), source_prefix="xyz")
+    bus.emit(Event(type=EventEnum.CLICK, source="ab", timestamp=0, data={}))
+    assert received == [("first", "ab"), ("ab", "ab"), ("any", "click")]
+    
+    try:
+        bus.on(EventEnum.CLICK, print, source="a", source_prefix="b")
+        assert False, "source et source_prefix devraient être exclusifs"
+    except ValueError:
+        pass
+    print("✓ test_filtered_subscriptions passed")
+
+
+def test_weak_listeners():
+    """Test: Écouteurs en référence faible"""
+    class Widget:
+        def __init__(self):
+            self.clicks = 0
+        
+        def on_click(self, event):
+            self.clicks += 1
+    
+    class Logger(EventListener):
+        def __init__(self):
+            self.events = []
+        
+        def handle(self, event):
+            self.events.append(event)
+    
+    bus = EventBus(history_mode=HistoryMode.DISABLED)
+    widget = Widget()
+    logger = Logger()
+    bus.on(EventEnum.CLICK, widget.on_click, weak=True)
+    bus.subscribe(EventEnum.CLICK, logger, weak=True)
+    bus.on(EventEnum.TICK, lambda e: None)
+    assert bus.listener_counts() == {"click": 2, "tick": 1}
+    
+    click = Event(type=EventEnum.CLICK, source="btn", timestamp=0, data={})
+    bus.emit(click)
+    assert widget.clicks == 1 and len(logger.events) == 1
+    
+    # Le bus ne garde pas les écouteurs en vie
+    widget_ref = weakref.ref(widget)
+    del widget, logger
+    gc.collect()
+    assert widget_ref() is None
+    assert bus.listener_counts() == {"tick": 1}
+    assert not bus.has_listeners(EventEnum.CLICK)
+    bus.emit(click)
+    
+    # Une lambda sans autre référence est collectée tout de suite
+    bus.on(EventEnum.CLICK, lambda e: None, weak=True)
+    assert bus.listener_counts() == {"tick": 1}
+    print("✓ test_weak_listeners passed")
+
+
+def test_tick_scheduler():
+    """Test: Boucle à pas fixe, timers et wait"""
+    # Timers: ordre (échéance, programmation), exécutés avant le tick
+    scheduler = TickScheduler(tick_interval=0.1, mode=ClockMode.VIRTUAL)
+    fired = []
+    scheduler.event_bus.on(EventEnum.TICK, lambda e: fired.append(("tick", round(e.timestamp, 6))))
+    scheduler.call_at(0.15, lambda: fired.append(("b", scheduler.now)))
+    scheduler.call_at(0.05, lambda: fired.append(("a", scheduler.now)))
+    scheduler.call_later(0.15, lambda: fired.append(("c", scheduler.now)))
+    scheduler.call_later(0.1, fired.append, "cancelled").cancel()
+    assert scheduler.run(duration=0.2) == 2
+    assert fired == [("a", 0.05), ("tick", 0.1), ("b", 0.15), ("c", 0.15), ("tick", 0.2)]
+    assert scheduler.pending_timers == 0
+    
+    # Pas de dérive: le tick n est à n * tick_interval
+    scheduler.run(ticks=998)
+    assert scheduler.now == 1000 * 0.1
+    
+    # wait suspend le handler jusqu'au timer (interpréteur et bytecode)
+    project = Project()
+    project.pages["Home"] = Page(name="Home")
+    project.scripts["script_start"] = Script(
+        name="script_start",
+        event_handlers=[AstEventHandler(event_type=EventType.START, actions=[
+            Action("set", {"variable": "step", "value": 1}),
+            Action("wait", {"seconds": 0.5}),
+            Action("set", {"variable": "step", "value": 2}),
+            Action("wait", {"seconds": 1}),
+            Action("alert", {"message": "done"}),
+        ])]
+    )
+    for runtime_class in (Interpreter, BytecodeInterpreter):
+        runtime = runtime_class(project, scheduler=TickScheduler(tick_interval=0.1))
+        runtime.start()
+        assert runtime.state['variables'] == {'step': 1}
+        runtime.tick(5)
+        assert runtime.state['variables'] == {'step': 2}
+        assert runtime.state['alerts'] == []
+        runtime.tick(10)
+        assert runtime.state['alerts'] == ['done']
+        assert runtime.state['clock'] == 1.5
+    
+    # Mode WALL: rattrapage limité avec une horloge simulée
+    now = [0.0]
+    wall = TickScheduler(
+        tick_interval=0.1,
+        mode=ClockMode.WALL,
+        max_catch_up=3,
+        time_source=lambda: now[0],
+        # un tick par attente, puis une pause d'une seconde après le 2e tick
+        sleep=lambda seconds: now.__setitem__(0, now[0] + (1.0 if wall.tick_count == 2 else 0.1))
+    )
+    assert wall.run(ticks=10) == 10
+    assert wall.dropped_ticks == 7  # 10 ticks de retard, 3 rattrapés
+    assert wall.now == 10 * 0.1
+    print("✓ test_tick_scheduler passed")
+
+
+def test_session_host():
+    """Test: Sessions indépendantes en parallèle"""
+    code = """
+page Home
+-button playBtn
+--text "Play"
+--script script_click
+
+page Game
+-text title
+--value "Game"
+
+on start
+ set score 0
+end
+
+on click
+ add score 10
+ connect.goto(Game)
+end
+
+on tick
+ add frames 1
+end
+"""
+    project, _ = parse_connect_script(code)
+    sessions = [[('tick', n)] for n in range(1, 6)] + [[('click', 'playBtn'), ('tick', 2)]]
+    
+    for workers in (1, 2):
+        report = SessionHost(project, workers=workers, chunk_size=2).run(sessions)
+        assert report.sessions == len(sessions)
+        assert [r.variables['frames'] for r in report.results[:5]] == [1, 2, 3, 4, 5]
+        last = report.results[-1]
+        assert last.variables == {'score': 10, 'frames': 2}
+        assert last.current_page == 'Game'
+        # Le résultat correspond à une exécution isolée
+        assert last.variables == replay(project, sessions[-1])['variables']
+        assert report.events == sum(r.events for r in report.results) > 0
+        assert report.sessions_per_second > 0
+    
+    assert project.scripts['script_tick'].event_handlers[0].actions[0].params == {'variable': 'frames', 'value': 1}
+    print("✓ test_session_host passed")
+
+
+def test_lazy_line_index():
+    """Test: Index des lignes construit seulement en cas d'erreur"""
+    code = """
+page Home
+-button playBtn
+--text "Play"
+"""
+    project, error_manager = parse_connect_script(code)
+    assert not error_manager.has_errors()
+    assert error_manager._line_starts is None
+    
+    source = "page A\r\n-text t\n\n--value \"x\"\nlast"
+    manager = CompileErrorManager(source)
+    expected = source.split('\n')
+    for line in range(1, len(expected) + 1):
+        error = manager.add_error("e", line)
+        manager.format(error)
+        assert error.code_context == expected[line - 1]
+    for line in (0, len(expected) + 1):
+        error = manager.add_error("e", line)
+        manager.format(error)
+        assert error.code_context is None
+    assert manager.lines == expected
+    assert manager.lines is manager.lines  # découpé une seule fois
+    print("✓ test_lazy_line_index passed")
+
+
+def test_diagnostic_cap():
+    """Test: Diagnostics rangés par niveau et limités"""
+    manager = CompileErrorManager("x\n" * 10, max_diagnostics=5)
+    for line in range(1, 9):
+        manager.add_error(f"erreur {line}", line)
+    manager.add_warning("avertissement", 9)
+    
+    assert manager.has_errors()
+    assert len(manager.get_errors()) == 5
+    assert manager.get_warnings() == []
+    assert manager.error_count == 8
+    assert manager.warning_count == 1
+    assert manager.truncated
+    report = manager.report()
+    assert "Rapport de Compilation (9 problème(s))" in report
+    assert "4 autre(s) problème(s) non affiché(s)" in report
+    assert "Résumé: 8 erreur(s), 1 avertissement(s)" in report
+    assert "erreur 6" not in report
+    
+    unlimited = CompileErrorManager("x", max_diagnostics=None)
+    for _ in range(200):
+        unlimited.add_warning("w", 1)
+    assert len(unlimited.get_warnings()) == 200
+    assert not unlimited.has_errors() and not unlimited.truncated
+    print("✓ test_diagnostic_cap passed")
+
+
+RECOVERY_SOURCE = """
+page Home
+-button playBtn
+--text Play
+--position 10 20
+--script script_click
+-text title
+--value "Hi"
+
+page Game
+-text msg
+--value "Game"
+
+on start
+ set score 0
+ alert(42)
+ add score 5
+end
+
+on click
+ add score 10
+ connect.goto(Game)
+end
+"""
+
+
+def test_parser_recovery():
+    """Test: Récupération d'erreurs du parser (mode panique)"""
+    project, error_manager = parse_connect_script(RECOVERY_SOURCE)
+    
+    # Une erreur par construction cassée, pas d'erreurs en cascade
+    errors = error_manager.get_errors()
+    assert [e.line for e in errors] == [4, 16]
+    assert "--text" in errors[0].message
+    
+    # Le parsing reprend au point de synchronisation suivant
+    assert set(project.pages) == {'Home', 'Game'}
+    button, title = project.pages['Home'].elements
+    assert button.properties == {'position': [10, 20], 'script': 'script_click'}
+    assert title.properties == {'value': 'Hi'}
+    assert [a.action_type for a in project.scripts['script_click'].event_handlers[0].actions] == ['add', 'goto']
+    print("✓ test_parser_recovery passed")
+
+
+def test_parser_recovery_fuzz():
+    """Test: Sources corrompues aléatoirement (terminaison, pas de cascade)"""
+    rng = random.Random(1234)
+    fragments = ['page', 'on', 'end', '-', '--', '(', ')', '"x"', 'set', 'add', 'alert',
+                 'connect.goto', 'if', '==', '12', 'x', '\n', ' ']
+    
+    for _ in range(300):
+        chars = list(RECOVERY_SOURCE)
+        for _ in range(rng.randint(1, 20)):
+            position = rng.randrange(len(chars) + 1)
+            if rng.random() < 0.4 and chars:
+                del chars[min(position, len(chars) - 1)]
+            else:
+                chars[position:position] = rng.choice(fragments)
+        source = ''.join(chars)
+        
+        try:
+            tokens = Tokenizer(source).tokenize()
+        except SyntaxError:
+            continue  # erreur du tokenizer (chaîne non fermée...)
+        parser = Parser(tokens, source, max_diagnostics=None)
+        parser.parse()
+        assert parser._is_at_end()
+        assert len(parser.error_manager.errors) <= source.count('\n') + 1
+    
+    # Source très corrompue: au plus une erreur par ligne, chaque token lu une fois
+    lines = [' '.join(rng.choice(fragments[:-2]) for _ in range(6)) for _ in range(3000)]
+    source = '\n'.join(lines)
+    tokens = Tokenizer(source).tokenize()
+    parser = Parser(tokens, source, max_diagnostics=None)
+    advances = 0
+    advance = parser._advance
+    
+    def counting_advance():
+        nonlocal advances
+        advances += 1
+        return advance()
+    
+    parser._advance = counting_advance
+    parser.parse()
+    assert parser.error_manager.total_count <= len(lines)
+    assert advances <= len(tokens)
+    print("✓ test_parser_recovery_fuzz passed")
+
+
+def test_structured_diagnostics():
+    """Test: Codes stables et export JSON / SARIF des diagnostics"""
+    source = """page Home
+-button b
+42 Click
+page Home
+"""
+    project, error_manager = parse_connect_script(source)
+    codes = [error.code for error in error_manager.get_errors()]
+    assert codes == [ErrorCode.UNEXPECTED_TOKEN, ErrorCode.DUPLICATE_PAGE]
+    
+    first = error_manager.get_errors()[0].to_dict()
+    assert first['code'] == 'CS1001'
+    assert first['level'] == 'error'
+    assert (first['line'], first['column']) == (3, 1)
+    assert 'suggestion' in first
+    assert error_manager.to_json()[0] == first
+    assert json.loads(json.dumps(error_manager.to_json())) == error_manager.to_json()
+    
+    # Mise en forme (contexte) seulement à la demande
+    error = error_manager.get_errors()[0]
+    assert error.code_context is None
+    assert "42 Click" in error_manager.format(error)
+    
+    sarif = error_manager.to_sarif("game.cs")
+    assert sarif['version'] == '2.1.0'
+    run = sarif['runs'][0]
+    assert [rule['id'] for rule in run['tool']['driver']['rules']] == ['CS1001', 'CS1003']
+    result = run['results'][0]
+    assert result['ruleId'] == 'CS1001'
+    assert result['level'] == 'error'
+    location = result['locations'][0]['physicalLocation']
+    assert location['artifactLocation']['uri'] == 'game.cs'
+    assert location['region']['startLine'] == 3
+    
+    # Avertissements de génération: niveau SARIF 'warning'
+    manager = CompileErrorManager("")
+    manager.add_warning("Page inaccessible", 1, code=ErrorCode.UNREACHABLE_PAGE)
+    assert manager.to_sarif()['runs'][0]['results'][0]['level'] == 'warning'
+    assert manager.get_warnings()[0].to_dict()['code'] == 'CS2001'
+    print("✓ test_structured_diagnostics passed")
+
+
+def test_json_project():
+    """Test: Conversion projet JSON <-> AST sans texte intermédiaire"""
+    code = """
+page Home
+-button playBtn
+--text "Play"
+--position 10 20
+--script script_click
+
+page Game
+-text title
+--value "Game"
+--position 10 60
+
+on start
+ set score 0
+ alert("Welcome!")
+end
+
+on click
+ add score 10
+ connect.goto(Game)
+end
+"""
+    project, _ = parse_connect_script(code)
+    data = project_to_json(project, name="Demo", created_at="2024-01-01T00:00:00Z")
+    assert loader.validate_project(data) == {'ok': True, 'errors': []}
+    assert data['metadata'] == {'name': 'Demo', 'version': '1.0.0', 'createdAt': '2024-01-01T00:00:00Z'}
+    assert data['scripts']['script_click']['triggers'] == [{'type': 'click', 'target': 'playBtn'}]
+    assert data['scripts']['script_start']['actions'] == [
+        {'type': 'set', 'variable': 'score', 'value': 0},
+        {'type': 'alert', 'message': 'Welcome!'}
+    ]
+    
+    # Aller-retour: même JavaScript que depuis le source
+    rebuilt = project_from_json(json.loads(json.dumps(data)))
+    assert compile_project(rebuilt, CompileErrorManager("")) == compile_project(project, CompileErrorManager(code))
+    assert project_to_json(rebuilt, name="Demo", created_at="2024-01-01T00:00:00Z") == data
+    
+    # Un trigger 'click' relie sa cible au script; un script sans trigger est cliquable
+    data['scripts'] = {
+        'jump': {'name': 'jump', 'triggers': [{'type': 'click', 'target': 'title'}],
+                 'actions': [{'type': 'add', 'variable': 'y', 'value': 5}]},
+        'reset': {'name': 'reset', 'actions': [{'type': 'set', 'variable': 'y', 'value': 0}]},
+    }
+    rebuilt = project_from_json(data)
+    assert rebuilt.pages['Game'].elements[0].get_property('script') == 'jump'
+    assert [h.event_type for h in rebuilt.scripts['reset'].event_handlers] == [EventType.CLICK]
+    interpreter = Interpreter(rebuilt)
+    interpreter.start()
+    interpreter.context.navigate_to_page('Game')
+    assert interpreter.click('title')
+    assert interpreter.state['variables'] == {'y': 5}
+    
+    data['scripts']['jump']['triggers'] = [{'type': 'hover'}]
+    try:
+        project_from_json(data)
+        assert False, "événement inconnu accepté"
+    except ValueError:
+        pass
+    print("✓ test_json_project passed")
+
+
+def test_json_project_escaping():
+    """Test: Noms et valeurs d'un projet JSON échappés dans le JavaScript"""
+    data = {
+        'pages': [{'name': "p');globalThis.pwned2=1;//", 'elements': [
+            {'type': 'text', 'name': "it's", 'properties': {'value': "</script>"}}
+        ]}],
+        'scripts': {
+            "s'": {'name': "s'", 'triggers': [{'type': 'start'}], 'actions': [
+                {'type': 'set', 'variable': "x'];globalThis.pwned=1;//", 'value': True},
+                {'type': 'set', 'variable': 'empty', 'value': None},
+                {'type': 'add', 'variable': 'n', 'value': "1);globalThis.pwned3=1;//"},
+                {'type': 'alert', 'message': "back\\slash'\nline"},
+                {'type': 'goto', 'page': "p');globalThis.pwned2=1;//"},
+            ]}
+        }
+    }
+    for minify in (False, True):
+        js_code = compile_project(project_from_json(data), CompileErrorManager(""), minify=minify)
+        assert "x'];" not in js_code and "p');" not in js_code
+        assert "'1);globalThis.pwned3=1;//';" in js_code  # chaîne, pas du code
+        assert "['x\\'];globalThis.pwned=1;//']" in js_code
+        assert "this.showPage('p\\');globalThis.pwned2=1;//')" in js_code
+        assert "window.alert('back\\\\slash\\'\\nline')" in js_code
+        assert "True" not in js_code and "None" not in js_code
+    
+    js_code = compile_project(project_from_json(data), CompileErrorManager(""))
+    assert "this.variables['x\\'];globalThis.pwned=1;//'] = true;" in js_code
+    assert "this.variables['empty'] = null;" in js_code
+    
+    # Champ hors du schéma (ex: une condition JavaScript) refusé
+    data['scripts']["s'"]['actions'] = [{'type': 'if', 'condition': 'globalThis.pwned=1'}]
+    try:
+        project_from_json(data)
+        assert False, "champ d'action inconnu accepté"
+    except ValueError:
+        pass
+    print("✓ test_json_project_escaping passed")
+
+
+JSON_SOURCES = [
+    # Propriétés requises absentes, texte et image cliquables
+    """
+page Home
+-button go
+--script script_click
+-text label
+--script script_click
+-image logo
+--source "logo.png"
+--size 10 10
+
+on click
+ add clicks 1
+end
+""",
+    # Même nom d'élément sur plusieurs pages, même script
+    """
+page A
+-text b
+--value "A"
+--script script_click
+
+page B
+-text b
+--value "B"
+--script script_click
+
+on click
+ connect.goto(B)
+end
+""",
+    # Handlers vides (omis) et boutons de même nom avec des scripts différents
+    """
+page A
+-button back
+--script script_click
+-button other
+--script nothing
+
+page B
+-button back
+--script goA
+
+on click
+end
+
+on start
+ set score 0
+end
+
+on start
+end
+""",
+]
+
+
+def test_json_project_schema():
+    """Test: Tout projet produit par project_to_json est valide pour loader.validate_project"""
+    from compiler.benchmarks import TICK_HEAVY_GAME
+    
+    for code in JSON_SOURCES + [TICK_HEAVY_GAME]:
+        project, errors = parse_connect_script(code)
+        assert not errors.has_errors()
+        data = project_to_json(project, created_at="2024-01-01T00:00:00Z")
+        assert loader.validate_project(json.loads(json.dumps(data))) == {'ok': True, 'errors': []}, data
+        # Aller-retour stable (valeurs par défaut comprises)
+        rebuilt = project_from_json(data)
+        assert project_to_json(rebuilt, created_at="2024-01-01T00:00:00Z") == data
+    
+    # --script d'un texte: porté par le trigger, un seul trigger par nom
+    project, _ = parse_connect_script(JSON_SOURCES[1])
+    data = project_to_json(project, created_at="2024-01-01T00:00:00Z")
+    assert data['pages'][0]['elements'][0]['properties'] == {'value': 'A', 'position': [0, 0]}
+    assert data['scripts']['script_click']['triggers'] == [{'type': 'click', 'target': 'b'}]
+    
+    # Le trigger relie l'élément 'b' de chaque page, pas seulement le premier
+    rebuilt = project_from_json(data)
+    assert [page.elements[0].get_property('script') for page in rebuilt.pages.values()] == ['script_click'] * 2
+    interpreter = Interpreter(rebuilt)
+    interpreter.start()
+    interpreter.context.navigate_to_page('B')
+    assert interpreter.click('b')
+    
+    # Les handlers sans action ne donnent pas de script (minItems: 1)
+    project, _ = parse_connect_script(JSON_SOURCES[2])
+    data = project_to_json(project, created_at="2024-01-01T00:00:00Z")
+    assert sorted(data['scripts']) == ['script_start']
+    assert data['scripts']['script_start']['actions'] == [{'type': 'set', 'variable': 'score', 'value': 0}]
+    
+    # Ce que le schéma ne peut pas représenter lève ValueError
+    invalid = [
+        """
+on start
+ set x 1
+end
+""",
+        """
+page A
+-text t
+--size 10 10
+""",
+        """
+page A
+-text b
+--script one
+
+page B
+-button b
+--script two
+
+on click
+ set x 1
+end
+""",
+        """
+page A
+-text b
+--script script_click
+
+page B
+-text b
+
+on click
+ set x 1
+end
+""",
+    ]
+    for code in invalid:
+        project, _ = parse_connect_script(code)
+        try:
+            project_to_json(project)
+            assert False, f"projet accepté: {code}"
+        except ValueError:
+            pass
+    
+    project, _ = parse_connect_script(JSON_SOURCES[0])
+    project.scripts['script_click'].event_handlers[0].actions[0].params['condition'] = 'x > 1'
+    slider = Project()
+    slider.add_page(Page(name='A', elements=[UIElement(element_type='slider', name='s')]))
+    for project in (project, slider):
+        try:
+            project_to_json(project)
+            assert False, "projet hors du schéma accepté"
+        except ValueError:
+            pass
+    print("✓ test_json_project_schema passed")
+
+
+def as_set(errors):
+    """Diagnostics {path, message} comparables sans tenir compte de l'ordre"""
+    return sorted((e.get('path'), e['message']) for e in errors)
+
+
+def test_semantic_checks_equivalence():
+    """Test: semantic_checks indexé donne les mêmes erreurs que l'ancienne version quadratique"""
+    bench = load_parser_module('benchmarks')
+    quadratic = bench._quadratic_semantic_checks
+    
+    project = bench.make_project(pages=3, elements=6, scripts=4, assets=2)
+    assert loader.semantic_checks(project) == [] == quadratic(project)
+    
+    # Pages et éléments en double, cibles absentes, assets manquants
+    broken = json.loads(json.dumps(project))
+    broken['pages'].append({'name': 'Page0', 'elements': []})
+    broken['pages'].append({'name': 'Page0', 'elements': []})
+    broken['pages'].append({'elements': []})
+    broken['pages'].append({'elements': []})
+    elements = broken['pages'][1]['elements']
+    elements.append(dict(elements[0]))
+    elements.append({'type': 'text'})
+    elements.append({'type': 'text'})
+    elements.append({'type': 'image', 'name': 'pic', 'properties': {'source': 'nope'}})
+    broken['pages'][2]['background']['imageRef'] = 'gone'
+    broken['scripts']['s0']['triggers'] = [{'type': 'click', 'target': 'ghost'},
+                                           {'type': 'click', 'target': 'p1_e0'},
+                                           {'type': 'start'}]
+    del broken['assets']['img1']
+    expected = as_set(quadratic(broken))
+    assert len(expected) == 11
+    assert as_set(loader.semantic_checks(broken)) == expected
+    
+    # Projets aléatoires: peu de noms possibles, donc beaucoup de doublons
+    rng = random.Random(46)
+    names = ['a', 'b', 'c', None]
+    for _ in range(200):
+        instance = {'pages': [], 'scripts': {}, 'assets': {k: {} for k in rng.sample(['i0', 'i1', 'i2'], rng.randint(0, 3))}}
+        for _ in range(rng.randint(0, 4)):
+            page = {'elements': []}
+            if rng.random() < 0.9:
+                page['name'] = rng.choice(names)
+            if rng.random() < 0.5:
+                page['background'] = {'imageRef': rng.choice(['i0', 'i3', ''])}
+            for _ in range(rng.randint(0, 4)):
+                element = {'type': rng.choice(['text', 'image']), 'name': rng.choice(names)}
+                if rng.random() < 0.7:
+                    element['properties'] = {'source': rng.choice(['i1', 'i4', None])}
+                page['elements'].append(element)
+            instance['pages'].append(page)
+        for k in range(rng.randint(0, 3)):
+            instance['scripts'][f's{k}'] = {'triggers': [
+                {'type': rng.choice(['click', 'start']), 'target': rng.choice(names)}
+                for _ in range(rng.randint(0, 3))]}
+        assert as_set(loader.semantic_checks(instance)) == as_set(quadratic(instance)), instance
+    
+    # Entrées mal formées: l'ancienne version plantait; la nouvelle les laisse au
+    # schéma et vérifie le reste comme l'ancienne sur les entrées bien formées
+    well_formed = json.loads(json.dumps(broken))
+    malformed = json.loads(json.dumps(broken))
+    malformed['pages'].append('Page9')
+    malformed['pages'][1]['elements'].append(['p1_e0'])
+    malformed['pages'][1]['elements'][0]['properties'] = 'img0'
+    well_formed['pages'][1]['elements'][0]['properties'] = {}
+    malformed['pages'][2]['background'] = 'gone'
+    well_formed['pages'][2]['background'] = {}
+    malformed['pages'][3]['elements'] = {'name': 'x'}
+    well_formed['pages'][3]['elements'] = []
+    malformed['scripts']['s1']['triggers'].append('ghost')
+    malformed['scripts']['s2'] = 'not a script'
+    well_formed['scripts']['s2'] = {}
+    malformed['scripts']['s3']['triggers'] = {'type': 'click', 'target': 'ghost'}
+    well_formed['scripts']['s3']['triggers'] = []
+    for instance in (malformed, well_formed):
+        try:
+            quadratic(instance)
+        except (AttributeError, TypeError):
+            assert instance is malformed
+    assert as_set(loader.semantic_checks(malformed)) == as_set(quadratic(well_formed))
+    
+    # Noms non hachables (invalides pour le schéma): pas d'exception
+    malformed['pages'][0]['name'] = ['Page0']
+    malformed['pages'][0]['elements'][0]['name'] = {'n': 1}
+    malformed['scripts']['s0']['triggers'] = [{'type': 'click', 'target': ['p1_e0']}]
+    errors = loader.semantic_checks(malformed)
+    assert {'path': 'scripts.s0.triggers', 'message': "Trigger target not found: ['p1_e0']"} in errors
+    print("✓ test_semantic_checks_equivalence passed")
+
+
+VALID_PROJECT = {
+    'metadata': {'name': 'Demo', 'version': '1.0.0', 'createdAt': '2024-01-01T00:00:00Z'},
+    'pages': [{'name': 'Home', 'elements': [
+        {'type': 'button', 'name': 'play', 'properties': {'text': 'Play', 'position': [0, 0]}}
+    ]}],
+    'scripts': {'go': {'name': 'go', 'triggers': [{'type': 'click', 'target': 'play'}],
+                       'actions': [{'type': 'set', 'variable': 'score', 'value': 1}]}},
+}
+
+
+def test_batch_validation():
+    """Test: Validation par lots (parser/loader.py --batch), en série et en parallèle"""
+    with tempfile.TemporaryDirectory() as root:
+        os.makedirs(os.path.join(root, 'sub'))
+        valid = os.path.join(root, 'valid.json')
+        invalid = os.path.join(root, 'sub', 'invalid.json')
+        unreadable = os.path.join(root, 'sub', 'unreadable.json')
+        with open(valid, 'w', encoding='utf-8') as f:
+            json.dump(VALID_PROJECT, f)
+        with open(invalid, 'w', encoding='utf-8') as f:
+            json.dump(dict(VALID_PROJECT, pages=[{'name': 'A', 'elements': []}] * 2, scripts={}), f)
+        with open(unreadable, 'w', encoding='utf-8') as f:
+            f.write('{"pages": [')
+        with open(os.path.join(root, 'notes.txt'), 'w', encoding='utf-8') as f:
+            f.write('pas un projet')
+        
+        # Découverte: dossier (récursif, *.json), motif glob, fichier seul
+        assert loader.find_projects(root) == sorted([valid, invalid, unreadable])
+        assert loader.find_projects(os.path.join(root, '*.json')) == [valid]
+        assert loader.find_projects(os.path.join(root, '**', 'in*.json')) == [invalid]
+        assert loader.find_projects(valid) == [valid]
+        assert loader.find_projects(os.path.join(root, '*.yaml')) == []
+        
+        paths = [unreadable, valid, invalid, os.path.join(root, 'missing.json')]
+        for workers in (1, 2):
+            for stream in (False, True):
+                # chunk_size=1: plusieurs tâches dans le pool, résultats dans l'ordre
+                results = list(loader.validate_files(paths, workers=workers, chunk_size=1, stream=stream))
+                assert [r['path'] for r in results] == paths
+                assert [r['status'] for r in results] == [2, 0, 3, 2]
+                assert [r['ok'] for r in results] == [False, True, False, False]
+                assert results[2]['errors'] == [{'path': 'pages', 'message': 'Duplicate page name: A'}]
+        
+        # Code de sortie: illisible > invalide > valide; aucun fichier -> illisible
+        cases = [
+            (valid, 0, {'files': 1, 'valid': 1, 'invalid': 0, 'unreadable': 0}),
+            (os.path.join(root, '*.json'), 0, {'files': 1, 'valid': 1, 'invalid': 0, 'unreadable': 0}),
+            (os.path.join(root, '**', 'in*.json'), 3, {'files': 1, 'valid': 0, 'invalid': 1, 'unreadable': 0}),
+            (root, 2, {'files': 3, 'valid': 1, 'invalid': 1, 'unreadable': 1}),
+            (os.path.join(root, '*.yaml'), 2, {'files': 0, 'valid': 0, 'invalid': 0, 'unreadable': 0}),
+            (os.path.join(root, 'missing.json'), 2, {'files': 1, 'valid': 0, 'invalid': 0, 'unreadable': 1}),
+        ]
+        for workers in (1, 2):
+            for target, exit_code, counts in cases:
+                out = io.StringIO()
+                assert loader.run_batch(target, workers=workers, out=out) == exit_code, target
+                lines = [json.loads(line) for line in out.getvalue().splitlines()]
+                summary = lines.pop()['summary']
+                assert summary['exit_code'] == exit_code
+                assert {k: summary[k] for k in counts} == counts
+                assert summary['errors'] == sum(len(r['errors']) for r in lines)
+                assert [r['path'] for r in lines] == loader.find_projects(target)
+                assert all(set(r) == {'path', 'ok', 'status', 'errors'} for r in lines)
+        
+        assert loader.summarize([])['exit_code'] == 2
+        assert loader.summarize([{'status': 0, 'errors': []}, {'status': 3, 'errors': [{}]}])['exit_code'] == 3
+    print("✓ test_batch_validation passed")
+
+
+def test_streaming_validation():
+    """Test: Validation en flux identique à json.load + validate_project"""
+    project = json.loads(json.dumps(VALID_PROJECT))
+    project['pages'][0]['elements'][0]['properties']['text'] = 'Caf\u00e9 "\\ \n \U0001F600'
+    project['pages'].append({'name': 'Home', 'elements': [{'type': 'text', 'name': 'x', 'properties': {}}]})
+    project['scripts']['bad'] = {'name': 'bad', 'triggers': [{'type': 'click', 'target': 'nope'}], 'actions': []}
+    project['assets'] = {'img': {'id': 'img', 'type': 'image', 'src': 'a.png'}, 'bad': {'type': 3}}
+    project['pages'][0]['background'] = {'imageRef': 'missing'}
+    
+    documents = [
+        json.dumps(VALID_PROJECT),
+        json.dumps(VALID_PROJECT, indent=2, ensure_ascii=True),
+        json.dumps(project),
+        json.dumps(project, ensure_ascii=False),
+        # Clés répétées: la dernière l'emporte, comme json.load
+        '{"pages":[{"name":"A"},{"name":"A"}],"pages":[{"name":"B"}]}',
+        '{"pages":[{"name":"A","elements":[]}],"pages":5}',
+        '{"scripts":{"s":{"triggers":[{"type":"click","target":"x"}]}},"scripts":{}}',
+        '{"scripts":{"s":{"triggers":[{"type":"click","target":"x"}]},"s":{"actions":[]}}}',
+        '{"assets":{"a":{"type":3},"a":{"type":"image"}},"assets":{"b":{}},"pages":[]}',
+        '{"pages":[{"name":"A","elements":[{"type":"text","name":"e"},{"type":"text","name":"e"}]}],'
+        ' "scripts":{"s":{"triggers":[{"type":"click","target":"e"}]}}}',
+        # Racines qui ne sont pas des objets
+        '5', '[]', '"x"', 'null', ' [{"pages": []}] ',
+        # JSON mal formé
+        '', '{"pages": [', '{} extra', '[] x', '1 2', '{"a":"\\u12"}', '{"pages": ["abc',
+        '{"a" 1}', '[1,]', '{"a":tru}', '{"a":1,}', '{"a":"\\x"}', '{"a":"line\nbreak"}',
+    ]
+    for text in documents:
+        try:
+            expected = loader.validate_project(json.loads(text))
+        except ValueError:
+            expected = None
+        for chunk_size in (1, 3, streaming.CHUNK_SIZE):
+            out = streaming.validate_stream(io.StringIO(text), chunk_size=chunk_size)
+            if expected is None:
+                assert out['status'] == loader.EXIT_UNREADABLE and not out['ok'], (text, chunk_size)
+                assert len(out['errors']) == 1 and out['errors'][0]['message'].startswith('Invalid JSON: ')
+            else:
+                assert 'status' not in out, (text, chunk_size, out)
+                assert out['ok'] == expected['ok'], (text, chunk_size)
+                assert as_set(out['errors']) == as_set(expected['errors']), (text, chunk_size)
+    
+    # Les erreurs du projet modifié couvrent pages, scripts, assets et références
+    messages = {e['message'] for e in streaming.validate_stream(io.StringIO(documents[2]))['errors']}
+    assert {'Duplicate page name: Home', 'Trigger target not found: nope',
+            'Background imageRef not found in assets: missing'} <= messages
+    
+    # Chaînes d'assets longues: ignorées sans changer le résultat
+    project['assets']['img']['src'] = 'x' * 100
+    text = json.dumps(project)
+    out = streaming.validate_stream(io.StringIO(text), chunk_size=7, max_string=10)
+    assert as_set(out['errors']) == as_set(loader.validate_project(project)['errors'])
+    print("✓ test_streaming_validation passed")
+
+
+def check_session(session):
+    """Diagnostics de la session == validate_project sur le document modifié"""
+    expected = loader.validate_project(json.loads(json.dumps(session.instance)))
+    result = session.result()
+    assert result['ok'] == expected['ok']
+    assert as_set(result['errors']) == as_set(expected['errors']), session.instance
+
+
+def test_incremental_validation():
+    """Test: Chaque opération JSON Patch sur pages, éléments, scripts et assets"""
+    bench = load_parser_module('benchmarks')
+    project = bench.make_project(pages=3, elements=4, scripts=3, assets=2)
+    session = ValidationSession(json.loads(json.dumps(project)))
+    assert session.result() == {'ok': True, 'errors': []}
+    
+    image = {'type': 'image', 'name': 'pic', 'properties': {'source': 'img9', 'position': [0, 0]}}
+    patches = [
+        # pages
+        [{'op': 'add', 'path': '/pages/1', 'value': {'name': 'Page0', 'elements': [image]}}],
+        [{'op': 'add', 'path': '/pages/-', 'value': {'name': 'Extra', 'elements': []}}],
+        [{'op': 'test', 'path': '/pages/1/name', 'value': 'Page0'},
+         {'op': 'replace', 'path': '/pages/1/name', 'value': 'Page9'}],
+        [{'op': 'replace', 'path': '/pages/0', 'value': {'name': 'Page2', 'elements': [], 'background': {'imageRef': 'gone'}}}],
+        [{'op': 'move', 'from': '/pages/0', 'path': '/pages/3'}],
+        [{'op': 'copy', 'from': '/pages/1', 'path': '/pages/0'}],
+        [{'op': 'remove', 'path': '/pages/2'}],
+        [{'op': 'add', 'path': '/pages/0/bogus', 'value': 1}],
+        [{'op': 'remove', 'path': '/pages/0/bogus'}],
+        # éléments
+        [{'op': 'add', 'path': '/pages/0/elements/0', 'value': dict(image, name='p0_e0')}],
+        [{'op': 'copy', 'from': '/pages/0/elements/0', 'path': '/pages/0/elements/-'}],
+        [{'op': 'test', 'path': '/pages/0/elements/0/name', 'value': 'p0_e0'},
+         {'op': 'replace', 'path': '/pages/0/elements/0/name', 'value': 'renamed'}],
+        [{'op': 'move', 'from': '/pages/0/elements/1', 'path': '/pages/1/elements/0'}],
+        [{'op': 'add', 'path': '/pages/1/elements/0/properties/source', 'value': 'img0'}],
+        [{'op': 'remove', 'path': '/pages/0/elements/0'}],
+        [{'op': 'replace', 'path': '/pages/1/elements/1', 'value': 'not an element'}],
+        [{'op': 'replace', 'path': '/pages/1/elements', 'value': {}}],
+        # scripts
+        [{'op': 'add', 'path': '/scripts/new', 'value': {'name': 'new', 'triggers': [{'type': 'click', 'target': 'ghost'}],
+                                                         'actions': [{'type': 'goto', 'page': 'Page0'}]}}],
+        [{'op': 'copy', 'from': '/scripts/new', 'path': '/scripts/new2'}],
+        [{'op': 'test', 'path': '/scripts/s0/triggers/0/type', 'value': 'click'},
+         {'op': 'replace', 'path': '/scripts/s0/triggers/0/target', 'value': 'ghost'}],
+        [{'op': 'move', 'from': '/scripts/s1', 'path': '/scripts/new'}],
+        [{'op': 'add', 'path': '/scripts/s2/triggers/-', 'value': 'oops'}],
+        [{'op': 'remove', 'path': '/scripts/s0'}],
+        [{'op': 'replace', 'path': '/scripts/new2/actions', 'value': []}],
+        [{'op': 'add', 'path': '/pages/0/elements', 'value': [dict(image, name='ghost', properties={})]}],
+        # assets
+        [{'op': 'add', 'path': '/assets/img9', 'value': {'id': 'img9', 'type': 'image', 'src': 'a.png'}}],
+        [{'op': 'remove', 'path': '/assets/img0'}],
+        [{'op': 'test', 'path': '/assets/img1/type', 'value': 'image'},
+         {'op': 'move', 'from': '/assets/img1', 'path': '/assets/gone'}],
+        [{'op': 'copy', 'from': '/assets/gone', 'path': '/assets/img0'}],
+        [{'op': 'replace', 'path': '/assets/img9', 'value': {'type': 3}}],
+        [{'op': 'replace', 'path': '/assets/img9/type', 'value': 'image'}],
+        # collections entières et niveau supérieur
+        [{'op': 'remove', 'path': '/assets'}],
+        [{'op': 'add', 'path': '/assets', 'value': {'img0': {'id': 'img0', 'type': 'image', 'src': 'a.png'}}}],
+        [{'op': 'replace', 'path': '/scripts', 'value': []}],
+        [{'op': 'replace', 'path': '/scripts', 'value': {}}],
+        [{'op': 'replace', 'path': '/metadata/version', 'value': 'v1'}],
+        [{'op': 'move', 'from': '/pages', 'path': '/pagez'}],
+        [{'op': 'move', 'from': '/pagez', 'path': '/pages'}],
+        [{'op': 'replace', 'path': '/pages', 'value': []}],
+        [{'op': 'replace', 'path': '', 'value': project}],
+        [{'op': 'copy', 'from': '/pages/0', 'path': '/pages/-'}],
+    ]
+    for patch in patches:
+        result = session.apply(json.loads(json.dumps(patch)))
+        assert result == session.result()
+        check_session(session)
+    assert not session.result()['ok']
+    
+    # Opération refusée: les précédentes restent appliquées, la session reste cohérente
+    for patch in ([{'op': 'remove', 'path': '/pages/0'}, {'op': 'test', 'path': '/pages/0/name', 'value': 'nope'}],
+                  [{'op': 'add', 'path': '/assets/x', 'value': {}}, {'op': 'remove', 'path': '/scripts/missing'}],
+                  [{'op': 'add', 'path': '/pages/99', 'value': {}}],
+                  [{'op': 'move', 'from': '/pages', 'path': '/pages/0'}]):
+        try:
+            session.apply(patch)
+            assert False, f"patch accepté: {patch}"
+        except PatchError:
+            pass
+        check_session(session)
+    
+    # Suite aléatoire d'opérations sur les quatre collections
+    rng = random.Random(49)
+    session = ValidationSession(json.loads(json.dumps(project)))
+    names = ['Page0', 'Page1', 'p0_e0', 'p1_e0', 'p2_e0', 'img0', 'img1', 'zz']
+    
+    def random_path(end=False):
+        doc = session.instance
+        section = rng.choice(['pages', 'elements', 'scripts', 'assets'])
+        if section in ('scripts', 'assets'):
+            keys = list(doc[section])
+            name = rng.choice(keys + [rng.choice(names)]) if keys else rng.choice(names)
+            return f'/{section}/{name}', name in doc[section]
+        pages = doc['pages']
+        if not pages:
+            return '/pages/-' if end else None, False
+        i = rng.randrange(len(pages))
+        if section == 'pages':
+            items, prefix = pages, '/pages'
+        else:
+            items, prefix = pages[i]['elements'], f'/pages/{i}/elements'
+        if end and rng.random() < 0.3:
+            return f'{prefix}/-', False
+        if not items:
+            return (f'{prefix}/0', False) if end else (None, False)
+        return f'{prefix}/{rng.randrange(len(items))}', True
+    
+    def random_value(path):
+        if '/elements/' in path:
+            return {'type': rng.choice(['image', 'text']), 'name': rng.choice(names),
+                    'properties': {'source': rng.choice(names)}}
+        if path.startswith('/pages'):
+            return {'name': rng.choice(names), 'elements': [],
+                    'background': {'imageRef': rng.choice(names)}}
+        if path.startswith('/scripts'):
+            return {'triggers': [{'type': 'click', 'target': rng.choice(names)}], 'actions': []}
+        return rng.choice([{'id': 'x', 'type': 'image', 'src': 'a.png'}, {'type': 1}])
+    
+    applied = 0
+    for _ in range(400):
+        kind = rng.choice(['add', 'remove', 'replace', 'move', 'copy', 'test'])
+        path, exists = random_path(end=kind in ('add', 'move', 'copy'))
+        if path is None:
+            continue
+        if kind in ('move', 'copy'):
+            source, source_exists = random_path()
+            if not source_exists or source.split('/')[1] != path.split('/')[1] or \
+                    source.count('/') != path.count('/'):
+                continue
+            op = {'op': kind, 'from': source, 'path': path}
+        elif kind in ('remove', 'replace', 'test'):
+            if not exists:
+                continue
+            op = {'op': kind, 'path': path}
+            if kind == 'replace':
+                op['value'] = random_value(path)
+            elif kind == 'test':
+                value = session.instance
+                for token in path.split('/')[1:]:
+                    value = value[int(token)] if isinstance(value, list) else value[token]
+                op['value'] = json.loads(json.dumps(value)) if rng.random() < 0.7 else 'other'
+        else:
+            op = {'op': 'add', 'path': path, 'value': random_value(path)}
+        try:
+            session.apply([op])
+            applied += 1
+        except PatchError:
+            assert kind in ('test', 'move')
+        check_session(session)
+    assert applied > 150
+    print("✓ test_incremental_validation passed")
+
+
 def run_all_tests():
     """Lance tous les tests"""
     print("\n" + "="*60)
@@ -352,6 +1879,35 @@ def run_all_tests():
         test_color_property,
         test_positions_and_sizes,
         test_complex_game,
+        test_minified_output,
+        test_source_map,
+        test_optimizer,
+        test_dead_code_elimination,
+        test_prune_keeps_click_handlers,
+        test_interpreter,
+        test_js_arithmetic,
+        test_bytecode_vm,
+        test_event_history_policies,
+        test_event_history_queries,
+        test_async_event_bus,
+        test_batched_variable_changes,
+        test_event_dispatch_table,
+        test_filtered_subscriptions,
+        test_weak_listeners,
+        test_tick_scheduler,
+        test_session_host,
+        test_lazy_line_index,
+        test_diagnostic_cap,
+        test_parser_recovery,
+        test_parser_recovery_fuzz,
+        test_structured_diagnostics,
+        test_json_project,
+        test_json_project_escaping,
+        test_json_project_schema,
+        test_semantic_checks_equivalence,
+        test_batch_validation,
+        test_streaming_validation,
+        test_incremental_validation,
     ]
     
     passed = 0
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the project loader.
+
+Usage: python parser/benchmarks.py
+"""
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from jsonschema import Draft7Validator
+
+import loader
+from incremental import ValidationSession
+
+
+def make_project(pages=5, elements=20, scripts=10, assets=5):
+    """Build a valid project with the given number of pages/elements/scripts/assets."""
+    project = {
+        'metadata': {'name': 'Bench', 'version': '1.0.0', 'createdAt': '2024-01-01T00:00:00Z'},
+        'pages': [],
+        'scripts': {},
+        'assets': {},
+    }
+    for a in range(assets):
+        project['assets'][f'img{a}'] = {'id': f'img{a}', 'type': 'image', 'src': f'img{a}.png'}
+    for p in range(pages):
+        elems = []
+        for e in range(elements):
+            name = f'p{p}_e{e}'
+            if e % 3 == 0:
+                elems.append({'type': 'button', 'name': name,
+                              'properties': {'text': 'Go', 'position': [e, p], 'script': f's{e % max(scripts, 1)}'}})
+            elif e % 3 == 1:
+                elems.append({'type': 'text', 'name': name,
+                              'properties': {'value': 'Hello', 'position': [e, p]}})
+            else:
+                source = f'img{e % assets}' if assets else 'missing'
+                elems.append({'type': 'image', 'name': name,
+                              'properties': {'source': source, 'position': [e, p]}})
+        page = {'name': f'Page{p}', 'elements': elems}
+        if assets:
+            page['background'] = {'color': '#000000', 'imageRef': f'img{p % assets}'}
+        project['pages'].append(page)
+    for s in range(scripts):
+        project['scripts'][f's{s}'] = {
+            'name': f's{s}',
+            'triggers': [{'type': 'click', 'target': f'p{s % max(pages, 1)}_e0'}],
+            'actions': [{'type': 'set', 'variable': 'score', 'value': s},
+                        {'type': 'goto', 'page': 'Page0'}],
+        }
+    return project
+
+
+def _measure(run, repeat=5):
+    """Best time (seconds) over several runs."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _uncached_validate(instance):
+    """Previous schema_validate: read the schema and build a validator on every call."""
+    schema = loader.load_json(loader.SCHEMA_PATH)
+    validator = Draft7Validator(schema)
+    return [{'path': '/'.join(map(str, err.path)), 'message': err.message}
+            for err in validator.iter_errors(instance)]
+
+
+def _quadratic_semantic_checks(instance):
+    """Previous semantic_checks: count() for duplicates, nested loops for triggers."""
+    errs = []
+
+    # pages: unique names
+    pages = instance.get('pages', [])
+    page_names = [p.get('name') for p in pages]
+    dup_pages = set([n for n in page_names if page_names.count(n) > 1])
+    for d in dup_pages:
+        errs.append({'path': 'pages', 'message': f"Duplicate page name: {d}"})
+
+    # elements unique per page, and check element names
+    for i, p in enumerate(pages):
+        elems = p.get('elements', [])
+        names = [e.get('name') for e in elems]
+        dup = set([n for n in names if names.count(n) > 1])
+        for d in dup:
+            errs.append({'path': f'pages[{i}].elements', 'message': f"Duplicate element name in page {p.get('name')}: {d}"})
+
+    # scripts unique names
+    scripts = instance.get('scripts', {})
+    script_names = list(scripts.keys())
+    dup_scripts = set([n for n in script_names if script_names.count(n) > 1])
+    for d in dup_scripts:
+        errs.append({'path': 'scripts', 'message': f"Duplicate script name: {d}"})
+
+    # triggers reference elements/pages
+    page_map = {p.get('name'): p for p in pages}
+    for sname, script in scripts.items():
+        triggers = script.get('triggers', [])
+        for t in triggers:
+            ttype = t.get('type')
+            target = t.get('target')
+            if ttype == 'click' and target:
+                # ensure element exists in some page
+                found = False
+                for p in pages:
+                    for e in p.get('elements', []):
+                        if e.get('name') == target:
+                            found = True
+                            break
+                    if found:
+                        break
+                if not found:
+                    errs.append({'path': f'scripts.{sname}.triggers', 'message': f"Trigger target not found: {target}"})
+
+    # asset references: background.imageRef and element.properties.source
+    assets = instance.get('assets', {})
+    asset_keys = set(assets.keys())
+    for i, p in enumerate(pages):
+        bg = p.get('background') or {}
+        if bg.get('imageRef') and bg.get('imageRef') not in asset_keys:
+            errs.append({'path': f'pages[{i}].background', 'message': f"Background imageRef not found in assets: {bg.get('imageRef')}"})
+        for j, e in enumerate(p.get('elements', [])):
+            props = e.get('properties') or {}
+            # image source may reference asset id
+            if e.get('type') == 'image' and props.get('source') and props.get('source') not in asset_keys:
+                errs.append({'path': f'pages[{i}].elements[{j}]', 'message': f"Image source not found in assets: {props.get('source')}"})
+
+    return errs
+
+
+def bench_validation(count=300, repeat=5):
+    """Projects schema-validated per second: validator per call vs shared validator."""
+    projects = [make_project(pages=2, elements=5, scripts=3, assets=2) for _ in range(count)]
+    loader.get_validator()
+    results = {}
+    for name, validate in (('per call', _uncached_validate), ('shared validator', loader.schema_validate)):
+        def run():
+            for project in projects:
+                assert not validate(project)
+
+        results[name] = count / _measure(run, repeat)
+    return results
+
+
+def _with_problems(project):
+    """Add duplicate names and dangling references to a generated project."""
+    pages = project['pages']
+    pages.append(dict(pages[0]))
+    for page in pages[:3]:
+        page['elements'] = page['elements'] + page['elements'][:2]
+    project['scripts']['broken'] = {'name': 'broken', 'actions': [{'type': 'alert'}],
+                                    'triggers': [{'type': 'click', 'target': 'nowhere'}]}
+    pages[1]['background'] = {'imageRef': 'missing'}
+    return project
+
+
+def bench_semantic_checks(pages=20, elements=500, scripts=200):
+    """Seconds per semantic_checks call: previous quadratic version vs indexed version."""
+    project = _with_problems(make_project(pages=pages, elements=elements, scripts=scripts))
+    results = {}
+    for name, check in (('quadratic', _quadratic_semantic_checks), ('indexed', loader.semantic_checks)):
+        start = time.perf_counter()
+        errors = check(project)
+        results[name] = time.perf_counter() - start
+        results[name + ' errors'] = sorted(json.dumps(e, sort_keys=True) for e in errors)
+    assert results['quadratic errors'] == results['indexed errors']
+    return {name: value for name, value in results.items() if not name.endswith('errors')}
+
+
+def bench_streaming(assets=20, asset_size=1 << 20):
+    """Peak traced memory (bytes) to validate a project with large base64 assets."""
+    project = make_project(pages=10, elements=50, scripts=20, assets=assets)
+    for asset in project['assets'].values():
+        asset['src'] = 'data:image/png;base64,' + 'A' * asset_size
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'project.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(project, f)
+        del project
+        results['file size'] = os.path.getsize(path)
+        for name, validate in (('json.load', loader.validate_file),
+                               ('streaming', lambda p: loader.validate_file(p, stream=True))):
+            validate(path)  # build validators outside the measurement
+            tracemalloc.start()
+            assert validate(path)['ok']
+            results[name] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    return results
+
+
+def bench_incremental(pages=200, elements=100, edits=50):
+    """Seconds per edit on a large project: full revalidation vs ValidationSession."""
+    project = make_project(pages=pages, elements=elements, scripts=200, assets=20)
+    session = ValidationSession(project)
+    patches = [
+        [{'op': 'replace', 'path': f'/pages/{i % pages}/elements/{i % elements}/name', 'value': f'renamed{i}'}]
+        for i in range(edits)
+    ]
+    full_edits = 2
+    start = time.perf_counter()
+    for patch in patches[:full_edits]:
+        session.apply(patch)
+        loader.validate_project(session.instance)
+    full = (time.perf_counter() - start) / full_edits
+    start = time.perf_counter()
+    for patch in patches[full_edits:]:
+        result = session.apply(patch)
+    incremental = (time.perf_counter() - start) / (edits - full_edits)
+    assert sorted(map(str, result['errors'])) == sorted(map(str, loader.validate_project(session.instance)['errors']))
+    return {'full revalidation': full, 'incremental': incremental}
+
+
+def main():
+    print('Projects validated per second')
+    for name, rate in bench_validation().items():
+        print(f'  {name:<18} {rate:10,.0f} projects/s')
+
+    print('semantic_checks, 20 pages x 500 elements, 200 scripts')
+    for name, seconds in bench_semantic_checks().items():
+        print(f'  {name:<18} {seconds * 1000:10.1f} ms')
+
+    print('Revalidation after one edit, 200 pages x 100 elements')
+    for name, seconds in bench_incremental().items():
+        print(f'  {name:<18} {seconds * 1000:10.1f} ms')
+
+    print('Peak memory, project with 20 x 1 MiB assets')
+    for name, size in bench_streaming().items():
+        print(f'  {name:<18} {size / (1 << 20):10.1f} MiB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+Incremental revalidation of an edited ConnectScript project.
+
+A ValidationSession validates a project once, then applies JSON Patch
+(RFC 6902) edits to it. Each operation revalidates only the page, script
+or asset it touches; the semantic indexes (page and element name counts,
+trigger targets, asset references) are updated with that unit's old and
+new contributions, so references from untouched units are re-resolved
+only when a name they point to appears or disappears.
+
+Diagnostics are the same as loader.validate_project (compared as a set).
+Operations are applied one by one: if one fails (PatchError), the ones
+before it stay applied and the session stays consistent.
+"""
+import copy
+import itertools
+
+from loader import _duplicates, _fields, _items, _key, get_part_validators
+
+
+class PatchError(ValueError):
+    """Invalid JSON Patch operation (bad path, failed test...)."""
+
+
+def _parse_pointer(pointer):
+    if pointer == '':
+        return []
+    if not pointer.startswith('/'):
+        raise PatchError(f'Invalid JSON pointer: {pointer}')
+    return [t.replace('~1', '/').replace('~0', '~') for t in pointer[1:].split('/')]
+
+
+def _child(container, token, pointer):
+    try:
+        if isinstance(container, list):
+            return container[_list_index(container, token, pointer)]
+        return container[token]
+    except (KeyError, IndexError, TypeError):
+        raise PatchError(f'Path not found: {pointer}')
+
+
+def _list_index(container, token, pointer, allow_end=False):
+    if token == '-' and allow_end:
+        return len(container)
+    if not token.isdigit() or (token != '0' and token.startswith('0')):
+        raise PatchError(f'Invalid array index in {pointer}')
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise PatchError(f'Array index out of range: {pointer}')
+    return index
+
+
+def _get(doc, tokens, pointer):
+    for token in tokens:
+        doc = _child(doc, token, pointer)
+    return doc
+
+
+def _schema_errors(validator, instance):
+    return [(tuple(err.path), err.message) for err in validator.iter_errors(instance)]
+
+
+class _Page:
+    """What one page contributes to the diagnostics and indexes."""
+
+    def __init__(self, uid, page, validators):
+        self.uid = uid
+        self.schema_errors = _schema_errors(validators['page'], page)
+        self.indexed = isinstance(page, dict)
+        self.name = None
+        self.element_keys = []
+        self.element_errors = []  # duplicate element messages
+        self.asset_refs = []      # (path suffix, label, asset id)
+        if not self.indexed:
+            return
+        self.name = page.get('name')
+        elements = [(j, e) for j, e in enumerate(_items(page.get('elements'))) if isinstance(e, dict)]
+        names = [e.get('name') for _, e in elements]
+        self.element_keys = [_key(n) for n in names]
+        for d in _duplicates(names):
+            self.element_errors.append(f"Duplicate element name in page {page.get('name')}: {d}")
+        bg = _fields(page.get('background'))
+        if bg.get('imageRef'):
+            self.asset_refs.append(('background', 'Background imageRef', bg.get('imageRef')))
+        for j, e in elements:
+            props = _fields(e.get('properties'))
+            if e.get('type') == 'image' and props.get('source'):
+                self.asset_refs.append((f'elements[{j}]', 'Image source', props.get('source')))
+
+
+class _Script:
+    """What one script contributes to the diagnostics and indexes."""
+
+    def __init__(self, script, validators):
+        self.schema_errors = _schema_errors(validators['script'], script)
+        self.targets = []
+        if isinstance(script, dict):
+            for t in _items(script.get('triggers')):
+                if isinstance(t, dict) and t.get('type') == 'click' and t.get('target'):
+                    self.targets.append(t.get('target'))
+
+
+def _increment(counter, key):
+    """Add one to counter[key]; True if key was absent."""
+    counter[key] = counter.get(key, 0) + 1
+    return counter[key] == 1
+
+
+def _decrement(counter, key):
+    """Remove one from counter[key]; True if key is now absent."""
+    counter[key] -= 1
+    if counter[key] <= 0:
+        del counter[key]
+        return True
+    return False
+
+
+class ValidationSession:
+    """Project validated once, then revalidated edit by edit."""
+
+    def __init__(self, instance):
+        self.instance = instance
+        self.validators = get_part_validators()
+        self.revalidated = 0  # units revalidated by the last apply()
+        self._rebuild()
+
+    # ------------------------------------------------------------------
+    # Indexes
+    # ------------------------------------------------------------------
+
+    def _rebuild(self):
+        self._uids = itertools.count()
+        self._pages = []           # _Page per page, in document order
+        self._positions = None     # uid -> page index (rebuilt after insert/remove)
+        self._error_pages = {}     # uid -> _Page with schema or duplicate errors
+        self._scripts = {}         # name -> _Script
+        self._assets = {}          # asset id -> schema errors
+        self._values = {}          # index key -> original value (messages)
+        self._invalid = {'scripts': {}, 'assets': {}}  # name -> schema errors (non-empty)
+        self._page_names = {}      # name key -> count
+        self._element_names = {}   # name key -> count (all pages)
+        self._triggers = {}        # target key -> {script name: count}
+        self._asset_refs = {}      # asset key -> {page uid: count}
+        # what the semantic checks currently report
+        self._duplicate_pages = set()
+        self._missing_targets = set()
+        self._missing_assets = set()
+
+        instance = self.instance
+        if not isinstance(instance, dict):
+            return
+        pages = instance.get('pages', [])
+        if isinstance(pages, list):
+            for i, page in enumerate(pages):
+                self._insert_page(i, page)
+        scripts = instance.get('scripts', {})
+        if isinstance(scripts, dict):
+            for name, script in scripts.items():
+                self._set_script(name, script)
+        assets = instance.get('assets', {})
+        if isinstance(assets, dict):
+            for name, asset in assets.items():
+                self._set_asset(name, asset)
+
+    def _key(self, value):
+        key = _key(value)
+        self._values.setdefault(key, value)
+        return key
+
+    def _insert_page(self, i, page):
+        unit = _Page(next(self._uids), page, self.validators)
+        self.revalidated += 1
+        self._pages.insert(i, unit)
+        self._positions = None
+        if unit.schema_errors or unit.element_errors:
+            self._error_pages[unit.uid] = unit
+        if unit.indexed:
+            key = self._key(unit.name)
+            _increment(self._page_names, key)
+            if self._page_names[key] == 2:
+                self._duplicate_pages.add(key)
+        for key in unit.element_keys:
+            if _increment(self._element_names, key):
+                self._missing_targets.discard(key)
+        for _, _, ref in unit.asset_refs:
+            key = self._key(ref)
+            users = self._asset_refs.setdefault(key, {})
+            _increment(users, unit.uid)
+            if key not in self._assets:
+                self._missing_assets.add(key)
+
+    def _remove_page(self, i):
+        unit = self._pages.pop(i)
+        self._positions = None
+        self._error_pages.pop(unit.uid, None)
+        if unit.indexed:
+            key = _key(unit.name)
+            _decrement(self._page_names, key)
+            if self._page_names.get(key, 0) < 2:
+                self._duplicate_pages.discard(key)
+        for key in unit.element_keys:
+            if _decrement(self._element_names, key) and key in self._triggers:
+                self._missing_targets.add(key)
+        for _, _, ref in unit.asset_refs:
+            key = _key(ref)
+            _decrement(self._asset_refs[key], unit.uid)
+            if not self._asset_refs[key]:
+                del self._asset_refs[key]
+                self._missing_assets.discard(key)
+
+    def _set_script(self, name, script):
+        self._drop_script(name)
+        unit = self._scripts[name] = _Script(script, self.validators)
+        if unit.schema_errors:
+            self._invalid['scripts'][name] = unit.schema_errors
+        self.revalidated += 1
+        for target in unit.targets:
+            key = self._key(target)
+            _increment(self._triggers.setdefault(key, {}), name)
+            if key not in self._element_names:
+                self._missing_targets.add(key)
+
+    def _drop_script(self, name):
+        unit = self._scripts.pop(name, None)
+        if unit is None:
+            return
+        self._invalid['scripts'].pop(name, None)
+        for target in unit.targets:
+            key = _key(target)
+            _decrement(self._triggers[key], name)
+            if not self._triggers[key]:
+                del self._triggers[key]
+                self._missing_targets.discard(key)
+
+    def _set_asset(self, name, asset):
+        self._assets[name] = _schema_errors(self.validators['asset'], asset)
+        if self._assets[name]:
+            self._invalid['assets'][name] = self._assets[name]
+        else:
+            self._invalid['assets'].pop(name, None)
+        self._missing_assets.discard(name)
+        self.revalidated += 1
+
+    def _drop_asset(self, name):
+        self._invalid['assets'].pop(name, None)
+        if self._assets.pop(name, None) is not None and name in self._asset_refs:
+            self._missing_assets.add(name)
+
+    # ------------------------------------------------------------------
+    # JSON Patch
+    # ------------------------------------------------------------------
+
+    def apply(self, patch):
+        """Apply JSON Patch operations, revalidating what they touch; returns result()."""
+        self.revalidated = 0
+        for op in patch:
+            self._apply_op(op)
+        return self.result()
+
+    def _apply_op(self, op):
+        kind = op.get('op')
+        pointer = op.get('path', '')
+        tokens = _parse_pointer(pointer)
+        if kind == 'test':
+            if _get(self.instance, tokens, pointer) != op.get('value'):
+                raise PatchError(f'Test failed: {pointer}')
+        elif kind == 'add':
+            self._add(tokens, pointer, op['value'])
+        elif kind == 'remove':
+            self._remove(tokens, pointer)
+        elif kind == 'replace':
+            self._replace(tokens, pointer, op['value'])
+        elif kind in ('move', 'copy'):
+            source = op.get('from', '')
+            source_tokens = _parse_pointer(source)
+            value = _get(self.instance, source_tokens, source)
+            if kind == 'move':
+                if tokens[:len(source_tokens)] == source_tokens and tokens != source_tokens:
+                    raise PatchError(f'Cannot move {source} into itself')
+                self._remove(source_tokens, source)
+            else:
+                value = copy.deepcopy(value)
+            self._add(tokens, pointer, value)
+        else:
+            raise PatchError(f'Unknown operation: {kind}')
+
+    def _add(self, tokens, pointer, value):
+        if not tokens:
+            self.instance = value
+            self._rebuild()
+            return
+        parent = _get(self.instance, tokens[:-1], pointer)
+        if isinstance(parent, list):
+            index = _list_index(parent, tokens[-1], pointer, allow_end=True)
+            parent.insert(index, value)
+            self._changed(tokens[:-1] + [str(index)], 'add')
+        elif isinstance(parent, dict):
+            parent[tokens[-1]] = value
+            self._changed(tokens, 'replace')
+        else:
+            raise PatchError(f'Path not found: {pointer}')
+
+    def _replace(self, tokens, pointer, value):
+        if not tokens:
+            self.instance = value
+            self._rebuild()
+            return
+        parent = _get(self.instance, tokens[:-1], pointer)
+        _child(parent, tokens[-1], pointer)
+        if isinstance(parent, list):
+            parent[int(tokens[-1])] = value
+        else:
+            parent[tokens[-1]] = value
+        self._changed(tokens, 'replace')
+
+    def _remove(self, tokens, pointer):
+        if not tokens:
+            raise PatchError('Cannot remove the whole document')
+        parent = _get(self.instance, tokens[:-1], pointer)
+        _child(parent, tokens[-1], pointer)
+        if isinstance(parent, list):
+            del parent[int(tokens[-1])]
+        else:
+            del parent[tokens[-1]]
+        self._changed(tokens, 'remove')
+
+    def _changed(self, tokens, how):
+        """Revalidate the page/script/asset under tokens ('add', 'remove' or 'replace' there)."""
+        instance = self.instance
+        if not isinstance(instance, dict) or tokens[0] not in ('pages', 'scripts', 'assets'):
+            return  # metadata, settings...: top level only, checked by result()
+        if len(tokens) == 1:
+            self._rebuild()
+            return
+        container = instance[tokens[0]]
+        if tokens[0] == 'pages':
+            if not isinstance(container, list):
+                self._rebuild()
+                return
+            index = int(tokens[1])
+            if len(tokens) > 2 or how != 'add':
+                self._remove_page(index)
+            if len(tokens) > 2 or how != 'remove':
+                self._insert_page(index, container[index])
+        elif not isinstance(container, dict):
+            self._rebuild()
+        elif tokens[0] == 'scripts':
+            if tokens[1] in container:
+                self._set_script(tokens[1], container[tokens[1]])
+            else:
+                self._drop_script(tokens[1])
+        elif tokens[1] in container:
+            self._set_asset(tokens[1], container[tokens[1]])
+        else:
+            self._drop_asset(tokens[1])
+
+    # ------------------------------------------------------------------
+    # Diagnostics
+    # ------------------------------------------------------------------
+
+    def _skeleton(self):
+        """Top level with pages/scripts/assets replaced by stand-ins (see get_part_validators)."""
+        instance = self.instance
+        if not isinstance(instance, dict):
+            return instance
+        skeleton = dict(instance)
+        if isinstance(instance.get('pages'), list):
+            skeleton['pages'] = [None] * min(len(instance['pages']), 1)  # only minItems is left
+        for section in ('scripts', 'assets'):
+            if isinstance(instance.get(section), dict):
+                skeleton[section] = {}
+        return skeleton
+
+    def _position(self, uid):
+        if self._positions is None:
+            self._positions = {unit.uid: i for i, unit in enumerate(self._pages)}
+        return self._positions[uid]
+
+    def result(self):
+        """Current diagnostics: {'ok', 'errors'}."""
+        errors = [
+            {'path': '/'.join(map(str, path)), 'message': message}
+            for path, message in _schema_errors(self.validators['top'], self._skeleton())
+        ]
+        error_pages = sorted(self._error_pages.values(), key=lambda unit: self._position(unit.uid))
+        for unit in error_pages:
+            i = self._position(unit.uid)
+            for path, message in unit.schema_errors:
+                errors.append({'path': '/'.join(map(str, ('pages', i, *path))), 'message': message})
+        for section, invalid in self._invalid.items():
+            for name, schema_errors in invalid.items():
+                for path, message in schema_errors:
+                    errors.append({'path': '/'.join(map(str, (section, name, *path))), 'message': message})
+
+        # semantic checks, resolved from the indexes
+        for key in self._duplicate_pages:
+            errors.append({'path': 'pages', 'message': f"Duplicate page name: {self._values[key]}"})
+        for unit in error_pages:
+            for message in unit.element_errors:
+                errors.append({'path': f'pages[{self._position(unit.uid)}].elements', 'message': message})
+        for key in self._missing_targets:
+            for name, count in self._triggers[key].items():
+                errors += [{'path': f'scripts.{name}.triggers',
+                            'message': f"Trigger target not found: {self._values[key]}"}] * count
+        pages = sorted({self._position(uid) for key in self._missing_assets for uid in self._asset_refs[key]})
+        for i in pages:
+            for suffix, label, ref in self._pages[i].asset_refs:
+                if _key(ref) in self._missing_assets:
+                    errors.append({'path': f'pages[{i}].{suffix}', 'message': f"{label} not found in assets: {ref}"})
+        return {'ok': not errors, 'errors': errors}
@@ -3,21 +3,39 @@
 Simple loader + validator for ConnectScript project JSON.
 
 Usage: python parser/loader.py path/to/project.json
+       python parser/loader.py --batch DIR_OR_GLOB [--workers N]
+       add --stream to parse files incrementally (large embedded assets)
 
 Performs:
 - JSON schema validation using spec/project.schema.json
 - Semantic checks: unique names, referential integrity
 
-Outputs JSON-formatted diagnostics and exit code 0 on success.
+Outputs JSON-formatted diagnostics and exit code 0 on success
+(2: file missing or not valid JSON, 3: validation errors).
+
+Batch mode validates every matching file in a process pool and prints
+one JSON line per project, then a summary line. The exit code is 2 if
+any file could not be read, else 3 if any project is invalid, else 0.
 """
+import argparse
+import glob
 import json
+import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 from jsonschema import validate, Draft7Validator, exceptions as jsexc
 
 ROOT = Path(__file__).resolve().parents[1]
 SCHEMA_PATH = ROOT / 'spec' / 'project.schema.json'
 
+# Schema and validator are built once per process (see get_validator)
+_schema = None
+_validator = None
+_part_validators = None
+
 
 def load_json(path):
     with open(path, 'r', encoding='utf-8') as f:
@@ -25,12 +43,58 @@ def load_json(path):
 
 
 def load_schema():
-    with open(SCHEMA_PATH, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    """Project schema, read from disk once and shared (do not mutate)."""
+    global _schema
+    if _schema is None:
+        with open(SCHEMA_PATH, 'r', encoding='utf-8') as f:
+            _schema = json.load(f)
+    return _schema
+
+
+def get_validator():
+    """Validator for the project schema, checked and compiled once."""
+    global _validator
+    if _validator is None:
+        schema = load_schema()
+        Draft7Validator.check_schema(schema)
+        _validator = Draft7Validator(schema)
+    return _validator
+
+
+def get_part_validators():
+    """Validators for one page/script/asset, and for the top level without them.
 
+    'top' checks the project with pages/scripts/assets replaced by stand-ins
+    (a list of the same length, empty objects): together with the part
+    validators it reports the same errors as the full schema.
+    """
+    global _part_validators
+    if _part_validators is None:
+        schema = load_schema()
+        definitions = schema['definitions']
 
-def schema_validate(instance, schema):
-    validator = Draft7Validator(schema)
+        def part(name):
+            return Draft7Validator({'definitions': definitions, '$ref': f'#/definitions/{name}'})
+
+        top = dict(schema)
+        top['properties'] = dict(schema['properties'])
+        top['properties']['pages'] = {'type': 'array', 'minItems': 1}
+        top['properties']['scripts'] = {'type': 'object'}
+        top['properties']['assets'] = {'type': 'object'}
+        _part_validators = {
+            'top': Draft7Validator(top),
+            'page': part('page'),
+            'script': part('script'),
+            'asset': part('asset'),
+        }
+    return _part_validators
+
+
+def schema_validate(instance, schema=None):
+    if schema is None or schema is _schema:
+        validator = get_validator()
+    else:
+        validator = Draft7Validator(schema)
     errors = []
     for err in validator.iter_errors(instance):
         errors.append({
@@ -40,91 +104,244 @@ def schema_validate(instance, schema):
     return errors
 
 
-def semantic_checks(instance):
-    errs = []
-
-    # pages: unique names
-    pages = instance.get('pages', [])
-    page_names = [p.get('name') for p in pages]
-    dup_pages = set([n for n in page_names if page_names.count(n) > 1])
-    for d in dup_pages:
-        errs.append({'path': 'pages', 'message': f"Duplicate page name: {d}"})
-
-    # elements unique per page, and check element names
-    for i, p in enumerate(pages):
-        elems = p.get('elements', [])
-        names = [e.get('name') for e in elems]
-        dup = set([n for n in names if names.count(n) > 1])
-        for d in dup:
-            errs.append({'path': f'pages[{i}].elements', 'message': f"Duplicate element name in page {p.get('name')}: {d}"})
-
-    # scripts unique names
-    scripts = instance.get('scripts', {})
-    script_names = list(scripts.keys())
-    dup_scripts = set([n for n in script_names if script_names.count(n) > 1])
-    for d in dup_scripts:
-        errs.append({'path': 'scripts', 'message': f"Duplicate script name: {d}"})
-
-    # triggers reference elements/pages
-    page_map = {p.get('name'): p for p in pages}
-    for sname, script in scripts.items():
-        triggers = script.get('triggers', [])
-        for t in triggers:
-            ttype = t.get('type')
-            target = t.get('target')
-            if ttype == 'click' and target:
-                # ensure element exists in some page
-                found = False
-                for p in pages:
-                    for e in p.get('elements', []):
-                        if e.get('name') == target:
-                            found = True
-                            break
-                    if found:
-                        break
-                if not found:
-                    errs.append({'path': f'scripts.{sname}.triggers', 'message': f"Trigger target not found: {target}"})
-
-    # asset references: background.imageRef and element.properties.source
-    assets = instance.get('assets', {})
-    asset_keys = set(assets.keys())
-    for i, p in enumerate(pages):
-        bg = p.get('background') or {}
-        if bg.get('imageRef') and bg.get('imageRef') not in asset_keys:
-            errs.append({'path': f'pages[{i}].background', 'message': f"Background imageRef not found in assets: {bg.get('imageRef')}"})
-        for j, e in enumerate(p.get('elements', [])):
-            props = e.get('properties') or {}
+def _key(value):
+    """Hashable key for an index; unhashable values (schema-invalid) use their JSON form."""
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return ('json', json.dumps(value, sort_keys=True, default=str))
+
+
+def _items(value):
+    """value if it is a list, else [] (the schema reports the wrong type)."""
+    return value if isinstance(value, list) else []
+
+
+def _fields(value):
+    """value if it is an object, else {} (the schema reports the wrong type)."""
+    return value if isinstance(value, dict) else {}
+
+
+def _duplicates(names):
+    """Names seen more than once, in order of first repetition."""
+    seen = set()
+    dups = {}
+    for n in names:
+        k = _key(n)
+        if k in seen:
+            dups.setdefault(k, n)
+        else:
+            seen.add(k)
+    return list(dups.values())
+
+
+class SemanticIndex:
+    """Names and references gathered by the semantic checks.
+
+    Pages, scripts and assets can be added in any order (one at a time
+    when streaming); errors() then resolves the references.
+    """
+
+    def __init__(self):
+        self.page_names = []
+        self.element_names = set()
+        self.element_errors = []
+        self.triggers = []      # (script name, click target)
+        self.asset_refs = []    # (path, label, asset id)
+        self.asset_keys = set()
+
+    def add_page(self, i, p):
+        # pages, elements and triggers that are not objects only get schema errors
+        if not isinstance(p, dict):
+            return
+        self.page_names.append(p.get('name'))
+        elements = [(j, e) for j, e in enumerate(_items(p.get('elements'))) if isinstance(e, dict)]
+        names = [e.get('name') for _, e in elements]
+        self.element_names.update(_key(n) for n in names)
+        for d in _duplicates(names):
+            self.element_errors.append({'path': f'pages[{i}].elements', 'message': f"Duplicate element name in page {p.get('name')}: {d}"})
+
+        # asset references: background.imageRef and element.properties.source
+        bg = _fields(p.get('background'))
+        if bg.get('imageRef'):
+            self.asset_refs.append((f'pages[{i}].background', 'Background imageRef', bg.get('imageRef')))
+        for j, e in elements:
+            props = _fields(e.get('properties'))
             # image source may reference asset id
-            if e.get('type') == 'image' and props.get('source') and props.get('source') not in asset_keys:
-                errs.append({'path': f'pages[{i}].elements[{j}]', 'message': f"Image source not found in assets: {props.get('source')}"})
+            if e.get('type') == 'image' and props.get('source'):
+                self.asset_refs.append((f'pages[{i}].elements[{j}]', 'Image source', props.get('source')))
 
-    return errs
+    def add_script(self, sname, script):
+        if not isinstance(script, dict):
+            return
+        for t in _items(script.get('triggers')):
+            if isinstance(t, dict) and t.get('type') == 'click' and t.get('target'):
+                self.triggers.append((sname, t.get('target')))
 
+    def add_assets(self, keys):
+        self.asset_keys.update(keys)
 
-def main():
-    if len(sys.argv) < 2:
-        print('Usage: loader.py path/to/project.json')
-        sys.exit(2)
+    def errors(self):
+        errs = []
+        for d in _duplicates(self.page_names):
+            errs.append({'path': 'pages', 'message': f"Duplicate page name: {d}"})
+        errs.extend(self.element_errors)
+        for sname, target in self.triggers:
+            if _key(target) not in self.element_names:
+                errs.append({'path': f'scripts.{sname}.triggers', 'message': f"Trigger target not found: {target}"})
+        for path, label, ref in self.asset_refs:
+            if _key(ref) not in self.asset_keys:
+                errs.append({'path': path, 'message': f"{label} not found in assets: {ref}"})
+        return errs
+
+
+def semantic_checks(instance):
+    """Unique names and referential integrity, in one pass over each collection."""
+    index = SemanticIndex()
+    instance = _fields(instance)
+    for i, p in enumerate(_items(instance.get('pages'))):
+        index.add_page(i, p)
+    # scripts: keys of a JSON object are already unique (json.load keeps the last one)
+    for sname, script in _fields(instance.get('scripts')).items():
+        index.add_script(sname, script)
+    index.add_assets(_fields(instance.get('assets')).keys())
+    return index.errors()
+
+
+def validate_project(instance):
+    """Schema + semantic validation of one project: {'ok', 'errors'}."""
+    all_errors = schema_validate(instance) + semantic_checks(instance)
+    return {'ok': len(all_errors) == 0, 'errors': all_errors}
+
+
+def validate_many(instances):
+    """Validate projects one after another with the shared validator.
+
+    Yields one {'ok', 'errors'} result per instance, in order.
+    """
+    get_validator()
+    for instance in instances:
+        yield validate_project(instance)
 
-    path = Path(sys.argv[1])
-    if not path.exists():
-        print(json.dumps({'ok': False, 'errors': [{'message': 'File not found'}]}))
-        sys.exit(2)
 
+EXIT_OK = 0
+EXIT_UNREADABLE = 2
+EXIT_INVALID = 3
+
+
+def validate_file(path, stream=False):
+    """Load and validate one file: {'path', 'ok', 'status', 'errors'}.
+
+    With stream=True the file is parsed incrementally (see streaming.py).
+    """
+    path = Path(path)
+    if not path.exists():
+        return {'path': str(path), 'ok': False, 'status': EXIT_UNREADABLE,
+                'errors': [{'message': 'File not found'}]}
+    # only reading/parsing failures are "unreadable"; validation errors are diagnostics
     try:
-        instance = load_json(path)
-    except Exception as e:
-        print(json.dumps({'ok': False, 'errors': [{'message': f'Invalid JSON: {e}'}]}))
-        sys.exit(2)
-
-    schema = load_schema()
-    s_errors = schema_validate(instance, schema)
-    sem_errors = semantic_checks(instance)
-
-    all_errors = s_errors + sem_errors
-    out = {'ok': len(all_errors) == 0, 'errors': all_errors}
-    print(json.dumps(out, indent=2, ensure_ascii=False))
-    sys.exit(0 if out['ok'] else 3)
+        if stream:
+            from streaming import validate_path
+            out = validate_path(path)
+        else:
+            instance = load_json(path)
+    except (OSError, ValueError) as e:
+        return {'path': str(path), 'ok': False, 'status': EXIT_UNREADABLE,
+                'errors': [{'message': f'Invalid JSON: {e}'}]}
+    if not stream:
+        out = validate_project(instance)
+    # the streaming reader reports malformed JSON in its result
+    status = out.get('status', EXIT_OK if out['ok'] else EXIT_INVALID)
+    return {'path': str(path), 'ok': out['ok'], 'status': status, 'errors': out['errors']}
+
+
+def find_projects(target):
+    """Project files for a directory (recursive *.json), a glob pattern or a single file."""
+    path = Path(target)
+    if path.is_dir():
+        return sorted(str(p) for p in path.rglob('*.json'))
+    if glob.has_magic(target):
+        return sorted(glob.glob(target, recursive=True))
+    return [target]
+
+
+def _validate_chunk(paths, stream=False):
+    return [validate_file(p, stream) for p in paths]
+
+
+def validate_files(paths, workers=None, chunk_size=16, stream=False):
+    """Validate files in a process pool; yields results in input order as they complete.
+
+    Each worker builds the schema validator once (pool initializer) and
+    receives files by chunks of chunk_size. With workers=1 the files are
+    validated in the current process.
+    """
+    paths = list(paths)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(paths) <= 1:
+        for p in paths:
+            yield validate_file(p, stream)
+        return
+    chunks = [paths[i:i + chunk_size] for i in range(0, len(paths), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=get_validator) as pool:
+        for results in pool.map(partial(_validate_chunk, stream=stream), chunks):
+            yield from results
+
+
+def summarize(results):
+    """Aggregate counts of a batch and its exit code."""
+    summary = {'files': 0, 'valid': 0, 'invalid': 0, 'unreadable': 0, 'errors': 0}
+    for result in results:
+        summary['files'] += 1
+        summary['errors'] += len(result['errors'])
+        if result['status'] == EXIT_OK:
+            summary['valid'] += 1
+        elif result['status'] == EXIT_INVALID:
+            summary['invalid'] += 1
+        else:
+            summary['unreadable'] += 1
+    if summary['unreadable'] or not summary['files']:
+        summary['exit_code'] = EXIT_UNREADABLE
+    elif summary['invalid']:
+        summary['exit_code'] = EXIT_INVALID
+    else:
+        summary['exit_code'] = EXIT_OK
+    return summary
+
+
+def run_batch(target, workers=None, out=sys.stdout, stream=False):
+    """Validate every project matching target, streaming JSON lines; returns the exit code."""
+    start = time.perf_counter()
+    results = []
+    for result in validate_files(find_projects(target), workers, stream=stream):
+        results.append(result)
+        out.write(json.dumps(result, ensure_ascii=False) + '\n')
+        out.flush()
+    summary = summarize(results)
+    summary['seconds'] = round(time.perf_counter() - start, 3)
+    out.write(json.dumps({'summary': summary}) + '\n')
+    return summary['exit_code']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate ConnectScript project JSON.')
+    parser.add_argument('path', help='project.json, or a directory / glob with --batch')
+    parser.add_argument('--batch', action='store_true', help='validate many projects (JSON lines output)')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--stream', action='store_true', help='parse incrementally (large embedded assets)')
+    args = parser.parse_args()
+
+    if args.batch:
+        sys.exit(run_batch(args.path, args.workers, stream=args.stream))
+
+    result = validate_file(args.path, args.stream)
+    out = {'ok': result['ok'], 'errors': result['errors']}
+    if result['status'] == EXIT_UNREADABLE:
+        print(json.dumps(out))
+    else:
+        print(json.dumps(out, indent=2, ensure_ascii=False))
+    sys.exit(result['status'])
 
 
 if __name__ == '__main__':
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Streaming validation of ConnectScript project JSON.
+
+Usage: python parser/streaming.py path/to/project.json
+
+The file is read in chunks and parsed incrementally. Each page, script
+and asset is validated against its schema definition as soon as it is
+complete, fed to the semantic index, then dropped. Inside assets,
+strings longer than max_string (base64 payloads) are skipped without
+being kept in memory: only their type is validated. Peak memory is
+bounded by the largest page/script, not by the file size.
+
+Diagnostics are the same as loader.validate_project (a repeated key
+keeps its last value, as with json.load); schema errors of the top level
+come after those of pages/scripts/assets.
+"""
+import json
+import re
+import sys
+
+from loader import EXIT_UNREADABLE, SemanticIndex, get_part_validators
+
+CHUNK_SIZE = 64 * 1024
+MAX_STRING = 4096
+
+_STRING_STOP = re.compile(r'["\\]')
+_SCALAR_END = re.compile(r'[\s,\]}]')
+
+
+class OmittedString(str):
+    """Placeholder for a string skipped while streaming (length kept)."""
+
+    def __new__(cls, length):
+        value = super().__new__(cls, f'<{length} characters>')
+        value.length = length
+        return value
+
+
+class _Reader:
+    """Incremental JSON reader over a text file."""
+
+    def __init__(self, f, chunk_size=CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.offset = 0  # characters dropped from the start of buf
+
+    def _fill(self):
+        data = self.f.read(self.chunk_size)
+        if not data:
+            return False
+        self.offset += self.pos
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def error(self, message):
+        return ValueError(f'{message} (char {self.offset + self.pos})')
+
+    def peek(self):
+        """Next non-whitespace character ('' at end of file)."""
+        while True:
+            buf = self.buf
+            pos = self.pos
+            while pos < len(buf) and buf[pos] in ' \t\r\n':
+                pos += 1
+            self.pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise self.error(f"Expecting '{char}'")
+        self.pos += 1
+
+    def members(self):
+        """Keys of an object; the caller reads each value before the next key."""
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            if self.peek() != '"':
+                raise self.error('Expecting property name enclosed in double quotes')
+            key = self.string()
+            self.expect(':')
+            yield key
+            if self.peek() == ',':
+                self.pos += 1
+                continue
+            self.expect('}')
+            return
+
+    def items(self):
+        """Indexes of an array; the caller reads each value before the next index."""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        i = 0
+        while True:
+            yield i
+            i += 1
+            if self.peek() == ',':
+                self.pos += 1
+                continue
+            self.expect(']')
+            return
+
+    def value(self, max_string=None):
+        c = self.peek()
+        if c == '{':
+            result = {}
+            for key in self.members():
+                result[key] = self.value(max_string)
+            return result
+        if c == '[':
+            return [self.value(max_string) for _ in self.items()]
+        if c == '"':
+            return self.string(max_string)
+        if c == '':
+            raise self.error('Expecting value')
+        return self.scalar()
+
+    def string(self, max_string=None):
+        """String at the cursor; beyond max_string characters it is skipped (OmittedString)."""
+        self.pos += 1
+        parts = []
+        size = 0
+
+        def take(segment):
+            nonlocal size
+            size += len(segment)
+            if max_string is None or size <= max_string:
+                parts.append(segment)
+
+        while True:
+            buf = self.buf
+            match = _STRING_STOP.search(buf, self.pos)
+            if match is not None and match.group() == '"':
+                take(buf[self.pos:match.start()])
+                self.pos = match.end()
+                break
+            if match is not None and match.end() < len(buf):
+                # escape sequence: keep the backslash with the escaped character
+                take(buf[self.pos:match.end() + 1])
+                self.pos = match.end() + 1
+                continue
+            # end of the chunk (possibly on a backslash): read more
+            end = len(buf) if match is None else match.start()
+            take(buf[self.pos:end])
+            self.pos = end
+            if not self._fill():
+                raise self.error('Unterminated string')
+        if max_string is not None and size > max_string:
+            return OmittedString(size)
+        try:
+            return json.loads('"' + ''.join(parts) + '"')
+        except ValueError as e:
+            raise self.error(f'Invalid string: {e}')
+
+    def scalar(self):
+        while True:
+            match = _SCALAR_END.search(self.buf, self.pos)
+            if match is not None or not self._fill():
+                break
+        end = match.start() if match is not None else len(self.buf)
+        token = self.buf[self.pos:end]
+        try:
+            value = json.loads(token)
+        except ValueError:
+            raise self.error('Expecting value')
+        self.pos = end
+        return value
+
+
+def _schema_errors(validator, instance, prefix=()):
+    return [
+        {'path': '/'.join(map(str, (*prefix, *err.path))), 'message': err.message}
+        for err in validator.iter_errors(instance)
+    ]
+
+
+def validate_stream(f, chunk_size=CHUNK_SIZE, max_string=MAX_STRING):
+    """Validate a project from a text file object: {'ok', 'errors'}.
+
+    Malformed JSON is not raised: the result then also has
+    'status': EXIT_UNREADABLE and a single 'Invalid JSON' error, as in
+    loader.validate_file.
+    """
+    try:
+        return _validate(_Reader(f, chunk_size), max_string)
+    except ValueError as e:
+        return {'ok': False, 'status': EXIT_UNREADABLE,
+                'errors': [{'message': f'Invalid JSON: {e}'}]}
+
+
+def _validate(reader, max_string):
+    validators = get_part_validators()
+
+    if reader.peek() != '{':
+        # not an object: nothing to stream, the schema reports it
+        instance = reader.value(max_string)
+        if reader.peek() != '':
+            raise reader.error('Extra data')
+        errors = _schema_errors(validators['top'], instance)
+        return {'ok': not errors, 'errors': errors}
+
+    # Like json.load, a repeated key replaces the earlier value: each
+    # collection is gathered on its own and reset when its key comes again.
+    pages = (SemanticIndex(), [])   # index of the pages, their schema errors
+    scripts = {}                    # name -> (schema errors, triggers only)
+    assets = {}                     # name -> schema errors
+    # top level with pages/scripts/assets replaced by lightweight stand-ins
+    skeleton = {}
+    for key in reader.members():
+        c = reader.peek()
+        if key == 'pages':
+            pages = (SemanticIndex(), [])
+        elif key == 'scripts':
+            scripts = {}
+        elif key == 'assets':
+            assets = {}
+        if key == 'pages' and c == '[':
+            index, errors = pages
+            count = 0
+            for i in reader.items():
+                page = reader.value()
+                errors += _schema_errors(validators['page'], page, ('pages', i))
+                index.add_page(i, page)
+                count += 1
+            skeleton[key] = [None] * count
+        elif key == 'scripts' and c == '{':
+            for name in reader.members():
+                script = reader.value()
+                errors = _schema_errors(validators['script'], script, ('scripts', name))
+                if isinstance(script, dict):
+                    script = {'triggers': script.get('triggers')}
+                scripts[name] = (errors, script)
+            skeleton[key] = {}
+        elif key == 'assets' and c == '{':
+            for name in reader.members():
+                asset = reader.value(max_string)
+                assets[name] = _schema_errors(validators['asset'], asset, ('assets', name))
+            skeleton[key] = {}
+        else:
+            skeleton[key] = reader.value(max_string if key == 'assets' else None)
+
+    if reader.peek() != '':
+        raise reader.error('Extra data')
+
+    index, errors = pages
+    for name, (script_errors, script) in scripts.items():
+        errors += script_errors
+        index.add_script(name, script)
+    for asset_errors in assets.values():
+        errors += asset_errors
+    index.add_assets(assets.keys())
+    errors += _schema_errors(validators['top'], skeleton)
+    errors += index.errors()
+    return {'ok': not errors, 'errors': errors}
+
+
+def validate_path(path, chunk_size=CHUNK_SIZE, max_string=MAX_STRING):
+    """Validate a project file without loading it whole."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return validate_stream(f, chunk_size, max_string)
+
+
+def main():
+    if len(sys.argv) < 2:
+        print('Usage: streaming.py path/to/project.json')
+        sys.exit(2)
+    try:
+        out = validate_path(sys.argv[1])
+    except FileNotFoundError:
+        print(json.dumps({'ok': False, 'errors': [{'message': 'File not found'}]}))
+        sys.exit(2)
+    if out.get('status') == EXIT_UNREADABLE:
+        print(json.dumps({'ok': False, 'errors': out['errors']}))
+        sys.exit(2)
+    print(json.dumps(out, indent=2, ensure_ascii=False))
+    sys.exit(0 if out['ok'] else 3)
+
+
+if __name__ == '__main__':
+    main()